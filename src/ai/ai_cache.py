@@ -0,0 +1,149 @@
+"""
+Disk cache for place extraction results.
+
+Stores the places extracted from each chunk as small JSON files keyed by a
+hash of the model, prompt and chunk text, so re-running on the same ePub
+skips the OpenAI calls entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+
+class AnalysisCache:
+    """
+    Filesystem cache of per-chunk place lists with LRU eviction.
+
+    Entries live at <cache_dir>/<key[:2]>/<key>.json to keep directories small.
+    An entry's mtime records its last use: hits touch it, entries unused for
+    longer than the TTL are ignored, and when the cache outgrows its size
+    limit the least recently used entries are removed first.
+    Failures are logged and treated as misses; the cache never breaks analysis.
+    """
+
+    def __init__(self, cache_dir: str, ttl_seconds: int = 30 * 86400,
+                 max_cache_size_mb: int = 1024, cleanup_threshold: float = 0.8):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for cache files (created if missing)
+            ttl_seconds: Time since last use after which an entry is ignored and refetched
+            max_cache_size_mb: Maximum cache size in MB
+            cleanup_threshold: Eviction shrinks the cache to this fraction of max size
+        """
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl_seconds
+        self.max_size_bytes = max_cache_size_mb * 1024 * 1024
+        self.cleanup_threshold = cleanup_threshold
+        self.logger = logging.getLogger(__name__)
+        self._size: Optional[int] = None  # total entry bytes, measured on first write
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.logger.info(
+            f"AnalysisCache using {self.cache_dir} "
+            f"(TTL={self.ttl}s, max_size={max_cache_size_mb}MB)"
+        )
+
+    @staticmethod
+    def make_key(model: str, prompt: str, chunk: str) -> str:
+        """Hash everything that determines the model's answer for a chunk."""
+        content = "\0".join((model, prompt, chunk))
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        """Get the file path for a key."""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up cached places.
+
+        Args:
+            key: Key from make_key
+
+        Returns:
+            The cached place list, or None on a miss or expired entry
+        """
+        path = self._path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            places = json.loads(path.read_bytes())
+            os.utime(path)  # mark as recently used
+            return places
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable analysis cache entry {path.name}: {e}")
+            return None
+
+    def put(self, key: str, places: List[Dict[str, Any]]) -> None:
+        """
+        Store places for a key.
+
+        Writes to a temporary file and renames it, so concurrent runs never
+        read a partial entry.
+
+        Args:
+            key: Key from make_key
+            places: Place dictionaries to cache
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        data = json.dumps(places, separators=(",", ":")).encode("utf-8")
+        try:
+            old_size = path.stat().st_size
+        except OSError:
+            old_size = 0
+        try:
+            path.parent.mkdir(exist_ok=True)
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to write analysis cache entry {path.name}: {e}")
+            return
+
+        if self._size is None:
+            self._size = sum(size for _, _, size in self._entries())
+        else:
+            # Overwriting an entry replaces its bytes rather than adding to them
+            self._size += len(data) - old_size
+        if self._size > self.max_size_bytes:
+            self._evict()
+
+    def _entries(self) -> List[Tuple[Path, float, int]]:
+        """List cache entries as (path, mtime, size) tuples."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until under the cleanup threshold."""
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        size = sum(entry_size for _, _, entry_size in entries)
+        target = self.max_size_bytes * self.cleanup_threshold
+        removed = 0
+
+        for path, _, entry_size in entries:
+            if size <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            size -= entry_size
+            removed += 1
+
+        self._size = size
+        self.logger.info(f"Evicted {removed} analysis cache entries ({size} bytes remain)")
@@ -0,0 +1,278 @@
+"""
+Header-driven rate limiter for OpenAI requests.
+
+Paces async requests from the x-ratelimit-* and retry-after headers OpenAI
+returns, so concurrent tasks wait for quota to reset instead of racing into
+429 responses and blind retries.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+# Reset durations look like "1s", "6m0s", "120ms" or "1h2m3.5s"
+_DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse an x-ratelimit-reset-* or retry-after value into seconds.
+
+    Args:
+        value: Header value such as "6m0s", "120ms" or "2" (plain seconds)
+
+    Returns:
+        Seconds until reset, or None if the value is missing or unparseable
+    """
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART_RE.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def parse_retry_after(headers) -> Optional[float]:
+    """
+    Read a 429 response's retry delay, preferring retry-after-ms over retry-after.
+    
+    Args:
+        headers: Response headers (case-insensitive mapping)
+    
+    Returns:
+        Seconds to wait, or None if neither header is usable
+    """
+    retry_after_ms = parse_reset_duration(headers.get("retry-after-ms"))
+    if retry_after_ms:
+        return retry_after_ms / 1000
+    return parse_reset_duration(headers.get("retry-after"))
+
+
+class OpenAIRateLimiter:
+    """
+    Tracks remaining request and token quota reported by OpenAI.
+
+    Each acquire() spends one request and an estimated token count from the
+    last reported quota; when either would run out, callers wait until the
+    reported reset. Quota and pause deadlines are refreshed from every
+    response via on_response, which is installed as an httpx response hook.
+    The state can be saved and loaded between runs, so a fresh process
+    starts from the last known quota instead of probing for it.
+
+    Optionally, configured per-minute request and token rates are also
+    enforced with token buckets holding one second's worth of quota, so
+    requests are spread evenly rather than sent in a burst before the
+    first headers arrive.
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        """
+        Initialize with unknown quota; nothing is throttled until headers arrive.
+
+        Args:
+            requests_per_minute: Client-side request rate cap; None disables it
+            tokens_per_minute: Client-side token rate cap; None disables it
+        """
+        self.remaining_requests: Optional[int] = None
+        self.remaining_tokens: Optional[int] = None
+        self.requests_reset_at = 0.0
+        self.tokens_reset_at = 0.0
+        self.resume_at = 0.0  # monotonic time before which nothing is sent
+        self.logger = logging.getLogger(__name__)
+
+        # Token buckets refilled continuously at the configured rates
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._request_capacity = max(1.0, (requests_per_minute or 0) / 60)
+        self._token_capacity = (tokens_per_minute or 0) / 60
+        self._request_budget = self._request_capacity
+        self._token_budget = self._token_capacity
+        self._refilled_at = time.monotonic()
+
+    def update(self, headers, status_code: int = 200) -> None:
+        """
+        Refresh quota from a response's headers.
+
+        Args:
+            headers: Response headers (case-insensitive mapping)
+            status_code: HTTP status; on 429 the retry-after(-ms) delay pauses all requests
+        """
+        now = time.monotonic()
+
+        remaining_requests = headers.get("x-ratelimit-remaining-requests")
+        if remaining_requests is not None and remaining_requests.isdigit():
+            self.remaining_requests = int(remaining_requests)
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-requests"))
+            self.requests_reset_at = now + (reset or 0.0)
+
+        remaining_tokens = headers.get("x-ratelimit-remaining-tokens")
+        if remaining_tokens is not None and remaining_tokens.isdigit():
+            self.remaining_tokens = int(remaining_tokens)
+            reset = parse_reset_duration(headers.get("x-ratelimit-reset-tokens"))
+            self.tokens_reset_at = now + (reset or 0.0)
+
+        if status_code == 429:
+            retry_after = parse_retry_after(headers)
+            if retry_after:
+                self.resume_at = max(self.resume_at, now + retry_after)
+                self.logger.warning(f"OpenAI rate limit hit, pausing requests for {retry_after:.1f}s")
+
+    async def on_response(self, response: httpx.Response) -> None:
+        """httpx response hook feeding every response's headers into update."""
+        self.update(response.headers, response.status_code)
+
+    def _wait_time(self, est_tokens: int) -> float:
+        """Seconds until a request of est_tokens fits the known quota (0 if now)."""
+        now = time.monotonic()
+        wait_until = self.resume_at
+
+        if self.remaining_requests is not None and self.remaining_requests < 1:
+            if now < self.requests_reset_at:
+                wait_until = max(wait_until, self.requests_reset_at)
+            else:
+                self.remaining_requests = None  # window reset; quota unknown until next response
+
+        if self.remaining_tokens is not None and self.remaining_tokens < est_tokens:
+            if now < self.tokens_reset_at:
+                wait_until = max(wait_until, self.tokens_reset_at)
+            else:
+                self.remaining_tokens = None
+
+        self._refill(now)
+        if self.requests_per_minute and self._request_budget < 1:
+            wait_until = max(
+                wait_until, now + (1 - self._request_budget) * 60 / self.requests_per_minute
+            )
+        if self.tokens_per_minute:
+            # A request larger than the bucket waits for a full bucket, not forever
+            needed = min(est_tokens, self._token_capacity)
+            if self._token_budget < needed:
+                wait_until = max(
+                    wait_until, now + (needed - self._token_budget) * 60 / self.tokens_per_minute
+                )
+
+        return max(0.0, wait_until - now)
+
+    def _refill(self, now: float) -> None:
+        """Top up the rate buckets for the time elapsed since the last refill."""
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.requests_per_minute:
+            self._request_budget = min(
+                self._request_capacity,
+                self._request_budget + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._token_budget = min(
+                self._token_capacity,
+                self._token_budget + elapsed * self.tokens_per_minute / 60
+            )
+
+    async def acquire(self, est_tokens: int = 0) -> None:
+        """
+        Wait until the known quota allows a request, then spend from it.
+
+        Args:
+            est_tokens: Estimated tokens (prompt plus completion) the request uses
+        """
+        while True:
+            wait = self._wait_time(est_tokens)
+            if wait <= 0:
+                break
+            self.logger.debug("Waiting %.2fs for OpenAI rate limit quota", wait)
+            await asyncio.sleep(wait)
+
+        # Spend locally so concurrent tasks don't all pass on one stale reading
+        if self.remaining_requests is not None:
+            self.remaining_requests -= 1
+        if self.remaining_tokens is not None:
+            self.remaining_tokens -= est_tokens
+        if self.requests_per_minute:
+            self._request_budget -= 1
+        if self.tokens_per_minute:
+            self._token_budget -= est_tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Capture the current quota with deadlines as wall-clock timestamps.
+
+        Monotonic times are meaningless in another process, so deadlines are
+        converted to epoch seconds.
+        """
+        offset = time.time() - time.monotonic()
+        return {
+            "remaining_requests": self.remaining_requests,
+            "remaining_tokens": self.remaining_tokens,
+            "requests_reset_at": self.requests_reset_at + offset,
+            "tokens_reset_at": self.tokens_reset_at + offset,
+            "resume_at": self.resume_at + offset,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        """
+        Restore quota from a snapshot, ignoring windows that have since reset.
+
+        Args:
+            state: Dictionary produced by snapshot()
+        """
+        now = time.time()
+        offset = time.monotonic() - now
+
+        requests_reset_at = state.get("requests_reset_at", 0.0)
+        if state.get("remaining_requests") is not None and requests_reset_at > now:
+            self.remaining_requests = int(state["remaining_requests"])
+            self.requests_reset_at = requests_reset_at + offset
+
+        tokens_reset_at = state.get("tokens_reset_at", 0.0)
+        if state.get("remaining_tokens") is not None and tokens_reset_at > now:
+            self.remaining_tokens = int(state["remaining_tokens"])
+            self.tokens_reset_at = tokens_reset_at + offset
+
+        resume_at = state.get("resume_at", 0.0)
+        if resume_at > now:
+            self.resume_at = max(self.resume_at, resume_at + offset)
+
+    def save_state(self, path: str) -> None:
+        """
+        Write snapshot() to a JSON file, atomically.
+
+        Args:
+            path: State file path; parent directories are created
+        """
+        path = Path(path).expanduser()
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(self.snapshot(), separators=(",", ":")))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Failed to save rate limit state to {path}: {e}")
+
+    def load_state(self, path: str) -> None:
+        """
+        Restore state saved by save_state; a missing or unreadable file is ignored.
+
+        Args:
+            path: State file path
+        """
+        path = Path(path).expanduser()
+        try:
+            self.restore(json.loads(path.read_text()))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            self.logger.warning(f"Ignoring unreadable rate limit state {path}: {e}")
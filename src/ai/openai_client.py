@@ -5,16 +5,176 @@ Uses GPT-4 with structured responses and retry logic for robust
 place name extraction from ePub content.
 """
 
+import asyncio
+import atexit
+import contextlib
 import json
 import logging
+import random
+import re
 import time
-from typing import List, Dict, Any
+import unicodedata
+from collections import OrderedDict
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterator, Optional, Tuple
 
-from openai import OpenAI
-from pydantic import BaseModel
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import httpx
+import openai
+from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
+from openai.lib._parsing import type_to_response_format_param
+from pydantic import BaseModel, ValidationError
+from tenacity import (
+    AsyncRetrying, retry, retry_if_exception_type, stop_after_attempt, stop_after_delay,
+    wait_random_exponential
+)
 
 from src.config.config_module import get_config
+from src.ai.ai_cache import AnalysisCache
+from src.ai.ai_rate_limiter import OpenAIRateLimiter, parse_retry_after
+
+
+# Transient API failures worth retrying; anything else (bad key, invalid
+# request, malformed output) fails immediately
+RETRYABLE = (
+    openai.RateLimitError,
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+)
+
+# Randomized exponential backoff, so concurrent workers that failed together
+# do not retry in lockstep
+_BACKOFF = wait_random_exponential(multiplier=1, max=30)
+
+# Longest server-requested retry-after delay honored before giving up on it
+MAX_RETRY_AFTER = 60.0
+
+
+def wait_for_retry(retry_state) -> float:
+    """
+    Tenacity wait: the server's retry-after delay for rate limits, else jittered backoff.
+    
+    retry-after-ms is preferred over retry-after when both are sent. A small
+    random offset is added so workers told to wait the same time do not all
+    return at once.
+    """
+    error = retry_state.outcome.exception()
+    if isinstance(error, openai.RateLimitError):
+        retry_after = parse_retry_after(error.response.headers)
+        if retry_after:
+            return min(retry_after, MAX_RETRY_AFTER) + random.uniform(0, 1)
+    return _BACKOFF(retry_state)
+
+
+# Shared retry policy for the sync and async request paths
+RETRY_POLICY = dict(
+    stop=stop_after_attempt(3) | stop_after_delay(120),
+    wait=wait_for_retry,
+    retry=retry_if_exception_type(RETRYABLE),
+    reraise=True
+)
+
+
+# Kept byte-identical across requests so OpenAI's automatic prompt caching
+# can reuse the shared prefix
+SYSTEM_PROMPT = (
+    "You are a historical geography expert. Extract all geographical "
+    "place names (cities, countries, regions, landmarks) from text. "
+    "Use modern names where possible. For each place, provide an appropriate "
+    "Google Maps zoom level: "
+    "- Continents: 3-4"
+    "- Countries: 5-6"
+    "- States/Regions: 6-8"
+    "- Cities: 10-12"
+    "- Neighborhoods/Districts: 13-15"
+    "- Specific landmarks/buildings: 16-18"
+)
+
+# Letter-only words of 3+ characters; those not starting lowercase count as
+# capitalized (caseless scripts count too, so they are never filtered out)
+WORD_RE = re.compile(r"\b[^\W\d_]{3,}")
+
+# Chunks with fewer capitalized words than this cannot name a place
+MIN_CAPITALIZED_WORDS = 2
+
+# Capitalized words after a lowercase word or comma, i.e. not sentence
+# starts; likely proper nouns
+MID_SENTENCE_CAPITAL_RE = re.compile(r"(?<=[a-z,;] )[A-Z][a-z]+")
+
+# An empty result for a chunk with this many likely proper nouns is
+# re-checked with the escalation model
+ESCALATION_MIN_CANDIDATES = 3
+
+# Typographic punctuation folded to ASCII when matching cached chunks
+_PUNCTUATION_FOLD = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201c": '"', "\u201d": '"',
+    "\u2013": "-", "\u2014": "-", "\u2026": "...",
+})
+
+
+def chunk_cache_key(chunk: str) -> str:
+    """
+    Normalize chunk text for result caching.
+    
+    Chunks that differ only in Unicode form, typographic quotes and dashes,
+    or whitespace (reflowed paragraphs, different editions of the same
+    front matter) share a key, so they are only analyzed once.
+    """
+    text = unicodedata.normalize("NFKC", chunk).translate(_PUNCTUATION_FOLD)
+    return " ".join(text.split())
+
+
+# Fail fast on unreachable hosts but give slow completions time to finish
+HTTP_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# Keep-alive pool for the sync client (single requests, Batch API uploads)
+SYNC_HTTP_LIMITS = httpx.Limits(max_connections=10, max_keepalive_connections=10)
+
+# Chunks are not bisected into halves shorter than this
+MIN_SPLIT_CHARS = 200
+
+# Sentence ends (with trailing quotes/brackets) preferred as split points
+_SENTENCE_END_RE = re.compile(r"[.!?][\"'\u201d\u2019)]*\s+")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def split_chunk(chunk: str, min_chars: int = MIN_SPLIT_CHARS, window: int = 200):
+    """
+    Bisect a chunk near its midpoint, preferring a sentence boundary.
+    
+    Args:
+        chunk: Text to split
+        min_chars: Minimum length of each half
+        window: How far from the midpoint to look for a boundary
+        
+    Returns:
+        Tuple of (first half, second half), or None if the chunk is too short to split
+    """
+    if len(chunk) < 2 * min_chars:
+        return None
+    
+    mid = len(chunk) // 2
+    start = max(min_chars, mid - window)
+    end = min(len(chunk) - min_chars, mid + window)
+    
+    for pattern in (_SENTENCE_END_RE, _WHITESPACE_RE):
+        boundaries = [m.end() for m in pattern.finditer(chunk, start, end)]
+        if boundaries:
+            split_at = min(boundaries, key=lambda pos: abs(pos - mid))
+            break
+    else:
+        split_at = mid
+    
+    return chunk[:split_at].strip(), chunk[split_at:].strip()
+
+
+# Compact JSON for batch uploads and cache files
+JSON_SEPARATORS = (",", ":")
+
+# Rough English average, used to estimate request tokens for rate limiting
+CHARS_PER_TOKEN = 4
+
+# Statuses after which a Batch API job will not change again
+BATCH_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
 
 
 class OpenAIError(Exception):
@@ -22,6 +182,16 @@ class OpenAIError(Exception):
     pass
 
 
+class ResponseTruncatedError(OpenAIError):
+    """Raised when a completion stops at max_tokens before its JSON is complete."""
+    pass
+
+
+# Failures that a shorter chunk is likely to avoid; the chunk is bisected and
+# each half analyzed on its own
+SPLITTABLE_ERRORS = (ResponseTruncatedError, openai.APITimeoutError)
+
+
 class Place(BaseModel):
     """Model for a geographical place with zoom level."""
     place: str
@@ -33,40 +203,529 @@ class PlacesList(BaseModel):
     places: List[Place]
 
 
+class BatchPlacesList(BaseModel):
+    """Model for place lists of several packed chunks, one per chunk in order."""
+    results: List[PlacesList]
+
+
+def place_dicts(places: List[Place]) -> List[Dict[str, Any]]:
+    """
+    Convert parsed places into dictionaries in one pass.
+    
+    Names are stripped; blank names and repeats of a name already seen
+    (case-insensitively) are dropped, keeping the first mention's zoom.
+    """
+    seen = set()
+    result = []
+    for place in places:
+        name = place.place.strip()
+        key = name.casefold()
+        if name and key not in seen:
+            seen.add(key)
+            result.append({"place": name, "zoom": place.zoom})
+    return result
+
+
+# Start of the places array in a streamed PlacesList response
+_PLACES_ARRAY_RE = re.compile(r'"places"\s*:\s*\[')
+
+
+class PlaceStreamParser:
+    """
+    Incrementally extract complete places from a streamed PlacesList response.
+    
+    Each place object is decoded as soon as its closing brace arrives, so
+    callers can act on early places while later ones are still generated.
+    """
+    
+    _decoder = json.JSONDecoder()
+    
+    def __init__(self):
+        self.text = ""
+        self._pos = None  # offset of the next unread place, once the array has started
+        self._done = False
+    
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        """Append streamed text and return the places it completed."""
+        self.text += delta
+        if self._pos is None:
+            match = _PLACES_ARRAY_RE.search(self.text)
+            if not match:
+                return []
+            self._pos = match.end()
+        
+        places = []
+        text = self.text
+        while not self._done:
+            pos = self._pos
+            while pos < len(text) and text[pos] in " \t\r\n,":
+                pos += 1
+            if pos >= len(text):
+                break
+            if text[pos] == "]":
+                self._done = True
+                break
+            try:
+                obj, end = self._decoder.raw_decode(text, pos)
+            except ValueError:
+                break  # object not complete yet
+            self._pos = end
+            try:
+                place = Place.model_validate(obj)
+            except ValidationError:
+                continue  # the final validation of the whole response reports it
+            places.append({"place": place.place, "zoom": place.zoom})
+        return places
+
+
+# Structured-output formats, built once; generating the JSON schema costs
+# far more CPU than parsing a response
+PLACES_RESPONSE_FORMAT = type_to_response_format_param(PlacesList)
+BATCH_PLACES_RESPONSE_FORMAT = type_to_response_format_param(BatchPlacesList)
+
+
 class OpenAIClient:
     """Client for extracting place names using OpenAI API."""
     
-    def __init__(self, api_key: str = None, model: str = None):
+    def __init__(self, api_key: str = None, model: str = None, max_concurrent: int = None,
+                 pack_chars: int = None, pack_size: int = None, cache_dir: str = None,
+                 min_chunk_chars: int = None, memo_size: int = None, max_tokens: int = None,
+                 escalate_model: str = None, rate_limit_state: str = None):
         """
         Initialize OpenAI client with API key and model.
         
         Args:
             api_key: OpenAI API key (defaults to config)
-            model: Model name (defaults to gpt-4o-2024-08-06 for structured outputs)
+            model: Model name for extraction; must support structured outputs
+                   (defaults to config, else gpt-4o-mini)
+            max_concurrent: Maximum in-flight requests for async batches (defaults to config)
+            pack_chars: Character budget for packing several chunks into one
+                        request in async batches; 0 disables packing (defaults to config)
+            pack_size: Maximum number of chunks packed into one request
+                       (defaults to config)
+            cache_dir: Directory for the on-disk results cache shared across runs;
+                       unset disables it (defaults to config)
+            min_chunk_chars: Chunks shorter than this, or with fewer than two
+                             capitalized words, are skipped without an API
+                             call; 0 disables the prefilter (defaults to config)
+            memo_size: Number of chunk results kept in memory, least recently
+                       used evicted first (defaults to config)
+            max_tokens: Completion token cap per chunk; packed requests get
+                        this per packed chunk. A response cut off at the cap
+                        raises OpenAIError (defaults to config)
+            escalate_model: Stronger model that re-analyzes a chunk when the
+                            extraction model finds no places in text with
+                            several likely proper nouns; empty or equal to
+                            model disables escalation (defaults to config)
+            rate_limit_state: File the rate limiter's quota is loaded from now
+                              and saved to at exit, so later runs start from
+                              it; unset disables persistence (defaults to config)
         """
         self.api_key = api_key or get_config("OPENAI_API_KEY")
         # Use a model that supports structured outputs
-        self.model = model or get_config("OPENAI_MODEL", "gpt-4o-2024-08-06")
+        self.model = model or get_config("OPENAI_MODEL", "gpt-4o-mini")
+        self.escalate_model = (
+            escalate_model if escalate_model is not None
+            else get_config("OPENAI_ESCALATE_MODEL", "gpt-4o-2024-08-06")
+        )
         self.logger = logging.getLogger(__name__)
         
         if not self.api_key:
             raise OpenAIError("OpenAI API key not provided")
         
+        self.max_concurrent = int(max_concurrent or get_config("OPENAI_MAX_CONCURRENT", "8"))
+        if self.max_concurrent < 1:
+            raise OpenAIError("max_concurrent must be at least 1")
+        
+        self.pack_chars = int(
+            pack_chars if pack_chars is not None else get_config("OPENAI_PACK_CHARS", "0")
+        )
+        self.pack_size = int(pack_size or get_config("OPENAI_PACK_SIZE", "8"))
+        if self.pack_size < 1:
+            raise OpenAIError("pack_size must be at least 1")
+        
+        self.min_chunk_chars = int(
+            min_chunk_chars if min_chunk_chars is not None
+            else get_config("OPENAI_MIN_CHUNK_CHARS", "40")
+        )
+        
         # Configure OpenAI client
-        self.client = OpenAI(api_key=self.api_key)
+        # Retries are handled by RETRY_POLICY alone; the SDK's own retries
+        # would multiply attempts and ignore the shared backoff
+        self.client = OpenAI(
+            api_key=self.api_key,
+            max_retries=0,
+            http_client=DefaultHttpxClient(limits=SYNC_HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+        )
+        
+        # Async client is created lazily, once per event loop
+        self.async_client = None
+        self._async_loop = None
+        
+        # Paces async requests from the rate-limit headers of every response,
+        # and to OPENAI_RPM / OPENAI_TPM when those are set
+        rpm = get_config("OPENAI_RPM")
+        tpm = get_config("OPENAI_TPM")
+        self.rate_limiter = OpenAIRateLimiter(
+            requests_per_minute=float(rpm) if rpm else None,
+            tokens_per_minute=float(tpm) if tpm else None
+        )
+        rate_limit_state = rate_limit_state or get_config("OPENAI_RATE_LIMIT_STATE")
+        if rate_limit_state:
+            self.rate_limiter.load_state(rate_limit_state)
+            atexit.register(self.rate_limiter.save_state, rate_limit_state)
+        
+        # The system message is identical for every request, so build it and
+        # its token estimate once and share it across all message lists
+        self._system_msg = {"role": "system", "content": SYSTEM_PROMPT}
+        self._sys_tokens = len(SYSTEM_PROMPT) // CHARS_PER_TOKEN
+        
+        # Chunks answered by the API, and how many of them were escalated
+        self.analyzed_chunks = 0
+        self.escalations = 0
+        
+        # Places already extracted per chunk text, so repeated text
+        # (epigraphs, section headers) is only sent once per run; bounded LRU
+        self.memo_size = int(memo_size or get_config("OPENAI_MEMO_SIZE", "4096"))
+        
+        # Place lists are short; capping output bounds the slowest responses
+        self.max_tokens = int(max_tokens or get_config("OPENAI_MAX_TOKENS", "512"))
+        self._chunk_memo: OrderedDict[str, List[Dict[str, Any]]] = OrderedDict()
+        
+        cache_dir = cache_dir or get_config("OPENAI_CACHE_DIR")
+        self._disk_cache = AnalysisCache(cache_dir) if cache_dir else None
         
         self.logger.info(f"Initialized OpenAI client with model: {self.model}")
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((Exception,)),  # Will catch OpenAI exceptions
-        reraise=True
-    )
+    def _get_async_client(self) -> AsyncOpenAI:
+        """
+        Get the async client bound to the running event loop.
+        
+        Each asyncio.run() call creates a new loop, and pooled connections
+        cannot be reused across loops, so the client is rebuilt on change.
+        """
+        loop = asyncio.get_running_loop()
+        if self.async_client is None or self._async_loop is not loop:
+            # Size the keep-alive pool to the concurrency limit so every
+            # in-flight request can reuse a warm TLS connection
+            self.async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                max_retries=0,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=httpx.Limits(
+                        max_connections=self.max_concurrent,
+                        max_keepalive_connections=self.max_concurrent
+                    ),
+                    timeout=HTTP_TIMEOUT,
+                    event_hooks={"response": [self.rate_limiter.on_response]}
+                )
+            )
+            self._async_loop = loop
+        return self.async_client
+    
+    async def aclose(self) -> None:
+        """
+        Close the async client and its connection pool.
+        
+        Call from the event loop that used the client before that loop ends;
+        otherwise its pooled connections are only reclaimed at interpreter exit.
+        """
+        if self.async_client is not None:
+            await self.async_client.close()
+            self.async_client = None
+            self._async_loop = None
+    
+    def _build_messages(self, chunk: str) -> List[Dict[str, str]]:
+        """Build the chat messages for a chunk."""
+        return [
+            self._system_msg,
+            {
+                "role": "user",
+                "content": (
+                    f"Identify all historical or modern place names mentioned in the following text. "
+                    f"For each place, determine the appropriate Google Maps zoom level based on its type. "
+                    f"Use modern place names where known:\n\n"
+                    f'"{chunk}"'
+                )
+            }
+        ]
+    
+    def _build_pack_messages(self, chunks: List[str]) -> List[Dict[str, str]]:
+        """Build the chat messages for several chunks analyzed in one request."""
+        numbered = "\n\n".join(
+            f'Chunk {i}:\n"{chunk}"' for i, chunk in enumerate(chunks)
+        )
+        return [
+            self._system_msg,
+            {
+                "role": "user",
+                "content": (
+                    f"The following {len(chunks)} numbered texts are independent. "
+                    f"For each one, in order, identify all historical or modern place names "
+                    f"it mentions and determine the appropriate Google Maps zoom level based "
+                    f"on each place's type. Return exactly one entry in results per text. "
+                    f"Use modern place names where known:\n\n"
+                    f"{numbered}"
+                )
+            }
+        ]
+    
+    def _estimate_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Estimate prompt tokens for messages from their character count."""
+        return self._sys_tokens + sum(
+            len(message["content"]) for message in messages
+            if message is not self._system_msg
+        ) // CHARS_PER_TOKEN
+    
+    def _should_skip(self, chunk: str) -> bool:
+        """
+        Cheap local check for chunks not worth an API call.
+        
+        Blank chunks are always skipped; with the prefilter on, so are short
+        chunks ("Chapter 3.") and ones with too few capitalized words to
+        contain a proper noun.
+        """
+        if not chunk or not chunk.strip():
+            return True
+        if not self.min_chunk_chars:
+            return False
+        if len(chunk) < self.min_chunk_chars:
+            return True
+        
+        capitalized = 0
+        for match in WORD_RE.finditer(chunk):
+            if not match.group()[0].islower():
+                capitalized += 1
+                if capitalized >= MIN_CAPITALIZED_WORDS:
+                    return False
+        return True
+    
+    def _pack_chunks(self, chunks: List[str]) -> List[List[int]]:
+        """
+        Greedily group chunk indices so each group stays within pack_chars
+        and holds at most pack_size chunks.
+        
+        Skipped chunks are left out; a chunk longer than the budget gets its
+        own group.
+        """
+        groups = []
+        current = []
+        current_chars = 0
+        
+        for i, chunk in enumerate(chunks):
+            if self._should_skip(chunk):
+                continue
+            if current and (current_chars + len(chunk) > self.pack_chars
+                            or len(current) >= self.pack_size):
+                groups.append(current)
+                current = []
+                current_chars = 0
+            current.append(i)
+            current_chars += len(chunk)
+        
+        if current:
+            groups.append(current)
+        return groups
+    
+    def _get_memoized(self, chunk: str):
+        """Return a copy of the memoized or disk-cached places for chunk, or None if not seen."""
+        key = chunk_cache_key(chunk)
+        places = self._chunk_memo.get(key)
+        if places is not None:
+            self._chunk_memo.move_to_end(key)
+        elif self._disk_cache is not None:
+            places = self._disk_cache.get(
+                AnalysisCache.make_key(self.model, SYSTEM_PROMPT, key)
+            )
+            if places is not None:
+                self._memoize(key, places)
+        if places is None:
+            return None
+        self.logger.debug("Reusing places for repeated chunk (%d chars)", len(chunk))
+        return [dict(place) for place in places]
+    
+    def _memoize(self, key: str, places: List[Dict[str, Any]]) -> None:
+        """Store places under a chunk_cache_key in the in-memory LRU, evicting the oldest entry if full."""
+        self._chunk_memo[key] = places
+        self._chunk_memo.move_to_end(key)
+        if len(self._chunk_memo) > self.memo_size:
+            self._chunk_memo.popitem(last=False)
+    
+    def _remember(self, chunk: str, places: List[Dict[str, Any]]) -> None:
+        """Record the places the API found in chunk in the memo and the disk cache."""
+        self.analyzed_chunks += 1
+        key = chunk_cache_key(chunk)
+        self._memoize(key, [dict(place) for place in places])
+        if self._disk_cache is not None:
+            self._disk_cache.put(
+                AnalysisCache.make_key(self.model, SYSTEM_PROMPT, key), places
+            )
+    
+    def _validate_completion(self, content: Optional[str], finish_reason: Optional[str],
+                             refusal: Optional[str], model):
+        """
+        Validate a structured-output completion's JSON content against model.
+        
+        Raises:
+            ResponseTruncatedError: If the completion stopped at max_tokens
+            OpenAIError: If the content is missing or does not match model
+        """
+        if finish_reason == "length":
+            # Output hit max_tokens; the JSON is truncated and would fail validation
+            raise ResponseTruncatedError(
+                "Response truncated at max_tokens; raise OPENAI_MAX_TOKENS or use smaller chunks"
+            )
+        if not content:
+            raise OpenAIError(f"Model returned no content{f': {refusal}' if refusal else ''}")
+        # pydantic-core parses and validates the JSON in one native pass
+        try:
+            return model.model_validate_json(content)
+        except ValidationError as e:
+            self.logger.error(f"Model returned invalid structured output: {e}")
+            raise OpenAIError(f"Model returned invalid structured output: {e}") from e
+    
+    def _parse_content(self, response, model):
+        """Validate a structured-output response's first choice against model."""
+        choice = response.choices[0]
+        message = choice.message
+        return self._validate_completion(
+            message.content, choice.finish_reason, getattr(message, "refusal", None), model
+        )
+    
+    def _parse_places(self, response, chunk: str, start_time: float) -> List[Dict[str, Any]]:
+        """Convert a structured-output response into place dictionaries."""
+        return self._record_places(self._parse_content(response, PlacesList), chunk, start_time)
+    
+    def _record_places(self, parsed_output: PlacesList, chunk: str,
+                       start_time: float) -> List[Dict[str, Any]]:
+        """Convert validated places for chunk into dictionaries."""
+        # Convert Pydantic models to dictionaries
+        places = place_dicts(parsed_output.places)
+        
+        # Hot path: skip timing and formatting unless debug output is on
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Analyzed chunk (%d chars) in %.2fs, found %d places: %s%s",
+                len(chunk), time.perf_counter() - start_time, len(places),
+                places[:3], '...' if len(places) > 3 else ''
+            )
+        
+        return places
+    
+    def _should_escalate(self, chunk: str, places: List[Dict[str, Any]]) -> bool:
+        """Check whether an empty result looks like a miss worth re-running on escalate_model."""
+        if places or not self.escalate_model or self.escalate_model == self.model:
+            return False
+        return len(MID_SENTENCE_CAPITAL_RE.findall(chunk)) >= ESCALATION_MIN_CANDIDATES
+    
+    def _escalate(self, chunk: str) -> List[Dict[str, Any]]:
+        """Re-analyze chunk with escalate_model, retrying transient errors."""
+        self.escalations += 1
+        self.logger.info(f"No places found in a chunk with likely proper nouns, retrying with {self.escalate_model}")
+        start_time = time.perf_counter()
+        response = self._create_completion(self.escalate_model, self._build_messages(chunk))
+        return self._parse_places(response, chunk, start_time)
+    
+    @retry(**RETRY_POLICY)
+    def _create_completion(self, model: str, messages: List[Dict[str, str]]):
+        """Send one structured-output places request to model, retrying transient errors."""
+        try:
+            return self.client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0,
+                max_tokens=self.max_tokens,
+                response_format=PLACES_RESPONSE_FORMAT,
+            )
+        except Exception as e:
+            self._handle_api_error(e)
+    
+    async def _escalate_async(self, chunk: str) -> List[Dict[str, Any]]:
+        """Async variant of _escalate, retrying transient errors."""
+        self.escalations += 1
+        self.logger.info(f"No places found in a chunk with likely proper nouns, retrying with {self.escalate_model}")
+        start_time = time.perf_counter()
+        client = self._get_async_client()
+        messages = self._build_messages(chunk)
+        
+        async for attempt in AsyncRetrying(**RETRY_POLICY):
+            with attempt:
+                await self.rate_limiter.acquire(self._estimate_tokens(messages))
+                try:
+                    response = await client.chat.completions.create(
+                        model=self.escalate_model,
+                        messages=messages,
+                        temperature=0,
+                        max_tokens=self.max_tokens,
+                        response_format=PLACES_RESPONSE_FORMAT,
+                    )
+                except Exception as e:
+                    self._handle_api_error(e)
+        
+        return self._parse_places(response, chunk, start_time)
+    
+    def _parse_pack(self, response, chunks: List[str], start_time: float) -> List[List[Dict[str, Any]]]:
+        """Convert a packed structured-output response into one place list per chunk."""
+        parsed_output = self._parse_content(response, BatchPlacesList)
+        
+        if len(parsed_output.results) != len(chunks):
+            raise OpenAIError(
+                f"Packed response returned {len(parsed_output.results)} results "
+                f"for {len(chunks)} chunks"
+            )
+        
+        results = []
+        for chunk, places_list in zip(chunks, parsed_output.results):
+            places = place_dicts(places_list.places)
+            self._remember(chunk, places)
+            results.append(places)
+        
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(
+                "Analyzed %d packed chunks in %.2fs, found %d places",
+                len(chunks), time.perf_counter() - start_time,
+                sum(len(r) for r in results)
+            )
+        
+        return results
+    
+    def _handle_api_error(self, e: Exception) -> None:
+        """Re-raise retryable errors as-is and wrap everything else in OpenAIError."""
+        if isinstance(e, RETRYABLE):
+            self.logger.warning(f"OpenAI API error (will retry): {e}")
+            raise e
+        else:
+            self.logger.error(f"OpenAI API call failed: {e}")
+            raise OpenAIError(f"OpenAI API call failed: {e}")
+    
+    def _merge_split(self, chunk: str, results: List[List[Dict[str, Any]]],
+                     remember: bool) -> List[Dict[str, Any]]:
+        """
+        Merge the place lists of a split chunk's parts, keeping each place's first mention.
+        
+        The merged list is recorded for chunk only if remember is set; the
+        parts themselves are never recorded, so a split chunk counts once.
+        """
+        seen = set()
+        places = []
+        for part_places in results:
+            for place in part_places:
+                name = place["place"].casefold()
+                if name not in seen:
+                    seen.add(name)
+                    places.append(place)
+        
+        if remember:
+            self._remember(chunk, places)
+        return places
+    
     def analyze_chunk(self, chunk: str) -> List[Dict[str, Any]]:
         """
         Extract place names from a single text chunk using OpenAI.
         
+        A chunk whose response is truncated at max_tokens or times out is
+        bisected at a sentence boundary and each half analyzed on its own.
+        
         Args:
             chunk: Text content to analyze
             
@@ -76,123 +735,634 @@ class OpenAIClient:
         Raises:
             OpenAIError: If API call fails after retries
         """
-        if not chunk or not chunk.strip():
+        return self._split_on_failure(chunk, remember=True)
+    
+    def _split_on_failure(self, chunk: str, remember: bool) -> List[Dict[str, Any]]:
+        """Run _analyze_chunk_once, bisecting and recursing on truncation or timeout."""
+        try:
+            return self._analyze_chunk_once(chunk, remember)
+        except SPLITTABLE_ERRORS as e:
+            halves = split_chunk(chunk)
+            if halves is None:
+                raise
+            self.logger.warning(f"Splitting chunk ({len(chunk)} chars) after failure: {e}")
+            results = [self._split_on_failure(half, remember=False) for half in halves]
+            return self._merge_split(chunk, results, remember)
+    
+    def _analyze_chunk_once(self, chunk: str, remember: bool = True) -> List[Dict[str, Any]]:
+        """
+        Analyze a chunk with a single (retried) request; see analyze_chunk.
+        
+        Escalation runs after the retried request, with its own retries,
+        so a transient error from escalate_model does not resend the
+        primary request.
+        """
+        if self._should_skip(chunk):
             return []
         
-        start_time = time.time()
+        memoized = self._get_memoized(chunk)
+        if memoized is not None:
+            return memoized
+        
+        start_time = time.perf_counter()
+        
+        # Use structured outputs with Pydantic models
+        response = self._create_completion(self.model, self._build_messages(chunk))
         
+        places = self._parse_places(response, chunk, start_time)
+        if self._should_escalate(chunk, places):
+            places = self._escalate(chunk)
+        
+        if remember:
+            self._remember(chunk, places)
+        return places
+    
+    async def _split_on_failure_async(self, chunk: str, analyze,
+                                      remember: bool = True) -> List[Dict[str, Any]]:
+        """Run analyze(chunk, remember), bisecting and recursing on truncation or timeout."""
         try:
-            # Use structured outputs with Pydantic models
-            response = self.client.beta.chat.completions.parse(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a historical geography expert. Extract all geographical "
-                            "place names (cities, countries, regions, landmarks) from text. "
-                            "Use modern names where possible. For each place, provide an appropriate "
-                            "Google Maps zoom level: "
-                            "- Continents: 3-4"
-                            "- Countries: 5-6"
-                            "- States/Regions: 6-8"
-                            "- Cities: 10-12"
-                            "- Neighborhoods/Districts: 13-15"
-                            "- Specific landmarks/buildings: 16-18"
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": (
-                            f"Identify all historical or modern place names mentioned in the following text. "
-                            f"For each place, determine the appropriate Google Maps zoom level based on its type. "
-                            f"Use modern place names where known:\n\n"
-                            f'"{chunk}"'
-                        )
-                    }
-                ],
-                temperature=0,
-                response_format=PlacesList,
-            )
+            return await analyze(chunk, remember)
+        except SPLITTABLE_ERRORS as e:
+            halves = split_chunk(chunk)
+            if halves is None:
+                raise
+            self.logger.warning(f"Splitting chunk ({len(chunk)} chars) after failure: {e}")
+            results = [
+                await self._split_on_failure_async(half, analyze, remember=False)
+                for half in halves
+            ]
+            return self._merge_split(chunk, results, remember)
+    
+    async def analyze_chunk_async(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Async variant of analyze_chunk using AsyncOpenAI.
+        
+        Like analyze_chunk, a truncated or timed-out chunk is bisected and
+        its halves analyzed separately.
+        
+        Args:
+            chunk: Text content to analyze
             
-            # Extract the parsed structured output
-            parsed_output = response.choices[0].message.parsed
+        Returns:
+            List of dictionaries with 'place' and 'zoom' fields
             
-            # Convert Pydantic models to dictionaries
-            places = [
-                {"place": place.place, "zoom": place.zoom}
-                for place in parsed_output.places
-            ]
+        Raises:
+            OpenAIError: If API call fails after retries
+        """
+        return await self._split_on_failure_async(chunk, self._analyze_chunk_async_once)
+    
+    async def _analyze_chunk_async_once(self, chunk: str, remember: bool = True) -> List[Dict[str, Any]]:
+        """Analyze a chunk with a single (retried) async request."""
+        if self._should_skip(chunk):
+            return []
+        
+        memoized = self._get_memoized(chunk)
+        if memoized is not None:
+            return memoized
+        
+        start_time = time.perf_counter()
+        client = self._get_async_client()
+        messages = self._build_messages(chunk)
+        
+        async for attempt in AsyncRetrying(**RETRY_POLICY):
+            with attempt:
+                await self.rate_limiter.acquire(self._estimate_tokens(messages))
+                try:
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0,
+                        max_tokens=self.max_tokens,
+                        response_format=PLACES_RESPONSE_FORMAT,
+                    )
+                except Exception as e:
+                    self._handle_api_error(e)
+        
+        places = self._parse_places(response, chunk, start_time)
+        if self._should_escalate(chunk, places):
+            places = await self._escalate_async(chunk)
+        
+        if remember:
+            self._remember(chunk, places)
+        return places
+    
+    async def analyze_chunk_streaming(self, chunk: str,
+                                      on_place: Callable[[Dict[str, Any]], None]) -> List[Dict[str, Any]]:
+        """
+        Async analysis that reports each place as soon as it is generated.
+        
+        The response is streamed and on_place is called for every place
+        object as it completes, so downstream work (map fetching) can start
+        before the model finishes the list. Memoized chunks report all
+        their places immediately. Places from an attempt that fails
+        mid-stream and is retried (or split) may be reported twice.
+        
+        Args:
+            chunk: Text content to analyze
+            on_place: Called with each place dict ('place' and 'zoom')
             
-            elapsed = time.time() - start_time
-            self.logger.debug(
-                f"Analyzed chunk ({len(chunk)} chars) in {elapsed:.2f}s, "
-                f"found {len(places)} places: {places[:3]}{'...' if len(places) > 3 else ''}"
-            )
+        Returns:
+            The complete list of places, validated once the stream ends
             
-            return places
+        Raises:
+            OpenAIError: If API call fails after retries
+        """
+        return await self._split_on_failure_async(
+            chunk, lambda part, remember: self._analyze_chunk_streaming_once(part, on_place, remember)
+        )
+    
+    async def _analyze_chunk_streaming_once(self, chunk: str,
+                                            on_place: Callable[[Dict[str, Any]], None],
+                                            remember: bool = True) -> List[Dict[str, Any]]:
+        """Stream a chunk's analysis with a single (retried) request."""
+        if self._should_skip(chunk):
+            return []
+        
+        memoized = self._get_memoized(chunk)
+        if memoized is not None:
+            for place in memoized:
+                on_place(dict(place))
+            return memoized
+        
+        start_time = time.perf_counter()
+        client = self._get_async_client()
+        messages = self._build_messages(chunk)
+        
+        async for attempt in AsyncRetrying(**RETRY_POLICY):
+            with attempt:
+                await self.rate_limiter.acquire(self._estimate_tokens(messages))
+                try:
+                    content, finish_reason, refusal = await self._stream_completion(
+                        client, messages, on_place
+                    )
+                except Exception as e:
+                    self._handle_api_error(e)
+        
+        parsed_output = self._validate_completion(content, finish_reason, refusal, PlacesList)
+        places = self._record_places(parsed_output, chunk, start_time)
+        if self._should_escalate(chunk, places):
+            places = await self._escalate_async(chunk)
+            for place in places:
+                on_place(dict(place))
+        
+        if remember:
+            self._remember(chunk, places)
+        return places
+    
+    async def _stream_completion(self, client: AsyncOpenAI, messages: List[Dict[str, str]],
+                                 on_place: Callable[[Dict[str, Any]], None]):
+        """
+        Stream a places completion, passing completed places to on_place.
+        
+        Returns:
+            Tuple of (full content, finish reason, refusal text or None)
+        """
+        parser = PlaceStreamParser()
+        finish_reason = None
+        refusal = ""
+        
+        stream = await client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0,
+            max_tokens=self.max_tokens,
+            response_format=PLACES_RESPONSE_FORMAT,
+            stream=True,
+        )
+        async for event in stream:
+            if not event.choices:
+                continue
+            choice = event.choices[0]
+            if choice.delta.content:
+                for place in parser.feed(choice.delta.content):
+                    on_place(place)
+            if getattr(choice.delta, "refusal", None):
+                refusal += choice.delta.refusal
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+        
+        return parser.text, finish_reason, refusal or None
+    
+    async def analyze_chunk_pack_async(self, chunks: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        Extract place names from several chunks with a single request.
+        
+        Packing amortizes the per-request latency and system prompt over
+        all chunks in the pack.
+        
+        Args:
+            chunks: Non-empty text chunks to analyze together
             
-        except Exception as e:
-            # Check if it's a rate limit or connection error for retry
-            error_str = str(e).lower()
-            if any(term in error_str for term in ['rate limit', 'connection', 'timeout', 'service unavailable']):
-                self.logger.warning(f"OpenAI API error (will retry): {e}")
-                raise
-            else:
-                self.logger.error(f"OpenAI API call failed: {e}")
-                raise OpenAIError(f"OpenAI API call failed: {e}")
+        Returns:
+            List of place lists, one per input chunk
+            
+        Raises:
+            OpenAIError: If API call fails after retries or the response
+                         does not contain one result per chunk
+        """
+        start_time = time.perf_counter()
+        client = self._get_async_client()
+        messages = self._build_pack_messages(chunks)
+        
+        async for attempt in AsyncRetrying(**RETRY_POLICY):
+            with attempt:
+                await self.rate_limiter.acquire(self._estimate_tokens(messages))
+                try:
+                    response = await client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        temperature=0,
+                        max_tokens=self.max_tokens * len(chunks),
+                        response_format=BATCH_PLACES_RESPONSE_FORMAT,
+                    )
+                except Exception as e:
+                    self._handle_api_error(e)
+        
+        return self._parse_pack(response, chunks, start_time)
     
-    def batch_analyze_chunks(self, chunks: List[str]) -> List[List[Dict[str, Any]]]:
+    def batch_analyze_chunks(self, chunks: List[str], mode: str = "online",
+                             on_progress: Optional[Callable[[int, int], None]] = None
+                             ) -> List[List[Dict[str, Any]]]:
         """
         Process multiple text chunks to extract place names.
         
+        In "online" mode this is a blocking wrapper that runs
+        batch_analyze_chunks_async on a fresh event loop, so requests are
+        multiplexed on one thread instead of issued one at a time. Callers
+        already inside an event loop should await batch_analyze_chunks_async
+        directly. In "batch" mode the chunks go through the Batch API via
+        batch_analyze_chunks_offline: cheaper and outside the per-minute
+        request limits, but it may take hours.
+        
         Args:
             chunks: List of text chunks to analyze
+            mode: "online" for concurrent requests, "batch" for the Batch API
+            on_progress: Called as on_progress(done, total) after each chunk
+                         finishes in online mode
             
         Returns:
-            List of place lists, one per input chunk. Each place is a dict with 'place' and 'zoom'
+            List of place lists, one per input chunk. Each place is a dict with 'place' and 'zoom'.
+            Failed chunks yield an empty list
             
         Raises:
-            OpenAIError: If any chunk analysis fails after retries
+            OpenAIError: If mode is unknown, or a batch-mode job fails
         """
+        if mode not in ("online", "batch"):
+            raise OpenAIError(f"Unknown batch mode '{mode}', expected 'online' or 'batch'")
+        
         if not chunks:
             self.logger.info("No chunks to analyze")
             return []
         
-        self.logger.info(f"Sending {len(chunks)} chunks to OpenAI for analysis")
+        if mode == "batch":
+            return self.batch_analyze_chunks_offline(chunks)
+        return asyncio.run(self._batch_analyze_and_close(chunks, on_progress))
+    
+    async def _batch_analyze_and_close(self, chunks: List[str],
+                                       on_progress: Optional[Callable[[int, int], None]]
+                                       ) -> List[List[Dict[str, Any]]]:
+        """Run batch_analyze_chunks_async, closing the async client before the loop ends."""
+        try:
+            return await self.batch_analyze_chunks_async(chunks, on_progress)
+        finally:
+            await self.aclose()
+    
+    def iter_analyze_chunks(self, chunks: List[str]) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Analyze chunks concurrently, yielding each chunk's places as it completes.
         
-        # Process chunks sequentially
-        results = []
+        A blocking wrapper around iter_analyze_chunks_async that drives it on
+        a private event loop, so callers can hand places downstream (e.g. to
+        the geocoder) while later chunks are still in flight and no full
+        result list is ever held.
+        
+        Args:
+            chunks: List of text chunks to analyze
+            
+        Yields:
+            (index, places) tuples in completion order, where index is the
+            chunk's position in chunks. Failed chunks yield an empty list
+        """
+        loop = asyncio.new_event_loop()
+        results = self.iter_analyze_chunks_async(chunks)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(results.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(results.aclose())
+            loop.run_until_complete(self.aclose())
+            loop.close()
+    
+    async def iter_analyze_chunks_async(
+            self, chunks: List[str]) -> AsyncIterator[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Analyze chunks concurrently, yielding each chunk's places as it completes.
+        
+        Args:
+            chunks: List of text chunks to analyze
+            
+        Yields:
+            (index, places) tuples in completion order. Failed chunks are
+            logged and yield an empty list
+        """
+        # Close the inner generators with this one, so in-flight tasks are
+        # cancelled while the event loop is still running
+        async with contextlib.aclosing(self._iter_outcomes(chunks)) as outcomes:
+            async for i, outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    self.logger.error(f"Failed to analyze chunk {i}: {outcome}")
+                    outcome = []
+                yield i, outcome
+    
+    async def batch_analyze_chunks_async(self, chunks: List[str],
+                                         on_progress: Optional[Callable[[int, int], None]] = None
+                                         ) -> List[List[Dict[str, Any]]]:
+        """
+        Process multiple text chunks concurrently to extract place names.
+        
+        Collects iter_analyze_chunks_async's results back into input order;
+        prefer the iterator when results can be consumed as they arrive.
+        
+        Args:
+            chunks: List of text chunks to analyze
+            on_progress: Called as on_progress(done, total) after each chunk finishes
+            
+        Returns:
+            List of place lists, one per input chunk. Failed chunks yield an empty list
+        """
+        if not chunks:
+            self.logger.info("No chunks to analyze")
+            return []
+        
+        results = [[] for _ in chunks]
         errors = []
+        done = 0
+        async for i, outcome in self._iter_outcomes(chunks):
+            if isinstance(outcome, BaseException):
+                error_msg = f"Failed to analyze chunk {i}: {outcome}"
+                self.logger.error(error_msg)
+                errors.append(error_msg)
+            else:
+                results[i] = outcome
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(chunks))
         
+        self._log_batch_summary(results, errors)
+        return results
+    
+    async def _iter_outcomes(self, chunks: List[str]) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Yield (index, places or exception) for each chunk as it completes.
+        
+        Chunks that normalize to the same text (running headers, repeated
+        epigraphs) are dispatched once, and the result is yielded for every
+        index where they occur. The memo alone cannot catch these, since
+        copies in the same batch are all in flight before any result lands.
+        """
+        positions: Dict[str, List[int]] = {}
+        unique = []
         for i, chunk in enumerate(chunks):
-            try:
+            key = chunk_cache_key(chunk)
+            if key not in positions:
+                positions[key] = []
+                unique.append(chunk)
+            positions[key].append(i)
+        copies = list(positions.values())
+        
+        if len(unique) < len(chunks):
+            self.logger.info(
+                f"Skipping {len(chunks) - len(unique)} repeated chunks in batch of {len(chunks)}"
+            )
+        
+        async with contextlib.aclosing(self._iter_unique_outcomes(unique)) as outcomes:
+            async for u, outcome in outcomes:
+                first, *rest = copies[u]
+                yield first, outcome
+                for i in rest:
+                    # Separate lists so callers cannot alias each other's results
+                    yield i, outcome if isinstance(outcome, BaseException) else list(outcome)
+    
+    async def _iter_unique_outcomes(self, chunks: List[str]) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Yield (index, places or exception) for each chunk as it completes.
+        
+        Requests are bounded by a semaphore of size max_concurrent. When
+        pack_chars is set, consecutive chunks are packed into shared
+        requests; a pack whose response cannot be split back into chunks is
+        retried chunk by chunk.
+        """
+        if not chunks:
+            return
+        
+        self.logger.info(
+            f"Sending {len(chunks)} chunks to OpenAI for analysis "
+            f"(max {self.max_concurrent} concurrent)"
+        )
+        
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        started = 0
+        
+        async def bounded(chunk: str) -> List[Dict[str, Any]]:
+            nonlocal started
+            async with semaphore:
                 # Log progress for longer batches
-                if len(chunks) > 10 and i % 10 == 0:
-                    self.logger.info(f"Processing chunk {i+1}/{len(chunks)}")
-                
-                result = self.analyze_chunk(chunk)
-                results.append(result)
-                
+                if len(chunks) > 10 and started % 10 == 0:
+                    self.logger.info(f"Processing chunk {started+1}/{len(chunks)}")
+                started += 1
+                return await self.analyze_chunk_async(chunk)
+        
+        async def run_single(i: int) -> List[Tuple[int, Any]]:
+            try:
+                return [(i, await bounded(chunks[i]))]
+            except Exception as e:
+                return [(i, e)]
+        
+        async def run_group(group: List[int]) -> List[Tuple[int, Any]]:
+            outcomes = []
+            pending = []
+            for i in group:
+                memoized = self._get_memoized(chunks[i])
+                if memoized is None:
+                    pending.append(i)
+                else:
+                    outcomes.append((i, memoized))
+            
+            if len(pending) > 1:
+                try:
+                    async with semaphore:
+                        packed = await self.analyze_chunk_pack_async([chunks[i] for i in pending])
+                    return outcomes + list(zip(pending, packed))
+                except Exception as e:
+                    self.logger.warning(
+                        f"Packed request for {len(pending)} chunks failed, "
+                        f"retrying individually: {e}"
+                    )
+            
+            for single in await asyncio.gather(*(run_single(i) for i in pending)):
+                outcomes.extend(single)
+            return outcomes
+        
+        if self.pack_chars > 0:
+            groups = self._pack_chunks(chunks)
+            self.logger.info(f"Packed {len(chunks)} chunks into {len(groups)} requests")
+            tasks = [asyncio.ensure_future(run_group(group)) for group in groups]
+        else:
+            tasks = [asyncio.ensure_future(run_single(i)) for i in range(len(chunks))]
+        
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for i, outcome in await finished:
+                    yield i, outcome
+        finally:
+            # Don't leave requests running if the consumer stops early, and
+            # let them unwind before the caller closes the loop
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def batch_analyze_chunks_offline(self, chunks: List[str],
+                                     poll_interval: float = 30.0,
+                                     timeout: float = 24 * 3600,
+                                     max_poll_interval: float = 600.0) -> List[List[Dict[str, Any]]]:
+        """
+        Process chunks through the OpenAI Batch API.
+        
+        Submits one JSONL file of requests and polls until the job finishes.
+        Batch jobs are billed at a discount but may take up to 24 hours, so
+        this suits whole-book runs where latency does not matter.
+        
+        Args:
+            chunks: List of text chunks to analyze
+            poll_interval: Seconds to wait before the first status check; the
+                           wait doubles after each check
+            timeout: Maximum seconds to wait for the job to finish
+            max_poll_interval: Upper bound on the wait between status checks
+            
+        Returns:
+            List of place lists, one per input chunk. Failed chunks yield an empty list
+            
+        Raises:
+            OpenAIError: If the batch job fails, expires, is cancelled or times out
+        """
+        if not chunks:
+            self.logger.info("No chunks to analyze")
+            return []
+        
+        results = [[] for _ in chunks]
+        shared_body = {
+            "model": self.model,
+            "temperature": 0,
+            "max_tokens": self.max_tokens,
+            "response_format": PLACES_RESPONSE_FORMAT,
+        }
+        
+        lines = []
+        submitted = []
+        for i, chunk in enumerate(chunks):
+            if self._should_skip(chunk):
+                continue
+            
+            memoized = self._get_memoized(chunk)
+            if memoized is not None:
+                results[i] = memoized
+                continue
+            
+            submitted.append(i)
+            lines.append(json.dumps({
+                "custom_id": f"chunk-{i}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {**shared_body, "messages": self._build_messages(chunk)},
+            }, separators=JSON_SEPARATORS))
+        
+        if not lines:
+            return results
+        
+        try:
+            batch_file = self.client.files.create(
+                file=("places_batch.jsonl", "\n".join(lines).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+        except Exception as e:
+            raise OpenAIError(f"Failed to submit batch job: {e}")
+        
+        self.logger.info(f"Submitted batch {batch.id} with {len(lines)} chunks")
+        
+        deadline = time.time() + timeout
+        wait = poll_interval
+        while batch.status not in BATCH_TERMINAL_STATUSES:
+            if time.time() > deadline:
+                raise OpenAIError(f"Batch {batch.id} did not finish within {timeout}s")
+            time.sleep(wait)
+            # Jobs take minutes to hours; back off so long jobs are not polled constantly
+            wait = min(wait * 2, max_poll_interval)
+            batch = self.client.batches.retrieve(batch.id)
+        
+        if batch.status != "completed":
+            raise OpenAIError(f"Batch {batch.id} ended with status '{batch.status}'")
+        
+        errors = []
+        # A completed job still reports requests that failed, in a separate error file
+        output = "\n".join(
+            self.client.files.content(file_id).text
+            for file_id in (batch.output_file_id, batch.error_file_id) if file_id
+        )
+        
+        answered = set()
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            i = int(record["custom_id"].split("-", 1)[1])
+            answered.add(i)
+            response = record.get("response") or {}
+            
+            try:
+                if response.get("status_code") != 200:
+                    raise OpenAIError(record.get("error") or response.get("body"))
+                choice = response["body"]["choices"][0]
+                if choice.get("finish_reason") == "length":
+                    raise OpenAIError("Response truncated at max_tokens")
+                parsed = PlacesList.model_validate_json(choice["message"]["content"])
             except Exception as e:
                 error_msg = f"Failed to analyze chunk {i}: {e}"
                 self.logger.error(error_msg)
                 errors.append(error_msg)
-                results.append([])  # Empty result for failed chunk
+                continue
+            
+            results[i] = place_dicts(parsed.places)
+            self._remember(chunks[i], results[i])
+        
+        for i in submitted:
+            if i not in answered:
+                error_msg = f"Failed to analyze chunk {i}: No result in batch output"
+                self.logger.error(error_msg)
+                errors.append(error_msg)
         
-        # Report summary
+        self._log_batch_summary(results, errors)
+        return results
+    
+    def _log_batch_summary(self, results: List[List[Dict[str, Any]]], errors: List[str]) -> None:
+        """Log a summary of a batch run."""
         total_places = sum(len(result) for result in results)
         successful_chunks = len([r for r in results if r])
         
         self.logger.info(
-            f"Completed analysis: {successful_chunks}/{len(chunks)} chunks successful, "
+            f"Completed analysis: {successful_chunks}/{len(results)} chunks successful, "
             f"{total_places} total places found"
         )
         
         if errors:
             self.logger.warning(f"Encountered {len(errors)} errors during batch processing")
-        
-        return results
     
     def get_usage_stats(self) -> Dict[str, Any]:
         """
@@ -203,8 +1373,14 @@ class OpenAIClient:
         """
         return {
             "model": self.model,
+            "escalate_model": self.escalate_model,
             "api_key_set": bool(self.api_key),
-            "supports_structured_outputs": True
+            "supports_structured_outputs": True,
+            "analyzed_chunks": self.analyzed_chunks,
+            "escalations": self.escalations,
+            "escalation_rate": (
+                self.escalations / self.analyzed_chunks if self.analyzed_chunks else 0.0
+            )
         }
     
     def extract_place_names_only(self, chunk: str) -> List[str]:
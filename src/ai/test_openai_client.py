@@ -2,12 +2,23 @@
 Test suite for OpenAI client place name extraction with structured outputs.
 """
 
+import asyncio
 import json
 import logging
+import os
+import time
+import httpx
+import openai
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 
-from .openai_client import OpenAIClient, OpenAIError, Place, PlacesList
+from .ai_cache import AnalysisCache
+from .ai_rate_limiter import OpenAIRateLimiter, parse_reset_duration
+from .openai_client import (
+    OpenAIClient, OpenAIError, Place, PlacesList, BatchPlacesList, SYSTEM_PROMPT,
+    PLACES_RESPONSE_FORMAT, BATCH_PLACES_RESPONSE_FORMAT, HTTP_TIMEOUT, PlaceStreamParser,
+    split_chunk
+)
 
 
 @pytest.fixture
@@ -16,6 +27,8 @@ def mock_config():
     config_values = {
         "OPENAI_API_KEY": "test-api-key",
         "OPENAI_MODEL": "gpt-4o-2024-08-06",
+        # Tests exercise the API path with short chunks; the prefilter has its own tests
+        "OPENAI_MIN_CHUNK_CHARS": "0",
     }
     
     def get_config(key, default=None):
@@ -39,10 +52,17 @@ def mock_openai_response():
     ])
     
     response.choices[0].message = Mock()
-    response.choices[0].message.parsed = parsed_output
+    response.choices[0].message.content = parsed_output.model_dump_json()
     return response
 
 
+def _api_status_error(error_cls, status_code, headers=None):
+    """Build an OpenAI SDK status error as raised for a real HTTP response."""
+    request = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+    response = httpx.Response(status_code, request=request, headers=headers)
+    return error_cls(f"Error code: {status_code}", response=response, body=None)
+
+
 @pytest.fixture
 def client(mock_config):
     """Create a test client with mocked configuration."""
@@ -60,7 +80,8 @@ class TestOpenAIClientInitialization:
             
             assert client.api_key == "test-api-key"
             assert client.model == "gpt-4o-2024-08-06"
-            mock_openai.assert_called_once_with(api_key="test-api-key")
+            mock_openai.assert_called_once()
+            assert mock_openai.call_args.kwargs["api_key"] == "test-api-key"
     
     def test_init_with_custom_values(self, mock_config):
         """Test initialization with custom API key and model."""
@@ -69,7 +90,25 @@ class TestOpenAIClientInitialization:
             
             assert client.api_key == "custom-key"
             assert client.model == "gpt-4o-mini"
-            mock_openai.assert_called_once_with(api_key="custom-key")
+            mock_openai.assert_called_once()
+            assert mock_openai.call_args.kwargs["api_key"] == "custom-key"
+    
+    def test_init_configures_http_clients(self, mock_config):
+        """Test both clients get pooled HTTP clients with explicit timeouts."""
+        with patch('src.ai.openai_client.OpenAI') as mock_openai:
+            client = OpenAIClient(max_concurrent=16)
+        
+        http_client = mock_openai.call_args.kwargs["http_client"]
+        assert http_client.timeout == HTTP_TIMEOUT
+        assert mock_openai.call_args.kwargs["max_retries"] == 0
+        
+        async def get_async_http_client():
+            return client._get_async_client()._client
+        
+        async_http_client = asyncio.run(get_async_http_client())
+        assert async_http_client.timeout == HTTP_TIMEOUT
+        assert async_http_client._transport._pool._max_connections == 16
+        assert client.async_client.max_retries == 0
     
     def test_init_without_api_key(self):
         """Test initialization fails without API key."""
@@ -83,7 +122,7 @@ class TestAnalyzeChunk:
     
     def test_analyze_chunk_success(self, client, mock_openai_response):
         """Test successful place name extraction with zoom levels."""
-        client.client.beta.chat.completions.parse = Mock(return_value=mock_openai_response)
+        client.client.chat.completions.create = Mock(return_value=mock_openai_response)
         
         result = client.analyze_chunk("I traveled from Paris to London and then to New York.")
         
@@ -91,7 +130,7 @@ class TestAnalyzeChunk:
         assert result[0] == {"place": "Paris", "zoom": 11}
         assert result[1] == {"place": "London", "zoom": 11}
         assert result[2] == {"place": "New York", "zoom": 11}
-        client.client.beta.chat.completions.parse.assert_called_once()
+        client.client.chat.completions.create.assert_called_once()
     
     def test_analyze_chunk_empty_input(self, client):
         """Test handling of empty input."""
@@ -113,8 +152,8 @@ class TestAnalyzeChunk:
             Place(place="Colosseum", zoom=17)
         ])
         
-        response.choices[0].message.parsed = parsed_output
-        client.client.beta.chat.completions.parse = Mock(return_value=response)
+        response.choices[0].message.content = parsed_output.model_dump_json()
+        client.client.chat.completions.create = Mock(return_value=response)
         
         result = client.analyze_chunk("From Europe to Italy, visiting Rome and the Colosseum.")
         
@@ -128,6 +167,119 @@ class TestAnalyzeChunk:
         assert result[3]["place"] == "Colosseum"
         assert result[3]["zoom"] == 17  # Landmark
     
+    def test_analyze_chunk_memoizes_repeated_text(self, client, mock_openai_response):
+        """Test identical chunk text is only sent to the API once."""
+        client.client.chat.completions.create = Mock(return_value=mock_openai_response)
+        chunk = "I traveled from Paris to London and then to New York."
+        
+        first = client.analyze_chunk(chunk)
+        first[0]["zoom"] = 3  # Caller mutations must not leak into the memo
+        second = client.analyze_chunk(chunk)
+        
+        assert second[0] == {"place": "Paris", "zoom": 11}
+        client.client.chat.completions.create.assert_called_once()
+    
+    def test_analyze_chunk_truncated_response(self, client):
+        """Test a response cut off at max_tokens raises instead of failing validation."""
+        response = Mock()
+        response.choices = [Mock(finish_reason="length")]
+        response.choices[0].message.content = '{"places": [{"place": "Par'
+        client.client.chat.completions.create = Mock(return_value=response)
+        
+        with pytest.raises(OpenAIError, match="truncated"):
+            client.analyze_chunk("I traveled from Paris to London.")
+        client.client.chat.completions.create.assert_called_once()
+    
+    def test_analyze_chunk_cleans_place_names(self, client):
+        """Test names are stripped and blank or repeated places dropped."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = PlacesList(places=[
+            Place(place=" Paris ", zoom=11),
+            Place(place="", zoom=5),
+            Place(place="paris", zoom=12),
+            Place(place="Lyon", zoom=11)
+        ]).model_dump_json()
+        client.client.chat.completions.create = Mock(return_value=response)
+        
+        assert client.analyze_chunk("From Paris to Lyon and back to Paris.") == [
+            {"place": "Paris", "zoom": 11},
+            {"place": "Lyon", "zoom": 11}
+        ]
+    
+    def test_analyze_chunk_splits_truncated_chunk(self, client):
+        """Test a long chunk truncated at max_tokens is bisected and the halves merged."""
+        first = "We sailed from Lisbon past the cape. " * 8
+        second = "We rode inland from there to Madrid. " * 8
+        chunk = first + second
+        
+        def create(**kwargs):
+            text = kwargs["messages"][1]["content"]
+            response = Mock()
+            response.choices = [Mock(finish_reason="stop")]
+            if "Lisbon past" in text and "Madrid" in text:
+                response.choices[0].finish_reason = "length"
+                response.choices[0].message.content = '{"places": [{"pl'
+            elif "Madrid" in text:
+                response.choices[0].message.content = PlacesList(places=[
+                    Place(place="Madrid", zoom=11), Place(place="lisbon", zoom=11)
+                ]).model_dump_json()
+            else:
+                response.choices[0].message.content = PlacesList(places=[
+                    Place(place="Lisbon", zoom=11)
+                ]).model_dump_json()
+            return response
+        
+        client.client.chat.completions.create = Mock(side_effect=create)
+        
+        result = client.analyze_chunk(chunk)
+        
+        assert result == [{"place": "Lisbon", "zoom": 11}, {"place": "Madrid", "zoom": 11}]
+        assert client.client.chat.completions.create.call_count == 3
+        # Only the whole chunk is recorded, not its halves
+        assert client.analyzed_chunks == 1
+        assert len(client._chunk_memo) == 1
+        # The merged result is memoized for the whole chunk
+        assert client.analyze_chunk(chunk) == result
+        assert client.client.chat.completions.create.call_count == 3
+    
+    @pytest.mark.parametrize("chunk,expected_first_end", [
+        ("a" * 250 + ". " + "b" * 250, "a" * 250 + "."),
+        ("x" * 300 + " " + "y" * 300, "x" * 300),
+    ])
+    def test_split_chunk_prefers_boundaries(self, chunk, expected_first_end):
+        """Test chunks split at a sentence end, else whitespace, near the middle."""
+        first, second = split_chunk(chunk)
+        assert first == expected_first_end
+        assert first + second in chunk.replace(" ", "")
+    
+    def test_split_chunk_too_short(self):
+        """Test short chunks are not split."""
+        assert split_chunk("Too short to split.") is None
+    
+    def test_memo_matches_whitespace_and_punctuation_variants(self, client, mock_openai_response):
+        """Test chunks differing only in whitespace or typographic punctuation share results."""
+        client.client.chat.completions.create = Mock(return_value=mock_openai_response)
+        
+        client.analyze_chunk("\u201cWe left Paris\u201d \u2014 for London.")
+        result = client.analyze_chunk('"We left  Paris"\n- for London.')
+        
+        assert len(result) == 3
+        client.client.chat.completions.create.assert_called_once()
+    
+    def test_memo_evicts_least_recently_used(self, client, mock_openai_response):
+        """Test the memo keeps only memo_size chunks, dropping the least recently used."""
+        client.client.chat.completions.create = Mock(return_value=mock_openai_response)
+        client.memo_size = 2
+        
+        client.analyze_chunk("Paris")
+        client.analyze_chunk("London")
+        client.analyze_chunk("Paris")  # refresh Paris
+        client.analyze_chunk("Rome")  # evicts London
+        
+        assert list(client._chunk_memo) == ["Paris", "Rome"]
+        assert client.client.chat.completions.create.call_count == 3
+    
     def test_analyze_chunk_retry_on_rate_limit(self, client):
         """Test retry logic for rate limit errors."""
         response = Mock()
@@ -136,23 +288,75 @@ class TestAnalyzeChunk:
         parsed_output = PlacesList(places=[
             Place(place="Madrid", zoom=11)
         ])
-        response.choices[0].message.parsed = parsed_output
+        response.choices[0].message.content = parsed_output.model_dump_json()
         
         # First call fails with rate limit, second succeeds
-        client.client.beta.chat.completions.parse = Mock(
+        client.client.chat.completions.create = Mock(
             side_effect=[
-                Exception("Rate limit exceeded"),
+                _api_status_error(openai.RateLimitError, 429),
                 response
             ]
         )
         
-        result = client.analyze_chunk("Madrid is the capital of Spain.")
+        with patch('src.ai.openai_client.time.sleep'):
+            result = client.analyze_chunk("Madrid is the capital of Spain.")
         assert result == [{"place": "Madrid", "zoom": 11}]
-        assert client.client.beta.chat.completions.parse.call_count == 2
+        assert client.client.chat.completions.create.call_count == 2
+    
+    @pytest.mark.parametrize("headers,expected", [
+        ({"retry-after": "7"}, 7.0),
+        ({"retry-after-ms": "2500", "retry-after": "3"}, 2.5),
+    ])
+    def test_analyze_chunk_retry_honors_retry_after(self, client, mock_openai_response,
+                                                    headers, expected):
+        """Test a rate limit with retry-after waits that long (plus jitter) before retrying."""
+        client.client.chat.completions.create = Mock(side_effect=[
+            _api_status_error(openai.RateLimitError, 429, headers=headers),
+            mock_openai_response
+        ])
+        
+        with patch('src.ai.openai_client.time.sleep') as mock_sleep:
+            client.analyze_chunk("Paris, London and New York.")
+        
+        (wait,), _ = mock_sleep.call_args
+        assert expected <= wait <= expected + 1
+    
+    def test_analyze_chunk_no_retry_on_permanent_error(self, client):
+        """Test permanent failures such as a bad API key are not retried."""
+        client.client.chat.completions.create = Mock(
+            side_effect=_api_status_error(openai.AuthenticationError, 401)
+        )
+        
+        with pytest.raises(OpenAIError, match="OpenAI API call failed"):
+            client.analyze_chunk("Madrid is the capital of Spain.")
+        assert client.client.chat.completions.create.call_count == 1
     
+    def test_analyze_chunk_refusal(self, client):
+        """Test a refusal with no content surfaces as OpenAIError."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = None
+        response.choices[0].message.refusal = "I can't help with that."
+        client.client.chat.completions.create = Mock(return_value=response)
+        
+        with pytest.raises(OpenAIError, match="can't help"):
+            client.analyze_chunk("Some text")
+
+    def test_analyze_chunk_malformed_output(self, client):
+        """Test output that does not match the schema surfaces as OpenAIError."""
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].finish_reason = "stop"
+        response.choices[0].message.content = '{"places":[{"place":"Rome"}]}'
+        client.client.chat.completions.create = Mock(return_value=response)
+
+        with pytest.raises(OpenAIError, match="invalid structured output"):
+            client.analyze_chunk("Rome was not built in a day.")
+        assert client.client.chat.completions.create.call_count == 1
+
     def test_analyze_chunk_api_error(self, client):
         """Test handling of non-retryable API errors."""
-        client.client.beta.chat.completions.parse = Mock(
+        client.client.chat.completions.create = Mock(
             side_effect=Exception("Invalid request")
         )
         
@@ -188,7 +392,7 @@ class TestBatchAnalyzeChunks:
                     return responses[i]
             return []
         
-        client.analyze_chunk = Mock(side_effect=mock_analyze)
+        client.analyze_chunk_async = AsyncMock(side_effect=mock_analyze)
         
         results = client.batch_analyze_chunks(chunks)
         
@@ -196,7 +400,7 @@ class TestBatchAnalyzeChunks:
         assert results[0] == [{"place": "Paris", "zoom": 11}]
         assert results[1] == [{"place": "London", "zoom": 11}]
         assert results[2] == [{"place": "New York", "zoom": 11}]
-        assert client.analyze_chunk.call_count == 3
+        assert client.analyze_chunk_async.call_count == 3
     
     def test_batch_analyze_with_failures(self, client):
         """Test batch analysis with some failures."""
@@ -207,7 +411,7 @@ class TestBatchAnalyzeChunks:
                 raise Exception("API Error")
             return [{"place": "Place", "zoom": 10}]
         
-        client.analyze_chunk = Mock(side_effect=mock_analyze)
+        client.analyze_chunk_async = AsyncMock(side_effect=mock_analyze)
         
         with patch.object(client.logger, 'error') as mock_logger:
             results = client.batch_analyze_chunks(chunks)
@@ -220,11 +424,86 @@ class TestBatchAnalyzeChunks:
             # Check that error was logged
             mock_logger.assert_called()
     
+    def test_batch_analyze_reports_progress(self, client):
+        """Test on_progress is called once per finished chunk, including failures."""
+        def mock_analyze(chunk):
+            if chunk == "Chunk 2":
+                raise Exception("API Error")
+            return []
+        
+        client.analyze_chunk_async = AsyncMock(side_effect=mock_analyze)
+        progress = []
+        
+        client.batch_analyze_chunks(
+            ["Chunk 1", "Chunk 2", "Chunk 3"],
+            on_progress=lambda done, total: progress.append((done, total))
+        )
+        
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+    
+    def test_batch_analyze_dispatches_repeated_chunks_once(self, client):
+        """Test identical chunks in one batch share a single analysis."""
+        chunks = ["Chapter One. Rome", "Venice and Genoa.", "Chapter One.  Rome"]
+        client.analyze_chunk_async = AsyncMock(return_value=[{"place": "Rome", "zoom": 11}])
+        
+        results = client.batch_analyze_chunks(chunks)
+        
+        assert client.analyze_chunk_async.call_count == 2
+        assert results[0] == results[2] == [{"place": "Rome", "zoom": 11}]
+        assert results[0] is not results[2]
+    
+    def test_iter_analyze_chunks_yields_in_completion_order(self, client):
+        """Test that the iterator yields each chunk's places as soon as it finishes."""
+        chunks = ["Slow Paris", "Fast London", "Broken chunk"]
+        
+        async def mock_analyze(chunk):
+            if chunk == "Broken chunk":
+                raise Exception("API Error")
+            if chunk == "Slow Paris":
+                await asyncio.sleep(0.05)
+            return [{"place": chunk.split()[1], "zoom": 11}]
+        
+        client.analyze_chunk_async = AsyncMock(side_effect=mock_analyze)
+        
+        results = list(client.iter_analyze_chunks(chunks))
+        
+        assert results[-1] == (0, [{"place": "Paris", "zoom": 11}])
+        assert sorted(results) == [
+            (0, [{"place": "Paris", "zoom": 11}]),
+            (1, [{"place": "London", "zoom": 11}]),
+            (2, [])
+        ]
+    
+    def test_iter_analyze_chunks_cancels_pending_on_early_exit(self, client):
+        """Test stopping early cancels in-flight chunks before the loop closes."""
+        chunks = ["Fast London", "Slow Paris", "Slow Rome"]
+        loops, cancelled = [], []
+        
+        async def mock_analyze(chunk):
+            loops.append(asyncio.get_running_loop())
+            if chunk.startswith("Slow"):
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.append(chunk)
+                    raise
+            return [{"place": chunk.split()[1], "zoom": 11}]
+        
+        client.analyze_chunk_async = AsyncMock(side_effect=mock_analyze)
+        
+        results = client.iter_analyze_chunks(chunks)
+        assert next(results) == (0, [{"place": "London", "zoom": 11}])
+        results.close()
+        
+        assert sorted(cancelled) == ["Slow Paris", "Slow Rome"]
+        assert loops[0].is_closed()
+        assert not asyncio.all_tasks(loops[0])
+    
     def test_batch_analyze_progress_logging(self, client):
         """Test progress logging for large batches."""
         chunks = [f"Chunk {i}" for i in range(25)]
         
-        client.analyze_chunk = Mock(return_value=[{"place": "Place", "zoom": 10}])
+        client.analyze_chunk_async = AsyncMock(return_value=[{"place": "Place", "zoom": 10}])
         
         with patch.object(client.logger, 'info') as mock_logger:
             client.batch_analyze_chunks(chunks)
@@ -235,6 +514,680 @@ class TestBatchAnalyzeChunks:
             assert len(progress_logs) == 3
 
 
+class TestAsyncAnalysis:
+    """Test concurrent chunk analysis with AsyncOpenAI."""
+    
+    def test_analyze_chunk_async_success(self, client, mock_openai_response):
+        """Test async extraction uses the async client."""
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+        
+        with patch('src.ai.openai_client.AsyncOpenAI', return_value=async_client):
+            result = asyncio.run(client.analyze_chunk_async("Paris, London and New York."))
+        
+        assert [p["place"] for p in result] == ["Paris", "London", "New York"]
+        async_client.chat.completions.create.assert_awaited_once()
+    
+    def test_batch_analyze_async_preserves_order_and_failures(self, client):
+        """Test async batch keeps input order and maps failures to empty lists."""
+        chunks = ["Chunk 0", "Chunk 1", "Chunk 2"]
+        
+        async def mock_analyze(chunk):
+            if chunk == "Chunk 1":
+                raise OpenAIError("API Error")
+            # Finish later chunks first to exercise ordering
+            await asyncio.sleep(0.01 * (3 - int(chunk[-1])))
+            return [{"place": chunk, "zoom": 10}]
+        
+        client.analyze_chunk_async = mock_analyze
+        
+        results = asyncio.run(client.batch_analyze_chunks_async(chunks))
+        
+        assert results == [
+            [{"place": "Chunk 0", "zoom": 10}],
+            [],
+            [{"place": "Chunk 2", "zoom": 10}]
+        ]
+    
+    def test_batch_analyze_async_respects_concurrency_limit(self, client):
+        """Test no more than max_concurrent requests are in flight."""
+        client.max_concurrent = 2
+        in_flight = 0
+        peak = 0
+        
+        async def mock_analyze(chunk):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+        
+        client.analyze_chunk_async = mock_analyze
+        
+        asyncio.run(client.batch_analyze_chunks_async([f"Chunk {i}" for i in range(6)]))
+        
+        assert peak == 2
+
+
+def _stream_events(content, finish_reason="stop", piece_size=7):
+    """Split content into streamed completion chunks, as returned with stream=True."""
+    events = []
+    for start in range(0, len(content), piece_size):
+        delta = Mock(content=content[start:start + piece_size], refusal=None)
+        events.append(Mock(choices=[Mock(delta=delta, finish_reason=None)]))
+    events.append(Mock(choices=[Mock(delta=Mock(content=None, refusal=None),
+                                     finish_reason=finish_reason)]))
+    
+    async def stream():
+        for event in events:
+            yield event
+    return stream()
+
+
+class TestStreamingAnalysis:
+    """Test streaming analysis that reports places as they are generated."""
+    
+    def test_stream_parser_emits_places_as_they_complete(self):
+        """Test places are emitted once their object closes, across split deltas."""
+        parser = PlaceStreamParser()
+        
+        assert parser.feed('{"places": [{"place": "Par') == []
+        assert parser.feed('is", "zoom": 11}, {"place"') == [{"place": "Paris", "zoom": 11}]
+        assert parser.feed(': "Rome", "zoom": 10}') == [{"place": "Rome", "zoom": 10}]
+        assert parser.feed(']}') == []
+    
+    def test_analyze_chunk_streaming(self, client):
+        """Test places reach the callback before the stream ends and the full list is returned."""
+        content = PlacesList(places=[
+            Place(place="Paris", zoom=11),
+            Place(place="London", zoom=11)
+        ]).model_dump_json()
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(return_value=_stream_events(content))
+        seen = []
+        
+        with patch('src.ai.openai_client.AsyncOpenAI', return_value=async_client):
+            result = asyncio.run(client.analyze_chunk_streaming("Paris and London", seen.append))
+        
+        assert seen == result == [{"place": "Paris", "zoom": 11}, {"place": "London", "zoom": 11}]
+        assert async_client.chat.completions.create.call_args.kwargs["stream"] is True
+        
+        # The validated result is memoized and replayed to the callback
+        replayed = []
+        asyncio.run(client.analyze_chunk_streaming("Paris and London", replayed.append))
+        assert replayed == result
+        async_client.chat.completions.create.assert_awaited_once()
+    
+    def test_analyze_chunk_streaming_truncated(self, client):
+        """Test a stream cut off at max_tokens raises OpenAIError."""
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(
+            return_value=_stream_events('{"places": [{"place": "Par', finish_reason="length")
+        )
+        
+        with patch('src.ai.openai_client.AsyncOpenAI', return_value=async_client):
+            with pytest.raises(OpenAIError, match="truncated"):
+                asyncio.run(client.analyze_chunk_streaming("Paris", lambda place: None))
+
+
+class TestPackedAnalysis:
+    """Test packing several chunks into one request."""
+    
+    def test_pack_chunks_respects_budget(self, client):
+        """Test chunks are grouped greedily within the character budget."""
+        client.pack_chars = 10
+        chunks = ["aaaa", "bbbb", "", "cccc", "dddddddddddd", "ee"]
+        
+        assert client._pack_chunks(chunks) == [[0, 1], [3], [4], [5]]
+    
+    def test_pack_chunks_respects_pack_size(self, client):
+        """Test groups close once they hold pack_size chunks."""
+        client.pack_chars = 1000
+        client.pack_size = 2
+        chunks = ["aaaa", "bbbb", "cccc", "", "dddd", "ee"]
+        
+        assert client._pack_chunks(chunks) == [[0, 1], [2, 4], [5]]
+    
+    def test_batch_analyze_async_packs_chunks(self, client):
+        """Test packed responses are split back to their chunks."""
+        client.pack_chars = 1000
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = BatchPlacesList(results=[
+            PlacesList(places=[Place(place="Paris", zoom=11)]),
+            PlacesList(places=[]),
+            PlacesList(places=[Place(place="Rome", zoom=11)])
+        ]).model_dump_json()
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(return_value=response)
+        
+        with patch('src.ai.openai_client.AsyncOpenAI', return_value=async_client):
+            results = asyncio.run(client.batch_analyze_chunks_async(
+                ["Paris.", "Nothing here.", "", "Rome."]
+            ))
+        
+        assert results == [
+            [{"place": "Paris", "zoom": 11}],
+            [],
+            [],
+            [{"place": "Rome", "zoom": 11}]
+        ]
+        async_client.chat.completions.create.assert_awaited_once()
+        kwargs = async_client.chat.completions.create.call_args.kwargs
+        assert kwargs["response_format"] is BATCH_PLACES_RESPONSE_FORMAT
+    
+    def test_batch_analyze_async_pack_mismatch_falls_back(self, client):
+        """Test a pack with the wrong number of results is retried per chunk."""
+        client.pack_chars = 1000
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = BatchPlacesList(results=[
+            PlacesList(places=[Place(place="Paris", zoom=11)])
+        ]).model_dump_json()
+        client.analyze_chunk_pack_async = AsyncMock(
+            side_effect=lambda chunks: client._parse_pack(response, chunks, 0.0)
+        )
+        client.analyze_chunk_async = AsyncMock(
+            side_effect=lambda chunk: [{"place": chunk, "zoom": 10}]
+        )
+        
+        results = asyncio.run(client.batch_analyze_chunks_async(["A", "B"]))
+        
+        assert results == [
+            [{"place": "A", "zoom": 10}],
+            [{"place": "B", "zoom": 10}]
+        ]
+        assert client.analyze_chunk_async.await_count == 2
+
+
+class TestOfflineBatch:
+    """Test Batch API submission and result mapping."""
+    
+    def _batch_line(self, custom_id, places, status_code=200):
+        body = {"choices": [{"message": {"content": json.dumps({"places": places})}}]}
+        return json.dumps({
+            "custom_id": custom_id,
+            "response": {"status_code": status_code, "body": body}
+        })
+    
+    def test_batch_offline_maps_results_to_chunks(self, client):
+        """Test results are mapped back to chunk indices via custom_id."""
+        client.client.files.create.return_value = Mock(id="file-in")
+        client.client.batches.create.return_value = Mock(id="batch-1", status="in_progress")
+        client.client.batches.retrieve.return_value = Mock(
+            id="batch-1", status="completed", output_file_id="file-out", error_file_id=None
+        )
+        # Output order does not follow input order
+        client.client.files.content.return_value = Mock(text="\n".join([
+            self._batch_line("chunk-2", [{"place": "Rome", "zoom": 11}]),
+            self._batch_line("chunk-0", [{"place": "Paris", "zoom": 11}]),
+        ]))
+        
+        with patch('src.ai.openai_client.time.sleep'):
+            results = client.batch_analyze_chunks_offline(["Paris", "", "Rome"])
+        
+        assert results == [
+            [{"place": "Paris", "zoom": 11}],
+            [],
+            [{"place": "Rome", "zoom": 11}]
+        ]
+        
+        # Only non-empty chunks are submitted, all with the shared system prompt
+        submitted = client.client.files.create.call_args.kwargs["file"][1].decode("utf-8")
+        requests = [json.loads(line) for line in submitted.splitlines()]
+        assert [r["custom_id"] for r in requests] == ["chunk-0", "chunk-2"]
+        assert all(r["body"]["messages"][0]["content"] == SYSTEM_PROMPT for r in requests)
+        assert requests[0]["body"]["messages"][1]["content"].endswith('"Paris"')
+        assert requests[0]["body"]["response_format"] == PLACES_RESPONSE_FORMAT
+        assert requests[0]["body"]["model"] == "gpt-4o-2024-08-06"
+        
+        # Results are memoized for later single-chunk calls
+        assert client.analyze_chunk("Rome") == [{"place": "Rome", "zoom": 11}]
+    
+    def test_batch_offline_reports_failed_requests(self, client):
+        """Test requests in the error file or missing from the output count as errors."""
+        client.client.files.create.return_value = Mock(id="file-in")
+        client.client.batches.create.return_value = Mock(
+            id="batch-1", status="completed", output_file_id="file-out", error_file_id="file-err"
+        )
+        error_line = json.dumps({
+            "custom_id": "chunk-1",
+            "response": None,
+            "error": {"code": "server_error", "message": "Internal error"}
+        })
+        files = {
+            "file-out": self._batch_line("chunk-0", [{"place": "Paris", "zoom": 11}]),
+            "file-err": error_line,
+        }
+        client.client.files.content.side_effect = lambda file_id: Mock(text=files[file_id])
+        
+        with patch.object(client, '_log_batch_summary') as summary:
+            results = client.batch_analyze_chunks_offline(["Paris", "Rome", "Oslo"])
+        
+        assert results == [[{"place": "Paris", "zoom": 11}], [], []]
+        errors = summary.call_args.args[1]
+        assert len(errors) == 2
+        assert errors[0].startswith("Failed to analyze chunk 1:")
+        assert "Internal error" in errors[0]
+        assert errors[1] == "Failed to analyze chunk 2: No result in batch output"
+    
+    def test_batch_offline_escapes_chunk_text(self, client):
+        """Test every submitted line is valid JSON whatever the chunk contains."""
+        client.client.files.create.return_value = Mock(id="file-in")
+        client.client.batches.create.return_value = Mock(
+            id="batch-1", status="completed", output_file_id=None, error_file_id=None
+        )
+        chunks = ['He said "Paris"', "C:\\Rome\\", "Zürich\nline two\t}{"]
+        
+        with patch('src.ai.openai_client.time.sleep'):
+            client.batch_analyze_chunks_offline(chunks)
+        
+        submitted = client.client.files.create.call_args.kwargs["file"][1].decode("utf-8")
+        requests = [json.loads(line) for line in submitted.splitlines()]
+        assert len(requests) == len(chunks)
+        for request, chunk in zip(requests, chunks):
+            assert request["body"]["messages"][1]["content"].endswith(f'"{chunk}"')
+    
+    def test_batch_offline_polls_with_backoff(self, client):
+        """Test the wait between status checks doubles up to the cap."""
+        client.client.files.create.return_value = Mock(id="file-in")
+        client.client.batches.create.return_value = Mock(id="batch-1", status="validating")
+        client.client.batches.retrieve.side_effect = [
+            Mock(id="batch-1", status="in_progress"),
+            Mock(id="batch-1", status="in_progress"),
+            Mock(id="batch-1", status="in_progress"),
+            Mock(id="batch-1", status="completed", output_file_id=None, error_file_id=None),
+        ]
+        
+        with patch('src.ai.openai_client.time.sleep') as mock_sleep:
+            client.batch_analyze_chunks_offline(["Paris"], poll_interval=10, max_poll_interval=30)
+        
+        assert [c.args[0] for c in mock_sleep.call_args_list] == [10, 20, 30, 30]
+    
+    def test_batch_mode_uses_batch_api(self, client):
+        """Test batch_analyze_chunks routes mode='batch' through the Batch API."""
+        client.batch_analyze_chunks_offline = Mock(return_value=[[{"place": "Paris", "zoom": 11}]])
+        
+        results = client.batch_analyze_chunks(["Paris"], mode="batch")
+        
+        assert results == [[{"place": "Paris", "zoom": 11}]]
+        client.batch_analyze_chunks_offline.assert_called_once_with(["Paris"])
+    
+    def test_batch_unknown_mode(self, client):
+        """Test an unknown mode is rejected."""
+        with pytest.raises(OpenAIError, match="Unknown batch mode"):
+            client.batch_analyze_chunks(["Paris"], mode="turbo")
+    
+    def test_batch_offline_failed_job(self, client):
+        """Test a failed batch job raises OpenAIError."""
+        client.client.files.create.return_value = Mock(id="file-in")
+        client.client.batches.create.return_value = Mock(id="batch-1", status="failed")
+        
+        with pytest.raises(OpenAIError, match="failed"):
+            client.batch_analyze_chunks_offline(["Paris"])
+
+
+class TestChunkPrefilter:
+    """Test the local prefilter that skips chunks unlikely to name places."""
+    
+    @pytest.fixture
+    def filtering_client(self, mock_config):
+        with patch('src.ai.openai_client.OpenAI'):
+            return OpenAIClient(min_chunk_chars=40)
+    
+    @pytest.mark.parametrize("chunk", [
+        "Chapter 3.",
+        "Fin.",
+        "1066, 1215, 1492, 1776, 1789, 1815, 1914, 1939, 1945",
+        "\"yes,\" she said, \"and then we'll go home before it gets dark.\"",
+    ])
+    def test_skips_unlikely_chunks(self, filtering_client, chunk):
+        """Test short chunks and chunks without proper nouns skip the API."""
+        filtering_client.client.chat.completions.create = Mock()
+        
+        assert filtering_client.analyze_chunk(chunk) == []
+        filtering_client.client.chat.completions.create.assert_not_called()
+    
+    @pytest.mark.parametrize("chunk", [
+        "They travelled south from the hills until they finally reached Rome.",
+        "Nous sommes arrivés à Évreux, puis nous avons continué vers Île-de-France.",
+        "\u5f7c\u3089\u306f\u5317\u4eac\u304b\u3089\u6771\u4eac\u3078\u5411\u304b\u3063\u305f\u3002" * 4,
+    ])
+    def test_keeps_candidate_chunks(self, filtering_client, mock_openai_response, chunk):
+        """Test chunks with capitalized or caseless words still reach the API."""
+        filtering_client.client.chat.completions.create = Mock(return_value=mock_openai_response)
+        
+        assert len(filtering_client.analyze_chunk(chunk)) == 3
+    
+    def test_batch_skips_unlikely_chunks(self, filtering_client, mock_openai_response):
+        """Test batches leave filtered chunks empty without calling the API."""
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+        async_client.close = AsyncMock()
+        
+        with patch('src.ai.openai_client.AsyncOpenAI', return_value=async_client):
+            results = filtering_client.batch_analyze_chunks([
+                "Chapter 3.",
+                "They travelled south from the hills until they finally reached Rome.",
+            ])
+        
+        assert results[0] == []
+        assert len(results[1]) == 3
+        async_client.chat.completions.create.assert_called_once()
+        async_client.close.assert_awaited_once()
+        assert filtering_client.async_client is None
+
+
+class FakeClock:
+    """Monotonic clock that only advances when the limiter sleeps."""
+    
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateLimiter:
+    """Test header-driven pacing of async requests."""
+    
+    @pytest.fixture
+    def clock(self):
+        clock = FakeClock()
+        with patch('src.ai.ai_rate_limiter.time.monotonic', clock.monotonic), \
+             patch('src.ai.ai_rate_limiter.asyncio.sleep', clock.sleep):
+            yield clock
+    
+    @pytest.mark.parametrize("value,expected", [
+        ("1s", 1.0),
+        ("6m0s", 360.0),
+        ("120ms", 0.12),
+        ("1h2m3.5s", 3723.5),
+        ("2", 2.0),
+        ("", None),
+        ("soon", None),
+    ])
+    def test_parse_reset_duration(self, value, expected):
+        """Test OpenAI reset durations and retry-after values parse to seconds."""
+        assert parse_reset_duration(value) == expected
+    
+    def test_unknown_quota_does_not_wait(self, clock):
+        """Test requests pass straight through before any headers arrive."""
+        limiter = OpenAIRateLimiter()
+        asyncio.run(limiter.acquire(500))
+        assert clock.sleeps == []
+    
+    def test_waits_for_request_reset(self, clock):
+        """Test requests beyond the remaining quota wait for the reported reset."""
+        limiter = OpenAIRateLimiter()
+        limiter.update(httpx.Headers({
+            "x-ratelimit-remaining-requests": "1",
+            "x-ratelimit-reset-requests": "2s",
+        }))
+        
+        async def run():
+            await limiter.acquire()
+            await limiter.acquire()
+        
+        asyncio.run(run())
+        assert clock.sleeps == [2.0]
+    
+    def test_waits_for_token_reset(self, clock):
+        """Test a request larger than the remaining tokens waits for the token reset."""
+        limiter = OpenAIRateLimiter()
+        limiter.update(httpx.Headers({
+            "x-ratelimit-remaining-tokens": "100",
+            "x-ratelimit-reset-tokens": "500ms",
+        }))
+        
+        asyncio.run(limiter.acquire(400))
+        assert clock.sleeps == [0.5]
+    
+    @pytest.mark.parametrize("headers,expected", [
+        ({"retry-after": "3"}, 3.0),
+        ({"retry-after-ms": "1500"}, 1.5),
+        ({"retry-after-ms": "1500", "retry-after": "3"}, 1.5),
+    ])
+    def test_retry_after_pauses_requests(self, clock, headers, expected):
+        """Test a 429 with retry-after(-ms) pauses every request until it passes."""
+        limiter = OpenAIRateLimiter()
+        limiter.update(httpx.Headers(headers), status_code=429)
+        
+        asyncio.run(limiter.acquire())
+        assert clock.sleeps == [expected]
+    
+    def test_configured_rpm_spaces_requests(self, clock):
+        """Test a configured request rate spaces requests evenly after the first second's burst."""
+        limiter = OpenAIRateLimiter(requests_per_minute=120)
+        
+        async def run():
+            for _ in range(4):
+                await limiter.acquire()
+        
+        asyncio.run(run())
+        assert clock.sleeps == pytest.approx([0.5, 0.5])
+    
+    def test_configured_tpm_waits_for_token_budget(self, clock):
+        """Test a configured token rate delays requests until enough tokens refill."""
+        limiter = OpenAIRateLimiter(tokens_per_minute=6000)  # 100 tokens per second
+        
+        async def run():
+            await limiter.acquire(100)
+            await limiter.acquire(50)
+            await limiter.acquire(500)  # larger than the bucket: waits for a full one
+        
+        asyncio.run(run())
+        assert clock.sleeps == pytest.approx([0.5, 1.0])
+    
+    def test_state_persists_across_runs(self, clock, tmp_path):
+        """Test a saved quota paces a new limiter until its window resets."""
+        path = tmp_path / "ratelimit.json"
+        limiter = OpenAIRateLimiter()
+        limiter.update(httpx.Headers({
+            "x-ratelimit-remaining-requests": "0",
+            "x-ratelimit-reset-requests": "2s",
+        }))
+        limiter.save_state(str(path))
+        
+        restored = OpenAIRateLimiter()
+        restored.load_state(str(path))
+        asyncio.run(restored.acquire())
+        
+        assert restored.remaining_requests is None
+        assert len(clock.sleeps) == 1 and 1.9 < clock.sleeps[0] <= 2.0
+    
+    def test_expired_or_missing_state_is_ignored(self, clock, tmp_path):
+        """Test quota from a window that has already reset is not restored."""
+        path = tmp_path / "ratelimit.json"
+        limiter = OpenAIRateLimiter()
+        limiter.load_state(str(path))  # missing file
+        limiter.restore({
+            "remaining_requests": 0,
+            "requests_reset_at": time.time() - 1,
+        })
+        
+        asyncio.run(limiter.acquire())
+        assert limiter.remaining_requests is None
+        assert clock.sleeps == []
+    
+    def test_analyze_chunk_async_acquires_quota(self, client, mock_openai_response):
+        """Test async requests go through the rate limiter with a token estimate."""
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
+        client.rate_limiter.acquire = AsyncMock()
+        chunk = "Paris, London and New York."
+        
+        with patch('src.ai.openai_client.AsyncOpenAI', return_value=async_client):
+            asyncio.run(client.analyze_chunk_async(chunk))
+        
+        est_tokens = client.rate_limiter.acquire.call_args.args[0]
+        assert est_tokens == (len(SYSTEM_PROMPT) + len(client._build_messages(chunk)[1]["content"])) // 4
+
+
+class TestDiskCache:
+    """Test the on-disk results cache shared across runs."""
+    
+    def test_results_persist_across_clients(self, mock_config, mock_openai_response, tmp_path):
+        """Test a fresh client reuses results cached by an earlier run."""
+        with patch('src.ai.openai_client.OpenAI'):
+            first = OpenAIClient(cache_dir=str(tmp_path))
+        with patch('src.ai.openai_client.OpenAI'):
+            second = OpenAIClient(cache_dir=str(tmp_path))
+        first.client.chat.completions.create = Mock(return_value=mock_openai_response)
+        second.client.chat.completions.create = Mock()
+        
+        expected = first.analyze_chunk("Paris, London and New York")
+        
+        assert second.analyze_chunk("Paris, London and New York") == expected
+        second.client.chat.completions.create.assert_not_called()
+    
+    def test_model_change_misses(self, mock_config, mock_openai_response, tmp_path):
+        """Test cached results are not reused for a different model."""
+        with patch('src.ai.openai_client.OpenAI'):
+            first = OpenAIClient(cache_dir=str(tmp_path))
+        with patch('src.ai.openai_client.OpenAI'):
+            second = OpenAIClient(model="gpt-4o-mini", cache_dir=str(tmp_path))
+        first.client.chat.completions.create = Mock(return_value=mock_openai_response)
+        second.client.chat.completions.create = Mock(return_value=mock_openai_response)
+        
+        first.analyze_chunk("Paris, London and New York")
+        second.analyze_chunk("Paris, London and New York")
+        
+        second.client.chat.completions.create.assert_called_once()
+    
+    def test_expired_and_corrupt_entries_miss(self, tmp_path):
+        """Test expired or unreadable entries are treated as misses."""
+        cache = AnalysisCache(str(tmp_path), ttl_seconds=60)
+        key = AnalysisCache.make_key("model", SYSTEM_PROMPT, "Paris")
+        cache.put(key, [{"place": "Paris", "zoom": 10}])
+        
+        assert cache.get(key) == [{"place": "Paris", "zoom": 10}]
+        
+        path = cache._path(key)
+        os.utime(path, (0, 0))
+        assert cache.get(key) is None
+        
+        path.write_text("{not json")
+        assert cache.get(key) is None
+    
+    def test_evicts_least_recently_used(self, tmp_path):
+        """Test outgrowing the size limit evicts entries unused the longest."""
+        cache = AnalysisCache(str(tmp_path))
+        keys = [AnalysisCache.make_key("model", SYSTEM_PROMPT, str(i)) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.put(key, [{"place": "Paris", "zoom": 10}])
+            os.utime(cache._path(key), (1000 + i, 1000 + i))
+        
+        # A hit refreshes the oldest entry
+        with patch('src.ai.ai_cache.time.time', return_value=1010):
+            cache.get(keys[0])
+        
+        entry_size = cache._path(keys[0]).stat().st_size
+        cache.max_size_bytes = entry_size * 3
+        cache.put(AnalysisCache.make_key("model", SYSTEM_PROMPT, "new"), [{"place": "Paris", "zoom": 10}])
+        
+        assert not cache._path(keys[1]).exists()
+        assert not cache._path(keys[2]).exists()
+        assert cache._path(keys[0]).exists()
+    
+    def test_overwriting_entry_keeps_size_accurate(self, tmp_path):
+        """Test rewriting a key doesn't count its old bytes towards the limit."""
+        cache = AnalysisCache(str(tmp_path))
+        keys = [AnalysisCache.make_key("model", SYSTEM_PROMPT, str(i)) for i in range(2)]
+        for key in keys:
+            cache.put(key, [{"place": "Paris", "zoom": 10}])
+        
+        entry_size = cache._path(keys[0]).stat().st_size
+        cache.max_size_bytes = entry_size * 2
+        for _ in range(5):
+            cache.put(keys[0], [{"place": "Paris", "zoom": 10}])
+        
+        assert cache._size == entry_size * 2
+        assert all(cache._path(key).exists() for key in keys)
+
+
+class TestModelEscalation:
+    """Test re-running suspicious empty results on the escalation model."""
+    
+    CHUNK = "The envoy rode from Venice to Ragusa, then sailed with Admiral Doria to Genoa."
+    
+    @pytest.fixture
+    def escalating_client(self, mock_config):
+        with patch('src.ai.openai_client.OpenAI'):
+            return OpenAIClient(model="gpt-4o-mini", escalate_model="gpt-4o")
+    
+    def _response(self, places):
+        response = Mock()
+        response.choices = [Mock()]
+        response.choices[0].message.content = PlacesList(places=places).model_dump_json()
+        return response
+    
+    def test_empty_result_with_proper_nouns_escalates(self, escalating_client):
+        """Test an empty answer for text full of proper nouns is retried on the stronger model."""
+        create = Mock(side_effect=[
+            self._response([]),
+            self._response([Place(place="Venice", zoom=11)])
+        ])
+        escalating_client.client.chat.completions.create = create
+        
+        result = escalating_client.analyze_chunk(self.CHUNK)
+        
+        assert result == [{"place": "Venice", "zoom": 11}]
+        assert [c.kwargs["model"] for c in create.call_args_list] == ["gpt-4o-mini", "gpt-4o"]
+        
+        stats = escalating_client.get_usage_stats()
+        assert stats["escalations"] == 1
+        assert stats["escalation_rate"] == 1.0
+        
+        # The escalated answer is what gets memoized
+        assert escalating_client.analyze_chunk(self.CHUNK) == result
+        assert create.call_count == 2
+
+    def test_escalation_retries_without_resending_primary(self, escalating_client):
+        """Test a transient error on the escalation call retries only that call."""
+        create = Mock(side_effect=[
+            self._response([]),
+            _api_status_error(openai.RateLimitError, 429),
+            self._response([Place(place="Venice", zoom=11)])
+        ])
+        escalating_client.client.chat.completions.create = create
+        
+        with patch('src.ai.openai_client.time.sleep'):
+            result = escalating_client.analyze_chunk(self.CHUNK)
+        
+        assert result == [{"place": "Venice", "zoom": 11}]
+        assert [c.kwargs["model"] for c in create.call_args_list] == [
+            "gpt-4o-mini", "gpt-4o", "gpt-4o"
+        ]
+    
+    def test_empty_result_without_proper_nouns_is_kept(self, escalating_client):
+        """Test an empty answer for ordinary prose is not escalated."""
+        escalating_client.client.chat.completions.create = Mock(return_value=self._response([]))
+        
+        assert escalating_client.analyze_chunk("He said nothing at all. The night was long and cold.") == []
+        escalating_client.client.chat.completions.create.assert_called_once()
+    
+    def test_async_escalation(self, escalating_client):
+        """Test the async path escalates with the stronger model too."""
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(side_effect=[
+            self._response([]),
+            self._response([Place(place="Genoa", zoom=11)])
+        ])
+        
+        with patch('src.ai.openai_client.AsyncOpenAI', return_value=async_client):
+            result = asyncio.run(escalating_client.analyze_chunk_async(self.CHUNK))
+        
+        assert result == [{"place": "Genoa", "zoom": 11}]
+        assert async_client.chat.completions.create.call_args.kwargs["model"] == "gpt-4o"
+
+
 class TestGetUsageStats:
     """Test usage statistics."""
     
@@ -288,8 +1241,8 @@ class TestIntegrationScenarios:
             Place(place="Castile", zoom=7)
         ])
         
-        response.choices[0].message.parsed = parsed_output
-        client.client.beta.chat.completions.parse = Mock(return_value=response)
+        response.choices[0].message.content = parsed_output.model_dump_json()
+        client.client.chat.completions.create = Mock(return_value=response)
         
         result = client.analyze_chunk(historical_text)
         assert len(result) == 7
@@ -310,8 +1263,8 @@ class TestIntegrationScenarios:
             Place(place="Turkey", zoom=6)  # Modern country name
         ])
         
-        response.choices[0].message.parsed = parsed_output
-        client.client.beta.chat.completions.parse = Mock(return_value=response)
+        response.choices[0].message.content = parsed_output.model_dump_json()
+        client.client.chat.completions.create = Mock(return_value=response)
         
         result = client.analyze_chunk(text)
         assert len(result) == 2
@@ -329,15 +1282,15 @@ class TestIntegrationScenarios:
 ])
 def test_various_inputs(client, chunk, expected):
     """Test various input scenarios."""
-    if chunk.strip() and expected:
+    if chunk.strip():
         response = Mock()
         response.choices = [Mock()]
         
         places = [Place(**p) for p in expected]
         parsed_output = PlacesList(places=places)
-        response.choices[0].message.parsed = parsed_output
+        response.choices[0].message.content = parsed_output.model_dump_json()
         
-        client.client.beta.chat.completions.parse = Mock(return_value=response)
+        client.client.chat.completions.create = Mock(return_value=response)
     
     result = client.analyze_chunk(chunk)
     assert result == expected
@@ -346,19 +1299,21 @@ def test_various_inputs(client, chunk, expected):
 class TestStructuredOutputFormat:
     """Test the structured output format requirements."""
     
-    def test_parse_method_called_with_correct_params(self, client):
-        """Test that parse method is called with correct parameters."""
+    def test_create_called_with_correct_params(self, client):
+        """Test that create is called with the prebuilt structured-output format."""
         response = Mock()
         response.choices = [Mock()]
-        response.choices[0].message.parsed = PlacesList(places=[])
+        response.choices[0].message.content = PlacesList(places=[]).model_dump_json()
         
-        client.client.beta.chat.completions.parse = Mock(return_value=response)
+        client.client.chat.completions.create = Mock(return_value=response)
         
         client.analyze_chunk("Some text")
         
-        # Verify the parse method was called with the correct parameters
-        call_args = client.client.beta.chat.completions.parse.call_args
+        # Verify create was called with the correct parameters
+        call_args = client.client.chat.completions.create.call_args
         assert call_args[1]["model"] == "gpt-4o-2024-08-06"
-        assert call_args[1]["response_format"] == PlacesList
+        assert call_args[1]["response_format"] is PLACES_RESPONSE_FORMAT
+        assert call_args[1]["response_format"]["type"] == "json_schema"
         assert call_args[1]["temperature"] == 0
+        assert call_args[1]["max_tokens"] == 512
         assert len(call_args[1]["messages"]) == 2
\ No newline at end of file
@@ -16,6 +16,11 @@ class ConfigError(Exception):
     pass
 
 
+# (key, default) lookups already reported as missing; each is warned about
+# once rather than on every call
+_warned_missing = set()
+
+
 def load_config(env_path: str = ".env") -> None:
     """
     Load environment variables from a .env file.
@@ -25,6 +30,9 @@ def load_config(env_path: str = ".env") -> None:
     """
     logger = logging.getLogger(__name__)
     
+    # Reloaded values may fill keys that were missing before
+    _warned_missing.clear()
+    
     if os.path.exists(env_path):
         load_dotenv(env_path, override=True)
         logger.info(f"Loaded configuration from {env_path}")
@@ -36,6 +44,11 @@ def get_config(key: str, default: Any = None) -> Any:
     """
     Get a configuration value from environment variables.
     
+    Values are read on every call, so environment changes take effect
+    immediately. A missing key is only logged the first time it is looked
+    up with a given default (until the next load_config), since clients
+    look up the same optional keys on every construction.
+    
     Args:
         key: Environment variable key
         default: Default value if key not found
@@ -43,14 +56,16 @@ def get_config(key: str, default: Any = None) -> Any:
     Returns:
         Configuration value or default
     """
-    logger = logging.getLogger(__name__)
-    
     value = os.getenv(key, default)
     
-    if value == default and default is not None:
-        logger.warning(f"Configuration key '{key}' not found, using default value: {default}")
-    elif value is None:
-        logger.warning(f"Configuration key '{key}' not found and no default provided")
+    lookup = (key, repr(default))
+    if key not in os.environ and lookup not in _warned_missing:
+        _warned_missing.add(lookup)
+        logger = logging.getLogger(__name__)
+        if default is not None:
+            logger.warning(f"Configuration key '{key}' not found, using default value: {default}")
+        else:
+            logger.warning(f"Configuration key '{key}' not found and no default provided")
     
     return value
 
@@ -69,11 +84,12 @@ def validate_config(required_keys: List[str]) -> None:
     missing_keys = []
     empty_keys = []
     
+    env = os.environ
     for key in required_keys:
-        value = os.getenv(key)
+        value = env.get(key)
         if value is None:
             missing_keys.append(key)
-        elif value.strip() == "":
+        elif not value or value.isspace():
             empty_keys.append(key)
     
     if missing_keys or empty_keys:
@@ -5,73 +5,239 @@ Provides centralized logging configuration and convenience methods
 for consistent logging across the application.
 """
 
+import atexit
 import logging
 import os
+import queue
+import threading
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 
 # Flag to track if logger has been initialized to ensure idempotency
 _logger_initialized = False
 
+# Handlers attached by the last initialization, returned by repeat calls
+_console_handler: Optional[logging.Handler] = None
+_file_handler: Optional[logging.Handler] = None
 
-def initialize_logger(log_level: str = "INFO", log_file: str = "logs/app.log") -> None:
+# Serializes first-time initialization across threads
+_init_lock = threading.Lock()
+
+# Background thread writing queued records when initialized with queued=True
+_log_listener: Optional[QueueListener] = None
+
+# Records the queued file handler buffers before writing them out in one go;
+# ERROR and above are written immediately
+_FILE_BUFFER_RECORDS = 512
+
+# Stream buffer of the queued file handler, flushed once per batch
+_FILE_STREAM_BUFFER = 64 * 1024
+
+# Formatters are immutable once built, so one instance of each is shared
+# across initializations
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+_CONSOLE_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    datefmt=_DATE_FORMAT
+)
+_FILE_FORMATTER = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
+    datefmt=_DATE_FORMAT
+)
+
+# The root logger never changes identity, so the convenience functions bind it once
+_ROOT = logging.getLogger()
+
+# Accepted log_level names; anything else falls back to INFO
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+class _BatchedFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that writes a batch of records with few syscalls.
+    
+    The stock handler flushes after every record and, when rotating, stats
+    and seeks the file per record to check its size (which also forces a
+    flush). This one writes into a 64 KiB stream buffer, tracks the file
+    size itself (counting characters, so non-ASCII text rotates slightly
+    late) and only flushes when flush() is called at the end of a batch.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._size: Optional[int] = None  # bytes in the file, read on first write
+    
+    def _open(self):
+        return open(self.baseFilename, self.mode, buffering=_FILE_STREAM_BUFFER,
+                    encoding=self.encoding, errors=self.errors)
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            if self._size is None:
+                self._size = self.stream.seek(0, os.SEEK_END)
+            if self.maxBytes > 0 and self._size and self._size + len(msg) >= self.maxBytes:
+                self.doRollover()
+                self.stream = self._open()
+                self._size = 0
+            self.stream.write(msg)
+            self._size += len(msg)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchingMemoryHandler(MemoryHandler):
+    """MemoryHandler that flushes its target once after writing out a batch."""
+    
+    def flush(self) -> None:
+        super().flush()
+        if self.target is not None:
+            self.target.flush()
+
+
+def initialize_logger(log_level: str = "INFO", log_file: str = "logs/app.log",
+                      queued: bool = False, max_bytes: int = 10_000_000,
+                      backup_count: int = 5,
+                      skip_record_details: bool = False) -> Tuple[logging.Handler, logging.Handler]:
     """
     Initialize the root logger with console and file handlers.
     
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Path to log file
+        queued: Put both handlers behind a QueueHandler so logging calls
+                only enqueue records and a background thread does the
+                console and file I/O. File writes are also batched until
+                an error is logged or the buffer fills; queued and
+                buffered records are flushed at exit
+        max_bytes: Size at which the log file is rotated; 0 never rotates
+        backup_count: Number of rotated log files kept
+        skip_record_details: Stop collecting thread, process and asyncio
+                task details on every log record. Neither format shows
+                them, but the switches are process-wide, so only the
+                application owning the process should turn this on
+        
+    Returns:
+        Tuple of (console handler, file handler); repeat calls return the
+        handlers from the first
     """
-    global _logger_initialized
+    # Ensure idempotency - don't re-initialize if already done. The unlocked
+    # check keeps repeat calls cheap; the locked one stops concurrent first
+    # calls from both attaching handlers
+    if not _logger_initialized:
+        with _init_lock:
+            if not _logger_initialized:
+                _configure_root_logger(log_level, log_file, queued, max_bytes,
+                                       backup_count, skip_record_details)
+    return _console_handler, _file_handler
+
+
+def _configure_root_logger(log_level: str, log_file: str, queued: bool,
+                           max_bytes: int, backup_count: int,
+                           skip_record_details: bool) -> None:
+    """Attach handlers to the root logger; called once, under _init_lock."""
+    global _logger_initialized, _log_listener, _console_handler, _file_handler
     
-    # Ensure idempotency - don't re-initialize if already done
-    if _logger_initialized:
-        return
+    # A listener left by a previous initialization would keep old handlers
+    _stop_listener()
     
     # Create logs directory if it doesn't exist
     log_path = Path(log_file)
     log_path.parent.mkdir(parents=True, exist_ok=True)
     
+    # Neither format uses thread, process or task fields, so optionally
+    # don't look them up for every record
+    if skip_record_details:
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+        logging.logAsyncioTasks = False  # Python 3.12+
+    
     # Get root logger and set level
     root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper(), logging.INFO))
+    root_logger.setLevel(_LEVELS.get(log_level.upper(), logging.INFO))
     
     # Clear any existing handlers to prevent duplicates
     root_logger.handlers.clear()
     
-    # Create formatters
-    console_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
-    file_formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    
     # Create and configure console handler
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(console_formatter)
+    console_handler.setFormatter(_CONSOLE_FORMATTER)
     
-    # Create and configure file handler
-    file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
+    # Create and configure file handler, rotated so the log cannot grow unbounded;
+    # the file is only opened once the first record is written. Queued records
+    # reach it in batches, so that handler defers flushing to the batch end
+    file_handler_class = _BatchedFileHandler if queued else RotatingFileHandler
+    file_handler = file_handler_class(
+        log_file, mode='a', maxBytes=max_bytes, backupCount=backup_count,
+        encoding='utf-8', delay=True
+    )
     file_handler.setLevel(logging.DEBUG)
-    file_handler.setFormatter(file_formatter)
+    file_handler.setFormatter(_FILE_FORMATTER)
     
-    # Add handlers to root logger
-    root_logger.addHandler(console_handler)
-    root_logger.addHandler(file_handler)
+    if queued:
+        log_queue = queue.SimpleQueue()
+        root_logger.addHandler(QueueHandler(log_queue))
+        buffered_file_handler = _BatchingMemoryHandler(
+            _FILE_BUFFER_RECORDS, flushLevel=logging.ERROR, target=file_handler
+        )
+        # The listener filters on this handler's level, not the target's
+        buffered_file_handler.setLevel(file_handler.level)
+        _log_listener = QueueListener(
+            log_queue, console_handler, buffered_file_handler, respect_handler_level=True
+        )
+        _log_listener.start()
+        atexit.register(_stop_listener)
+    else:
+        # Add handlers to root logger
+        root_logger.addHandler(console_handler)
+        root_logger.addHandler(file_handler)
     
     # Mark as initialized
+    _console_handler, _file_handler = console_handler, file_handler
     _logger_initialized = True
     
     # Log initialization success
     root_logger.info(f"Logger initialized with level {log_level}, file: {log_file}")
 
 
+def _stop_listener() -> None:
+    """Write out any queued and buffered records and stop the background listener."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.flush()
+        _log_listener = None
+
+
+def log_debug(message: str, *args) -> None:
+    """
+    Log a debug message.
+    
+    Formatting is deferred: args are %-interpolated into message only if
+    DEBUG is enabled, so per-item debug calls cost almost nothing otherwise.
+    
+    Args:
+        message: Message to log, with %-style placeholders for args
+        *args: Values interpolated into message
+    """
+    _ROOT.debug(message, *args)
+
+
 def log_info(message: str) -> None:
     """
     Log an info message.
@@ -79,8 +245,7 @@ def log_info(message: str) -> None:
     Args:
         message: Message to log
     """
-    logger = logging.getLogger()
-    logger.info(message)
+    _ROOT.info(message)
 
 
 def log_warning(message: str) -> None:
@@ -90,8 +255,7 @@ def log_warning(message: str) -> None:
     Args:
         message: Message to log
     """
-    logger = logging.getLogger()
-    logger.warning(message)
+    _ROOT.warning(message)
 
 
 def log_error(message: str) -> None:
@@ -101,5 +265,4 @@ def log_error(message: str) -> None:
     Args:
         message: Message to log
     """
-    logger = logging.getLogger()
-    logger.error(message)
+    _ROOT.error(message)
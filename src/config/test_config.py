@@ -113,6 +113,14 @@ class TestGetConfig:
         assert result is None
         assert "Configuration key 'MISSING_KEY' not found and no default provided" in caplog.text
     
+    def test_get_config_missing_key_warns_once(self, caplog):
+        """Test repeated lookups of a missing key only log one warning."""
+        with caplog.at_level(logging.WARNING):
+            for _ in range(3):
+                assert get_config("REPEATED_MISSING_KEY", "8") == "8"
+        
+        assert caplog.text.count("Configuration key 'REPEATED_MISSING_KEY' not found") == 1
+    
     def test_get_config_empty_key(self):
         """Test getting value for empty environment variable."""
         result = get_config("EMPTY_KEY")
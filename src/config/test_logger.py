@@ -12,11 +12,12 @@ Tests cover:
 import logging
 import os
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 import pytest
 
-from .logger_module import initialize_logger, log_info, log_warning, log_error
+from .logger_module import initialize_logger, log_debug, log_info, log_warning, log_error
 
 
 class TestInitializeLogger:
@@ -50,7 +51,7 @@ class TestInitializeLogger:
         # Check handler types
         handler_types = [type(h).__name__ for h in root_logger.handlers]
         assert "StreamHandler" in handler_types
-        assert "FileHandler" in handler_types
+        assert "RotatingFileHandler" in handler_types
         
         # Check log file was created
         assert log_file.exists()
@@ -107,24 +108,36 @@ class TestInitializeLogger:
         """Test that handlers have correct log levels."""
         log_file = tmp_path / "test.log"
         
-        initialize_logger(log_file=str(log_file))
-        
-        root_logger = logging.getLogger()
-        
-        # Find console and file handlers
-        console_handler = None
-        file_handler = None
+        console_handler, file_handler = initialize_logger(log_file=str(log_file))
         
-        for handler in root_logger.handlers:
-            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
-                console_handler = handler
-            elif isinstance(handler, logging.FileHandler):
-                file_handler = handler
-        
-        assert console_handler is not None
-        assert file_handler is not None
+        assert logging.getLogger().handlers == [console_handler, file_handler]
+        assert not isinstance(console_handler, logging.FileHandler)
+        assert isinstance(file_handler, logging.FileHandler)
         assert console_handler.level == logging.INFO
         assert file_handler.level == logging.DEBUG
+        
+        # Repeat calls hand back the same handlers
+        assert initialize_logger(log_file=str(log_file)) == (console_handler, file_handler)
+    
+    def test_initialize_logger_skips_unused_record_fields(self, tmp_path, monkeypatch):
+        """Test records can skip thread and process details the formats never show."""
+        for flag in ("logThreads", "logProcesses", "logMultiprocessing"):
+            monkeypatch.setattr(logging, flag, True)  # restored after the test
+        initialize_logger(log_file=str(tmp_path / "test.log"), skip_record_details=True)
+        
+        record = logging.getLogger().makeRecord("test", logging.INFO, __file__, 1, "msg", (), None)
+        assert record.thread is None
+        assert record.process is None
+        assert record.processName is None
+    
+    def test_initialize_logger_keeps_record_fields_by_default(self, tmp_path, monkeypatch):
+        """Test the process-wide record switches are left alone unless asked."""
+        monkeypatch.setattr(logging, "logThreads", True)
+        initialize_logger(log_file=str(tmp_path / "test.log"))
+        
+        record = logging.getLogger().makeRecord("test", logging.INFO, __file__, 1, "msg", (), None)
+        assert logging.logThreads is True
+        assert record.thread is not None
     
     def test_initialize_logger_formatters(self, tmp_path):
         """Test that handlers have appropriate formatters."""
@@ -181,6 +194,74 @@ class TestLoggingOutput:
         assert "ERROR" in log_content
         assert "Test error message" in log_content
     
+    def test_queued_messages_written_to_file(self, tmp_path):
+        """Test queued logging hands records to a listener that writes them to file."""
+        import src.config.logger_module
+        log_file = tmp_path / "test.log"
+        
+        initialize_logger(log_level="DEBUG", log_file=str(log_file), queued=True)
+        
+        root_logger = logging.getLogger()
+        assert [type(h).__name__ for h in root_logger.handlers] == ["QueueHandler"]
+        
+        root_logger.debug("Queued debug message")
+        root_logger.info("Queued info message")
+        src.config.logger_module._stop_listener()  # drains the queue and file buffer
+        
+        log_content = log_file.read_text()
+        assert "Queued debug message" in log_content
+        assert "Queued info message" in log_content
+    
+    def test_queued_file_handler_rotates_by_tracked_size(self, tmp_path):
+        """Test the batched file handler rotates without per-record size checks."""
+        import src.config.logger_module
+        log_file = tmp_path / "test.log"
+        
+        initialize_logger(log_file=str(log_file), queued=True, max_bytes=500, backup_count=2)
+        
+        for i in range(20):
+            logging.getLogger().info(f"Rotating message {i}")
+        src.config.logger_module._stop_listener()
+        
+        assert (tmp_path / "test.log.1").exists()
+        assert not (tmp_path / "test.log.3").exists()
+        assert log_file.stat().st_size <= 500
+        assert "Rotating message 19" in log_file.read_text()
+    
+    def test_queued_errors_flush_file_buffer(self, tmp_path):
+        """Test an error writes buffered records to file without waiting for shutdown."""
+        import src.config.logger_module
+        log_file = tmp_path / "test.log"
+        
+        initialize_logger(log_file=str(log_file), queued=True)
+        listener = src.config.logger_module._log_listener
+        src.config.logger_module._log_listener = None  # stopped by the test itself
+        
+        logging.getLogger().info("Buffered info message")
+        listener.stop()  # drains the queue without flushing the file buffer
+        assert not log_file.exists()  # opened lazily, and nothing written yet
+        
+        listener.start()
+        logging.getLogger().error("Flushing error message")
+        listener.stop()
+        
+        log_content = log_file.read_text()
+        assert "Buffered info message" in log_content
+        assert "Flushing error message" in log_content
+    
+    def test_log_file_rotates(self, tmp_path):
+        """Test the log file is rotated once it reaches max_bytes."""
+        log_file = tmp_path / "test.log"
+        
+        initialize_logger(log_file=str(log_file), max_bytes=500, backup_count=2)
+        
+        for i in range(20):
+            logging.getLogger().info(f"Rotating message {i}")
+        
+        assert (tmp_path / "test.log.1").exists()
+        assert not (tmp_path / "test.log.3").exists()
+        assert log_file.stat().st_size <= 500
+    
     def test_log_levels_respected(self, tmp_path):
         """Test that log levels are respected."""
         log_file = tmp_path / "test.log"
@@ -278,12 +359,9 @@ class TestConvenienceMethods:
         # Should not raise an exception
         # Note: This tests the fallback behavior of getting root logger
     
-    @patch('logging.getLogger')
-    def test_convenience_methods_call_correct_levels(self, mock_get_logger):
+    @patch('src.config.logger_module._ROOT')
+    def test_convenience_methods_call_correct_levels(self, mock_logger):
         """Test that convenience methods call the correct logging levels."""
-        mock_logger = MagicMock()
-        mock_get_logger.return_value = mock_logger
-        
         log_info("info message")
         log_warning("warning message")
         log_error("error message")
@@ -291,6 +369,24 @@ class TestConvenienceMethods:
         mock_logger.info.assert_called_once_with("info message")
         mock_logger.warning.assert_called_once_with("warning message")
         mock_logger.error.assert_called_once_with("error message")
+    
+    def test_log_debug_formats_lazily(self, tmp_path):
+        """Test log_debug only interpolates its arguments when DEBUG is enabled."""
+        log_file = tmp_path / "test.log"
+        initialize_logger(log_level="INFO", log_file=str(log_file))
+        
+        unformattable = MagicMock()
+        unformattable.__str__ = MagicMock(side_effect=AssertionError("formatted"))
+        log_debug("Skipped %s", unformattable)
+        
+        logging.getLogger().setLevel(logging.DEBUG)
+        log_debug("Cache miss: %s not found", "Rome_abc123")
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        
+        log_content = log_file.read_text()
+        assert "Skipped" not in log_content
+        assert "Cache miss: Rome_abc123 not found" in log_content
 
 
 class TestThreadSafety:
@@ -303,4 +399,21 @@ class TestThreadSafety:
         
         import src.config.logger_module
         src.config.logger_module._logger_initialized = False
-    
\ No newline at end of file
+    
+    
+    def test_concurrent_initialization_attaches_handlers_once(self, tmp_path):
+        """Test threads racing to initialize only configure the root logger once."""
+        log_file = tmp_path / "test.log"
+        barrier = threading.Barrier(8)
+        
+        def init():
+            barrier.wait()
+            initialize_logger(log_file=str(log_file))
+        
+        threads = [threading.Thread(target=init) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert len(logging.getLogger().handlers) == 2
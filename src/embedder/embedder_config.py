@@ -5,12 +5,25 @@ Defines settings for how maps are embedded into EPUB files,
 including styling, captions, and embedding strategy.
 """
 
-from dataclasses import dataclass
+import string
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
 
 
-@dataclass
+# Accepted values for EmbedderConfig.embed_strategy
+EMBED_STRATEGIES = frozenset(("external", "inline"))
+
+
+@dataclass(frozen=True, slots=True)
 class EmbedderConfig:
-    """Configuration for map embedding in EPUB files."""
+    """
+    Configuration for map embedding in EPUB files.
+    
+    Instances are immutable and hashable, so they can be shared and used as
+    cache keys. image_style is derived from max_image_width at construction,
+    so every embedded figure reuses the same string, and caption_template is
+    parsed once so format_caption only has to join strings.
+    """
     
     figure_class: str = "historical-map"
     figure_style: str = "margin: 1em 0; text-align: center;"
@@ -18,10 +31,12 @@ class EmbedderConfig:
     image_format: str = "png"
     max_image_width: str = "100%"
     embed_strategy: str = "external"  # "external" or "inline"
+    image_style: str = field(init=False, repr=False, compare=False)
+    _caption_parts: Optional[Tuple[str, ...]] = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Validate configuration values."""
-        if self.embed_strategy not in ["external", "inline"]:
+        if self.embed_strategy not in EMBED_STRATEGIES:
             raise ValueError(f"Invalid embed_strategy: {self.embed_strategy}. Must be 'external' or 'inline'")
         
         if not self.caption_template:
@@ -29,3 +44,33 @@ class EmbedderConfig:
         
         if "{place}" not in self.caption_template:
             raise ValueError("caption_template must contain {place} placeholder")
+        
+        object.__setattr__(self, "image_style", f"max-width: {self.max_image_width};")
+        object.__setattr__(self, "_caption_parts", _split_template(self.caption_template))
+    
+    def format_caption(self, place: str) -> str:
+        """Fill caption_template for a place."""
+        if self._caption_parts is None:
+            return self.caption_template.format(place=place)
+        return place.join(self._caption_parts)
+
+
+def _split_template(template: str) -> Optional[Tuple[str, ...]]:
+    """
+    Split a caption template into the literal text around its {place} fields.
+    
+    Returns None if the template uses anything but bare {place} fields
+    (format specs, conversions, other names), which need str.format.
+    
+    Raises:
+        ValueError: If the template is not a valid format string
+    """
+    parts = [""]
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        parts[-1] += literal
+        if field_name is None:
+            continue
+        if field_name != "place" or format_spec or conversion:
+            return None
+        parts.append("")
+    return tuple(parts)
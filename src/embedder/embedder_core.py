@@ -6,13 +6,15 @@ and mapping modules to insert map images at appropriate locations
 in EPUB documents.
 """
 
+import os
 import re
-from typing import List, Dict, Any, Optional, Tuple
+import unicodedata
+from typing import List, Dict, Any, Optional, Tuple, Union
 from lxml import etree
 import ebooklib
 from ebooklib import epub
 
-from ..config.logger_module import log_info, log_warning, log_error
+from ..config.logger_module import log_debug, log_info, log_warning, log_error
 from .embedder_config import EmbedderConfig
 from .embedder_strategy import ImageEmbedStrategy, ExternalImageStrategy, InlineImageStrategy
 from .embedder_errors import (
@@ -22,6 +24,21 @@ from .embedder_errors import (
     ImageEmbedError
 )
 
+# Same normalization as the mapping module's cache key prefix
+_UNSAFE_PLACE_CHARS = re.compile(r'[^a-zA-Z0-9\-.]')
+
+
+def _safe_place(place: str) -> str:
+    """Cache key prefix for a place, canonicalized as mapping_cache.canonical_place does."""
+    name = unicodedata.normalize("NFKD", place).casefold().strip()
+    if name.startswith("the "):
+        name = name[4:].lstrip()
+    return _UNSAFE_PLACE_CHARS.sub('_', name)[:20]
+
+# Paragraph queries, compiled once: namespaced XHTML first, bare <p> as fallback
+_XPATH_P_NS = etree.XPath('//html:p', namespaces={'html': 'http://www.w3.org/1999/xhtml'})
+_XPATH_P = etree.XPath('//p')
+
 
 class EpubMapEmbedder:
     """
@@ -52,16 +69,22 @@ class EpubMapEmbedder:
         else:
             self.strategy = strategy
             
-        self._paragraph_cache = {}  # Cache for paragraph lookups
+        self._para_elements = []  # paragraph index -> <p> element, in reading order
+        self._para_items = []  # paragraph index -> document item containing it
         self._chunk_to_para_map = {}  # Maps chunk indices to paragraph ranges
         self._epub_structure = {}  # Store EPUB structure info
+        self._indexed_map_images = None  # map_images the key indexes were built from
+        self._cache_key_index = {}  # safe_place prefix -> cache key
+        self._modified_items = {}  # file name -> (item, tree) awaiting serialization
+        self._parsed_docs = {}  # file name -> (content parsed, tree)
+        self._parser = etree.XMLParser(recover=True, encoding='utf-8')
         
         log_info(f"EpubMapEmbedder initialized with {self.config.embed_strategy} strategy")
     
     def embed_maps(self,
                    book: epub.EpubBook,
                    ai_results: List[List[Dict[str, Any]]],  # From AI module
-                   map_images: Dict[str, bytes],            # From mapping module
+                   map_images: Dict[str, Union[bytes, os.PathLike]],  # From mapping module
                    chunk_info: Optional[List[Tuple[int, int]]] = None) -> epub.EpubBook:
         """
         Main entry point for embedding maps.
@@ -70,7 +93,8 @@ class EpubMapEmbedder:
             book: EPUB book to modify
             ai_results: AI module output - List of lists, each containing
                        dicts with 'place' and 'zoom'
-            map_images: Mapping module output - cache_key -> image bytes
+            map_images: Mapping module output - cache_key -> image bytes,
+                        or path to the cached image file
             chunk_info: Optional list of (start_para, end_para) tuples for each chunk
             
         Returns:
@@ -92,9 +116,13 @@ class EpubMapEmbedder:
         if chunk_info:
             self._build_chunk_mapping(chunk_info)
         
+        # Index cache keys once instead of scanning them for every place
+        self._build_cache_key_index(map_images)
+        
         # Process each place
         embedded_count = 0
         skipped_count = 0
+        self._modified_items = {}
         
         for chunk_idx, chunk_places in enumerate(ai_results):
             for place_info in chunk_places:
@@ -128,6 +156,9 @@ class EpubMapEmbedder:
                     skipped_count += 1
                     continue
         
+        # Serialize each modified chapter once, after all its figures are in
+        self._write_modified_items()
+        
         log_info(f"Embedding complete: {embedded_count} maps embedded, {skipped_count} skipped")
         return book
     
@@ -175,84 +206,35 @@ class EpubMapEmbedder:
                 f"{docs_in_subdirs} in subdirectories, "
                 f"directories: {directories}")
     
-    def _calculate_image_path(self, xhtml_path: str, image_href: str) -> str:
-        """
-        Calculate the correct relative path from XHTML to image.
-        
-        Args:
-            xhtml_path: Path to the XHTML file (e.g., "text/chapter1.xhtml")
-            image_href: Path to the image (e.g., "images/map.png")
-            
-        Returns:
-            Correct relative path (e.g., "../images/map.png" or "images/map.png")
-        """
-        # Handle different path separators
-        xhtml_path = xhtml_path.replace('\\', '/')
-        image_href = image_href.replace('\\', '/')
-        
-        # Count directory levels in XHTML path
-        xhtml_parts = xhtml_path.split('/')
-        xhtml_depth = len(xhtml_parts) - 1  # -1 for the filename
-        
-        # Count directory levels in image path
-        image_parts = image_href.split('/')
-        image_depth = len(image_parts) - 1  # -1 for the filename
-        
-        # If XHTML is in a subdirectory, we need to go up
-        if xhtml_depth > 0:
-            # Go up the required number of levels
-            up_levels = '../' * xhtml_depth
-            return up_levels + image_href
-        else:
-            # XHTML is in root, use direct path
-            return image_href
-    
     def _build_paragraph_index(self, book: epub.EpubBook) -> None:
         """Build index of paragraphs across all XHTML documents."""
-        self._paragraph_cache = {}
-        para_count = 0
+        self._para_elements = []
+        self._para_items = []
+        
+        # Resolve spine ids with one map instead of a get_item_with_id scan each
+        documents_by_id = {
+            item.id: item for item in book.get_items_of_type(ebooklib.ITEM_DOCUMENT)
+        }
         
         # Get all XHTML documents in spine order
         spine_items = []
         for spine_item in book.spine:
-            if isinstance(spine_item, tuple):
-                item_id = spine_item[0]
-                item = book.get_item_with_id(item_id)
-                if item:
-                    spine_items.append(item)
-            else:
-                item = book.get_item_with_id(spine_item)
-                if item:
-                    spine_items.append(item)
+            item_id = spine_item[0] if isinstance(spine_item, tuple) else spine_item
+            item = documents_by_id.get(item_id)
+            if item:
+                spine_items.append(item)
         
         # Process documents in reading order
         for item in spine_items:
-            if item.get_type() != ebooklib.ITEM_DOCUMENT:
-                continue
-                
             try:
-                # Parse XHTML content
-                parser = etree.XMLParser(recover=True, encoding='utf-8')
-                tree = etree.fromstring(item.content, parser=parser)
+                # Parse XHTML content (reuses the tree from validation)
+                tree = self._parse_document(item)
                 
-                # Handle different namespace scenarios
-                # Try with namespace first
-                nsmap = {'html': 'http://www.w3.org/1999/xhtml'}
-                paragraphs = tree.xpath('//html:p', namespaces=nsmap)
+                # Try with namespace first, then without
+                paragraphs = _XPATH_P_NS(tree) or _XPATH_P(tree)
                 
-                # If no results, try without namespace
-                if not paragraphs:
-                    paragraphs = tree.xpath('//p')
-                
-                for para in paragraphs:
-                    # Store paragraph info
-                    self._paragraph_cache[para_count] = {
-                        'item': item,
-                        'element': para,
-                        'tree': tree,
-                        'text': self._get_element_text(para)
-                    }
-                    para_count += 1
+                self._para_elements.extend(paragraphs)
+                self._para_items.extend([item] * len(paragraphs))
                     
                 log_info(f"Indexed {len(paragraphs)} paragraphs from {item.file_name}")
                     
@@ -261,23 +243,24 @@ class EpubMapEmbedder:
             except Exception as e:
                 log_error(f"Error processing document {item.file_name}: {e}")
         
-        log_info(f"Total paragraphs indexed: {para_count}")
+        log_info(f"Total paragraphs indexed: {len(self._para_elements)}")
     
-    def _get_element_text(self, element) -> str:
-        """Extract all text from an element and its children."""
-        if element is None:
-            return ""
-        
-        text_parts = []
-        if element.text:
-            text_parts.append(element.text)
-        
-        for child in element:
-            text_parts.append(self._get_element_text(child))
-            if child.tail:
-                text_parts.append(child.tail)
+    def _parse_document(self, item: epub.EpubItem) -> etree._Element:
+        """
+        Parse an XHTML item, reusing the tree if its content is unchanged.
         
-        return ' '.join(text_parts).strip()
+        validate_epub_structure and _build_paragraph_index run back to back
+        over the same documents, so each one is parsed only once per embed.
+        A document whose content has since been replaced is parsed again.
+        """
+        content = item.content
+        cached = self._parsed_docs.get(item.file_name)
+        if cached is not None and cached[0] is content:
+            return cached[1]
+        
+        tree = etree.fromstring(content, parser=self._parser)
+        self._parsed_docs[item.file_name] = (content, tree)
+        return tree
     
     def _build_chunk_mapping(self, chunk_info: List[Tuple[int, int]]) -> None:
         """Build mapping from chunk indices to paragraph ranges."""
@@ -286,22 +269,48 @@ class EpubMapEmbedder:
             self._chunk_to_para_map[chunk_idx] = (start_para, end_para)
         log_info(f"Built chunk mapping for {len(chunk_info)} chunks")
     
+    def _build_cache_key_index(self, map_images: Dict[str, bytes]) -> None:
+        """
+        Index map_images keys for constant-time place lookups.
+        
+        Cache keys have the form '<safe_place>_<hash>.png', and safe_place may
+        itself contain underscores, so the prefix is recovered by splitting
+        at the last underscore. Prefixes are lowercased to match canonical
+        place names, and the first key seen for a prefix wins.
+        """
+        self._cache_key_index = {}
+        
+        for cache_key in map_images:
+            prefix = cache_key.rsplit('_', 1)[0].lower()
+            self._cache_key_index.setdefault(prefix, cache_key)
+        
+        self._indexed_map_images = map_images
+    
     def _find_cache_key(self, place_info: Dict[str, Any], 
                        map_images: Dict[str, bytes]) -> Optional[str]:
         """Find cache key for a place in map_images."""
+        if map_images is not self._indexed_map_images:
+            self._build_cache_key_index(map_images)
+        
         place_name = place_info['place']
         
         # Normalize place name for comparison
         # Same logic as used in mapping module's cache key generation
-        safe_place = re.sub(r'[^a-zA-Z0-9\-.]', '_', place_name)[:20]
+        safe_place = _safe_place(place_name)
         
         # Look for exact match first
+        cache_key = self._cache_key_index.get(safe_place)
+        if cache_key:
+            return cache_key
+        
+        # Index misses fall back to scanning the keys: first a key whose
+        # place prefix starts with this one, then substring matching (in
+        # case of slight differences)
         for cache_key in map_images:
-            if cache_key.startswith(safe_place + "_"):
+            if cache_key.lower().startswith(safe_place + "_"):
                 return cache_key
         
-        # Try with partial matching (in case of slight differences)
-        place_words = safe_place.lower().split('_')
+        place_words = safe_place.split('_')
         place_words = [w for w in place_words if len(w) > 2]  # Skip short words
         
         if place_words:
@@ -325,66 +334,70 @@ class EpubMapEmbedder:
         if self._chunk_to_para_map and chunk_idx in self._chunk_to_para_map:
             start_para, end_para = self._chunk_to_para_map[chunk_idx]
             # Return the end of the chunk range (place at end of chunk)
-            return min(end_para, len(self._paragraph_cache) - 1)
+            return min(end_para, len(self._para_elements) - 1)
         
         # Otherwise, estimate based on typical distribution
         # Assuming chunks are roughly equal and contain ~5-10 paragraphs each
-        paragraphs_per_chunk = max(1, len(self._paragraph_cache) // max(1, len(self._chunk_to_para_map) or 10))
+        paragraphs_per_chunk = max(1, len(self._para_elements) // max(1, len(self._chunk_to_para_map) or 10))
         estimated_idx = min(
             chunk_idx * paragraphs_per_chunk + paragraphs_per_chunk - 1,
-            len(self._paragraph_cache) - 1
+            len(self._para_elements) - 1
         )
         
-        log_info(f"Estimated paragraph index {estimated_idx} for chunk {chunk_idx}")
+        log_debug("Estimated paragraph index %d for chunk %d", estimated_idx, chunk_idx)
         return estimated_idx
     
     def _embed_single_map(self, 
                          book: epub.EpubBook,
                          paragraph_idx: int,
                          place: str,
-                         image_bytes: bytes,
+                         image_data: Union[bytes, os.PathLike],
                          cache_key: str) -> None:
-        """Embed a single map after the specified paragraph."""
+        """Embed a single map (bytes or cached file path) after the specified paragraph."""
         
         # Get paragraph info
-        if paragraph_idx not in self._paragraph_cache:
+        if not 0 <= paragraph_idx < len(self._para_elements):
             raise ParagraphNotFoundError(f"Paragraph {paragraph_idx} not found")
         
-        para_info = self._paragraph_cache[paragraph_idx]
+        para_element = self._para_elements[paragraph_idx]
+        item = self._para_items[paragraph_idx]
         
         # Add image to EPUB using strategy
-        image_href = self.strategy.embed_image(book, cache_key, image_bytes)
+        if isinstance(image_data, (str, os.PathLike)):
+            image_href = self.strategy.embed_image_path(book, cache_key, image_data)
+        else:
+            image_href = self.strategy.embed_image(book, cache_key, image_data)
         
         # Create figure element using strategy
         figure = self.strategy.create_figure_element(
-            image_href, place, self.config, para_info['item'].file_name
+            image_href, place, self.config, item.file_name
         )
         
         # Insert after paragraph
-        para_element = para_info['element']
-        parent = para_element.getparent()
-        
-        if parent is None:
+        if para_element.getparent() is None:
             raise ImageEmbedError(f"Paragraph {paragraph_idx} has no parent element")
         
-        # Find paragraph position in parent
-        para_index = list(parent).index(para_element)
-        
-        # Insert figure after paragraph
-        parent.insert(para_index + 1, figure)
+        para_element.addnext(figure)
         
-        # Update item content with modified tree
-        # Serialize with proper encoding and XML declaration
-        updated_content = etree.tostring(
-            para_info['tree'], 
-            pretty_print=True,
-            encoding='utf-8',
-            xml_declaration=True
-        )
-        
-        para_info['item'].content = updated_content
+        # Defer serialization so a chapter with many maps is written once
+        self._modified_items[item.file_name] = (item, para_element.getroottree().getroot())
         
-        log_info(f"Embedded map for '{place}' after paragraph {paragraph_idx} in {para_info['item'].file_name}")
+        log_info(f"Embedded map for '{place}' after paragraph {paragraph_idx} in {item.file_name}")
+    
+    def _write_modified_items(self) -> None:
+        """Serialize every document modified by _embed_single_map back into its item."""
+        for item, tree in self._modified_items.values():
+            # Serialize with proper encoding and XML declaration; the source
+            # document's own whitespace is kept, so no pretty-printing pass
+            item.content = etree.tostring(
+                tree,
+                encoding='utf-8',
+                xml_declaration=True
+            )
+        
+        if self._modified_items:
+            log_info(f"Updated {len(self._modified_items)} documents with embedded maps")
+        self._modified_items = {}
     
     def validate_epub_structure(self, book: epub.EpubBook) -> None:
         """Validate EPUB has expected structure for embedding."""
@@ -401,15 +414,10 @@ class EpubMapEmbedder:
         para_found = False
         for item in doc_items:
             try:
-                parser = etree.XMLParser(recover=True, encoding='utf-8')
-                tree = etree.fromstring(item.content, parser=parser)
+                tree = self._parse_document(item)
                 
-                # Try with namespace
-                if tree.xpath('//html:p', namespaces={'html': 'http://www.w3.org/1999/xhtml'}):
-                    para_found = True
-                    break
-                # Try without namespace
-                elif tree.xpath('//p'):
+                # Try with namespace, then without
+                if _XPATH_P_NS(tree) or _XPATH_P(tree):
                     para_found = True
                     break
             except:
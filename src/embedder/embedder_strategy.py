@@ -7,15 +7,27 @@ including external file references and inline Base64 encoding.
 
 from abc import ABC, abstractmethod
 import base64
+import os
+import posixpath
+from pathlib import Path
+from typing import Union
 from lxml import etree
 import ebooklib
 from ebooklib import epub
 
-from ..config.logger_module import log_info, log_error
+from ..config.logger_module import log_debug, log_info, log_error
 from .embedder_config import EmbedderConfig
 from .embedder_errors import ImageEmbedError
 
 
+# Leading bytes of the image formats map providers return
+_IMAGE_SIGNATURES = (
+    (b"\x89PNG", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF8", "image/gif"),
+)
+
+
 class ImageEmbedStrategy(ABC):
     """Abstract base class for image embedding strategies."""
     
@@ -39,6 +51,34 @@ class ImageEmbedStrategy(ABC):
         """
         pass
     
+    def embed_image_path(self, book: epub.EpubBook,
+                         cache_key: str,
+                         image_path: Union[str, os.PathLike]) -> str:
+        """
+        Add image stored on disk to EPUB and return its href.
+        
+        The file is read only here, so its bytes are not kept alive by
+        the caller between fetching and embedding.
+        
+        Args:
+            book: EPUB book object
+            cache_key: Filename from mapping module (e.g., "Rome_abc123.png")
+            image_path: Path to the cached image file
+            
+        Returns:
+            EPUB href for the image (e.g., "images/Rome_abc123.png")
+            
+        Raises:
+            ImageEmbedError: If the file cannot be read or embedding fails
+        """
+        try:
+            image_bytes = Path(image_path).read_bytes()
+        except OSError as e:
+            log_error(f"Failed to read image {image_path}: {e}")
+            raise ImageEmbedError(f"Failed to read image {image_path}: {str(e)}")
+        
+        return self.embed_image(book, cache_key, image_bytes)
+    
     @abstractmethod
     def create_figure_element(self, image_href: str, 
                             place: str,
@@ -67,8 +107,7 @@ class ExternalImageStrategy(ImageEmbedStrategy):
                    image_bytes: bytes) -> str:
         """Add image as external file in EPUB."""
         try:
-            # Determine media type from extension
-            media_type = "image/png" if cache_key.endswith(".png") else "image/jpeg"
+            media_type = _sniff_mime(image_bytes, cache_key)
             
             # Create epub.EpubImage
             img = epub.EpubImage()
@@ -100,22 +139,15 @@ class ExternalImageStrategy(ImageEmbedStrategy):
             if config.figure_style:
                 figure.set("style", config.figure_style)
             
-            # Calculate relative path based on XHTML location
-            img_src = image_href
-            if xhtml_path and '/' in xhtml_path:
-                # XHTML is in a subdirectory, need to go up
-                depth = xhtml_path.count('/')
-                img_src = '../' * depth + image_href
-            
-            # Add image
+            # Add image, referenced relative to the XHTML document
             img = etree.SubElement(figure, "img", {
-                "src": img_src,
+                "src": _relative_href(xhtml_path, image_href),
                 "alt": f"Map of {place}",
-                "style": f"max-width: {config.max_image_width};"
+                "style": config.image_style
             })
             
             # Add caption
-            caption_text = config.caption_template.format(place=place)
+            caption_text = config.format_caption(place)
             figcaption = etree.SubElement(figure, "figcaption")
             figcaption.text = caption_text
             
@@ -134,14 +166,13 @@ class InlineImageStrategy(ImageEmbedStrategy):
                    image_bytes: bytes) -> str:
         """Convert image to Base64 data URI."""
         try:
-            # Determine MIME type
-            mime_type = "image/png" if cache_key.endswith(".png") else "image/jpeg"
+            mime_type = _sniff_mime(image_bytes, cache_key)
             
             # Create data URI
-            base64_data = base64.b64encode(image_bytes).decode('utf-8')
+            base64_data = base64.b64encode(image_bytes).decode('ascii')
             data_uri = f"data:{mime_type};base64,{base64_data}"
             
-            log_info(f"Created data URI for {cache_key} ({len(base64_data)} chars)")
+            log_debug("Created data URI for %s (%d chars)", cache_key, len(base64_data))
             return data_uri
             
         except Exception as e:
@@ -166,11 +197,11 @@ class InlineImageStrategy(ImageEmbedStrategy):
             img = etree.SubElement(figure, "img", {
                 "src": image_href,  # This is the data URI
                 "alt": f"Map of {place}",
-                "style": f"max-width: {config.max_image_width};"
+                "style": config.image_style
             })
             
             # Add caption
-            caption_text = config.caption_template.format(place=place)
+            caption_text = config.format_caption(place)
             figcaption = etree.SubElement(figure, "figcaption")
             figcaption.text = caption_text
             
@@ -178,4 +209,29 @@ class InlineImageStrategy(ImageEmbedStrategy):
             
         except Exception as e:
             log_error(f"Failed to create inline figure element for {place}: {e}")
-            raise ImageEmbedError(f"Failed to create inline figure element: {str(e)}")
\ No newline at end of file
+            raise ImageEmbedError(f"Failed to create inline figure element: {str(e)}")
+
+
+def _relative_href(xhtml_path: str, image_href: str) -> str:
+    """
+    Path to an image as seen from an XHTML document.
+    
+    Both paths are relative to the package root, e.g. "text/chapter1.xhtml"
+    and "images/map.png" give "../images/map.png".
+    """
+    start = posixpath.dirname((xhtml_path or "").replace('\\', '/')) or '.'
+    return posixpath.relpath(image_href.replace('\\', '/'), start)
+
+
+def _sniff_mime(image_bytes: bytes, cache_key: str) -> str:
+    """
+    Media type of an image from its leading bytes.
+    
+    Falls back to the cache key's extension when the signature is unknown.
+    """
+    for signature, mime_type in _IMAGE_SIGNATURES:
+        if image_bytes.startswith(signature):
+            return mime_type
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/png" if cache_key.endswith(".png") else "image/jpeg"
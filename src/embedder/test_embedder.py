@@ -38,6 +38,7 @@ class TestEmbedderConfig:
         assert config.image_format == "png"
         assert config.max_image_width == "100%"
         assert config.embed_strategy == "external"
+        assert config.image_style == "max-width: 100%;"
     
     def test_custom_config(self):
         """Test custom configuration."""
@@ -50,6 +51,27 @@ class TestEmbedderConfig:
         assert config.caption_template == "Historical map: {place}"
         assert config.embed_strategy == "inline"
     
+    def test_config_is_immutable_and_hashable(self):
+        """Test configs cannot be changed after validation and work as cache keys."""
+        config = EmbedderConfig(max_image_width="600px")
+        
+        with pytest.raises(AttributeError):
+            config.max_image_width = "100%"
+        assert config.image_style == "max-width: 600px;"
+        assert hash(config) == hash(EmbedderConfig(max_image_width="600px"))
+    
+    @pytest.mark.parametrize("template,expected", [
+        ("Map of {place}", "Map of Rome"),
+        ("{place} ({place})", "Rome (Rome)"),
+        ("{{Map}} of {place}!", "{Map} of Rome!"),
+        ("{place} ({place!r})", "Rome ('Rome')"),
+        ("{place}:{place:>6}", "Rome:  Rome"),
+    ])
+    def test_format_caption(self, template, expected):
+        """Test captions match str.format for plain and formatted placeholders."""
+        config = EmbedderConfig(caption_template=template)
+        assert config.format_caption("Rome") == expected == template.format(place="Rome")
+    
     def test_invalid_embed_strategy(self):
         """Test invalid embed strategy raises error."""
         with pytest.raises(ValueError) as exc_info:
@@ -91,6 +113,27 @@ class TestExternalImageStrategy:
         assert img.content == image_bytes
         assert img.media_type == "image/png"
     
+    def test_embed_image_path(self, tmp_path):
+        """Test embedding an image read from a cache file path."""
+        strategy = ExternalImageStrategy()
+        book = Mock(spec=epub.EpubBook)
+        
+        image_path = tmp_path / "Rome_abc123.png"
+        image_path.write_bytes(b"fake_image_data")
+        
+        href = strategy.embed_image_path(book, "Rome_abc123.png", image_path)
+        
+        assert href == "images/Rome_abc123.png"
+        assert book.add_item.call_args[0][0].content == b"fake_image_data"
+    
+    def test_embed_image_path_missing_file(self, tmp_path):
+        """Test a missing cache file raises ImageEmbedError."""
+        strategy = ExternalImageStrategy()
+        book = Mock(spec=epub.EpubBook)
+        
+        with pytest.raises(ImageEmbedError, match="Failed to read image"):
+            strategy.embed_image_path(book, "Rome_abc123.png", tmp_path / "missing.png")
+    
     def test_embed_jpeg_image(self):
         """Test embedding JPEG image."""
         strategy = ExternalImageStrategy()
@@ -103,6 +146,21 @@ class TestExternalImageStrategy:
         
         img = book.add_item.call_args[0][0]
         assert img.media_type == "image/jpeg"
+
+    @pytest.mark.parametrize("cache_key,image_bytes,media_type", [
+        ("Paris_xyz789.jpg", b"\x89PNG\r\n\x1a\n...", "image/png"),
+        ("Paris_xyz789.png", b"\xff\xd8\xff\xe0...", "image/jpeg"),
+        ("Paris_xyz789.png", b"GIF89a...", "image/gif"),
+        ("Paris_xyz789.png", b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+    ])
+    def test_embed_image_media_type_from_content(self, cache_key, image_bytes, media_type):
+        """Test the media type comes from the image signature, not the extension."""
+        strategy = ExternalImageStrategy()
+        book = Mock(spec=epub.EpubBook)
+
+        strategy.embed_image(book, cache_key, image_bytes)
+
+        assert book.add_item.call_args[0][0].media_type == media_type
     
     def test_create_figure_element(self):
         """Test creating figure element."""
@@ -132,6 +190,22 @@ class TestExternalImageStrategy:
         assert figcaption is not None
         assert figcaption.text == "Map of Rome"
 
+    @pytest.mark.parametrize("xhtml_path,expected", [
+        ("chapter1.xhtml", "images/Rome_abc123.png"),
+        ("text/chapter1.xhtml", "../images/Rome_abc123.png"),
+        ("OEBPS/text/chapter1.xhtml", "../../images/Rome_abc123.png"),
+        ("images/chapter1.xhtml", "Rome_abc123.png"),
+    ])
+    def test_create_figure_element_relative_src(self, xhtml_path, expected):
+        """Test the image src is relative to the XHTML document's directory."""
+        strategy = ExternalImageStrategy()
+
+        figure = strategy.create_figure_element(
+            "images/Rome_abc123.png", "Rome", EmbedderConfig(), xhtml_path
+        )
+
+        assert figure.find(".//img").get("src") == expected
+
 
 class TestInlineImageStrategy:
     """Test inline Base64 image embedding strategy."""
@@ -180,6 +254,7 @@ class TestEpubMapEmbedder:
         
         # Create mock items with XHTML content
         item1 = Mock(spec=epub.EpubItem)
+        item1.id = "item1"
         item1.file_name = "chapter1.xhtml"
         item1.content = b"""<?xml version="1.0" encoding="utf-8"?>
         <html xmlns="http://www.w3.org/1999/xhtml">
@@ -191,6 +266,7 @@ class TestEpubMapEmbedder:
         item1.get_type.return_value = ebooklib.ITEM_DOCUMENT
         
         item2 = Mock(spec=epub.EpubItem)
+        item2.id = "item2"
         item2.file_name = "chapter2.xhtml"
         item2.content = b"""<?xml version="1.0" encoding="utf-8"?>
         <html xmlns="http://www.w3.org/1999/xhtml">
@@ -250,14 +326,15 @@ class TestEpubMapEmbedder:
         embedder._build_paragraph_index(mock_book)
         
         # Should have 3 paragraphs total
-        assert len(embedder._paragraph_cache) == 3
-        assert 0 in embedder._paragraph_cache
-        assert 2 in embedder._paragraph_cache
-        
-        # Check paragraph text
-        assert "ancient Rome" in embedder._paragraph_cache[0]['text']
-        assert "Constantinople" in embedder._paragraph_cache[1]['text']
-        assert "Venice" in embedder._paragraph_cache[2]['text']
+        assert len(embedder._para_elements) == 3
+        assert [item.file_name for item in embedder._para_items] == [
+            "chapter1.xhtml", "chapter1.xhtml", "chapter2.xhtml"
+        ]
+        
+        # Check paragraphs are indexed in reading order
+        assert "ancient Rome" in embedder._para_elements[0].text
+        assert "Constantinople" in embedder._para_elements[1].text
+        assert "Venice" in embedder._para_elements[2].text
     
     def test_find_cache_key_exact_match(self):
         """Test finding cache key with exact match."""
@@ -271,7 +348,15 @@ class TestEpubMapEmbedder:
         
         cache_key = embedder._find_cache_key(place_info, map_images)
         assert cache_key == "Rome_abc123.png"
-    
+
+    def test_find_cache_key_canonical_prefix(self):
+        """Test places match the canonical prefixes the mapping module writes."""
+        embedder = EpubMapEmbedder()
+        map_images = {"hague_abc123.png": b"data1"}
+
+        for place in ("The Hague", "the hague ", "HAGUE"):
+            assert embedder._find_cache_key({"place": place}, map_images) == "hague_abc123.png"
+
     def test_find_cache_key_fuzzy_match(self):
         """Test finding cache key with fuzzy match."""
         embedder = EpubMapEmbedder()
@@ -285,6 +370,42 @@ class TestEpubMapEmbedder:
         cache_key = embedder._find_cache_key(place_info, map_images)
         assert cache_key == "S_o_Paulo_abc123.png"
     
+    def test_find_cache_key_exact_match_multiword(self):
+        """Test exact match for place names whose safe prefix contains underscores."""
+        embedder = EpubMapEmbedder()
+        
+        place_info = {"place": "New York", "zoom": 12}
+        map_images = {
+            "York_abc123.png": b"data1",
+            "New_York_def456.png": b"data2"
+        }
+        
+        cache_key = embedder._find_cache_key(place_info, map_images)
+        assert cache_key == "New_York_def456.png"
+    
+    def test_find_cache_key_fuzzy_requires_all_words(self):
+        """Test fuzzy matching picks the first key containing every place word."""
+        embedder = EpubMapEmbedder()
+        
+        place_info = {"place": "Gulf of Mexico", "zoom": 6}
+        map_images = {
+            "Mexico_City_abc123.png": b"data1",
+            "gulf_mexico_def456.png": b"data2",
+            "Gulf_Mexico_coast_789abc.png": b"data3"
+        }
+        
+        cache_key = embedder._find_cache_key(place_info, map_images)
+        assert cache_key == "gulf_mexico_def456.png"
+
+    def test_find_cache_key_fuzzy_matches_substrings(self):
+        """Test fuzzy matching finds place words inside longer key words."""
+        embedder = EpubMapEmbedder()
+
+        map_images = {"Parisian_Quarter_abc123.png": b"data1"}
+
+        cache_key = embedder._find_cache_key({"place": "Paris"}, map_images)
+        assert cache_key == "Parisian_Quarter_abc123.png"
+    
     def test_find_cache_key_no_match(self):
         """Test finding cache key with no match."""
         embedder = EpubMapEmbedder()
@@ -320,6 +441,38 @@ class TestEpubMapEmbedder:
         # Check that images were embedded
         assert mock_book.add_item.call_count == 2
     
+    def test_embed_maps_serializes_each_document_once(self, mock_book):
+        """Test a chapter receiving several maps is written back once with all of them."""
+        embedder = EpubMapEmbedder()
+        item1 = mock_book.get_item_with_id("item1")
+        
+        ai_results = [
+            [{"place": "Rome", "zoom": 12}, {"place": "Venice", "zoom": 13}]
+        ]
+        map_images = {
+            "Rome_abc123.png": b"rome_image_data",
+            "Venice_def456.png": b"venice_image_data"
+        }
+        
+        with patch('src.embedder.embedder_core.etree.tostring',
+                   wraps=etree.tostring) as mock_tostring:
+            embedder.embed_maps(mock_book, ai_results, map_images)
+        
+        assert mock_tostring.call_count == 1
+        assert item1.content.count(b"<figure") == 2
+
+    def test_embed_maps_parses_each_document_once(self, mock_book):
+        """Test validation and paragraph indexing share one parse per document."""
+        embedder = EpubMapEmbedder()
+
+        with patch('src.embedder.embedder_core.etree.fromstring',
+                   wraps=etree.fromstring) as mock_fromstring:
+            embedder.embed_maps(mock_book, [[{"place": "Rome", "zoom": 12}]],
+                                {"Rome_abc123.png": b"rome_image_data"})
+
+        parsed = [call.args[0] for call in mock_fromstring.call_args_list]
+        assert len(parsed) == len(set(parsed)) == 2
+
     def test_embed_maps_missing_image(self, mock_book):
         """Test handling of missing map image."""
         embedder = EpubMapEmbedder()
@@ -347,7 +500,7 @@ class TestEpubMapEmbedder:
             1: (5, 9),
             2: (10, 14)
         }
-        embedder._paragraph_cache = {i: {} for i in range(15)}
+        embedder._para_elements = [None] * 15
         
         idx = embedder._chunk_to_paragraph_index(1, {"place": "Rome"})
         assert idx == 9  # End of chunk 1
@@ -356,7 +509,7 @@ class TestEpubMapEmbedder:
         """Test chunk to paragraph conversion with estimation."""
         embedder = EpubMapEmbedder()
         embedder._chunk_to_para_map = {}  # No explicit mapping
-        embedder._paragraph_cache = {i: {} for i in range(20)}
+        embedder._para_elements = [None] * 20
         
         idx = embedder._chunk_to_paragraph_index(2, {"place": "Rome"})
         # Should estimate based on distribution
@@ -4,6 +4,7 @@ Example usage of the embedder module with simplified paragraph-by-paragraph proc
 Ensures maps are placed directly after the paragraph that references them.
 """
 
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -18,10 +19,86 @@ from src.parser.epub_parser import EpubParser
 from src.parser.text_chunker import TextChunker
 from src.ai.openai_client import OpenAIClient
 from src.mapping.mapping_workflow import MappingOrchestrator
+from src.mapping.mapping_errors import RateLimitError
 from src.embedder.embedder_core import EpubMapEmbedder
 from src.embedder.embedder_config import EmbedderConfig
-from src.config.config_module import load_config, validate_config
-from src.config.logger_module import initialize_logger, log_info, log_error
+from src.config.config_module import get_config, load_config, validate_config
+from src.config.logger_module import initialize_logger, log_info, log_warning, log_error
+
+
+async def analyze_and_fetch_maps(ai_client: OpenAIClient,
+                                 orchestrator: MappingOrchestrator,
+                                 chunks: list) -> tuple:
+    """
+    Extract places and fetch their maps as one overlapping pipeline.
+    
+    Places are queued for fetching as soon as they stream out of a chunk's
+    analysis, so map downloads start while the model is still generating. Blocking map fetches run on worker threads; each unique map
+    is requested once.
+    
+    Args:
+        ai_client: Client used to analyze chunks
+        orchestrator: Orchestrator used to fetch maps
+        chunks: Text chunks to analyze
+        
+    Returns:
+        Tuple of (places per chunk in input order, cache_key -> cached image path)
+    """
+    places_q = asyncio.Queue()
+    chunk_results = [[] for _ in chunks]
+    map_images = {}
+    requested = set()
+    rate_limited = False
+    # A fixed pool of analyzers shares one iterator, so concurrency is bounded
+    # by the pool size alone rather than a task per chunk queued on a semaphore
+    pending_chunks = enumerate(chunks)
+    
+    async def analyze_worker():
+        for chunk_idx, chunk in pending_chunks:
+            try:
+                # Places are queued as they stream in, before the response completes
+                chunk_results[chunk_idx] = await ai_client.analyze_chunk_streaming(
+                    chunk, places_q.put_nowait
+                )
+            except Exception as e:
+                log_error(f"Failed to analyze chunk {chunk_idx}: {e}")
+    
+    async def fetch_worker():
+        nonlocal rate_limited
+        while True:
+            place_info = await places_q.get()
+            try:
+                key = orchestrator.request_key(place_info)
+                if rate_limited or key in requested:
+                    continue
+                requested.add(key)
+                
+                # Keep cache file paths rather than bytes; the embedder reads each once
+                cache_key, image = await asyncio.to_thread(
+                    orchestrator.get_map_path_for_entry, place_info
+                )
+                map_images[cache_key] = image
+            except RateLimitError as e:
+                log_error(f"Rate limit reached, skipping remaining map fetches: {e}")
+                rate_limited = True
+            except Exception as e:
+                log_warning(f"Failed to fetch map for '{place_info.get('place')}': {e}")
+            finally:
+                places_q.task_done()
+    
+    fetchers = [asyncio.create_task(fetch_worker()) for _ in range(orchestrator.max_workers)]
+    try:
+        await asyncio.gather(
+            *(analyze_worker() for _ in range(min(ai_client.max_concurrent, len(chunks))))
+        )
+        await places_q.join()
+    finally:
+        for fetcher in fetchers:
+            fetcher.cancel()
+        await asyncio.gather(*fetchers, return_exceptions=True)
+        await ai_client.aclose()
+    
+    return chunk_results, map_images
 
 
 def process_epub_with_maps(input_path: str, output_path: str):
@@ -37,45 +114,50 @@ def process_epub_with_maps(input_path: str, output_path: str):
         log_info(f"Loading EPUB: {input_path}")
         parser = EpubParser()
         parser.load_file(input_path)
-        paragraphs = parser.extract_text()
         book = parser.book  # Keep reference to epub object
         
         metadata = parser.get_metadata()
         log_info(f"Processing: {metadata['title']} by {', '.join(metadata['authors'])}")
-        log_info(f"Found {len(paragraphs)} paragraphs")
         
         # 2. Initialize components
         chunker = TextChunker()
-        ai_client = OpenAIClient()
+        ai_client = OpenAIClient(
+            cache_dir=get_config("OPENAI_CACHE_DIR", "./.cache_ai"),
+            rate_limit_state=get_config(
+                "OPENAI_RATE_LIMIT_STATE", "~/.cache/historicalmapper/ratelimit.json"
+            )
+        )
         orchestrator = MappingOrchestrator()
         
         # 3. Process each paragraph individually
-        log_info("Processing paragraphs individually for accurate map placement...")
+        log_info("Analyzing paragraphs concurrently for accurate map placement...")
+        
+        # Chunk paragraphs as they are parsed, remembering which paragraph each came from
+        chunks = []
+        chunk_to_paragraph = []
+        
+        for para_idx, chunk in chunker.iter_chunks_with_mapping(parser.iter_text(), 1000):
+            chunks.append(chunk)
+            chunk_to_paragraph.append(para_idx)
+        
+        # The parser only yields non-empty paragraphs, so each one has a chunk
+        num_paragraphs = chunk_to_paragraph[-1] + 1 if chunk_to_paragraph else 0
+        log_info(f"Found {num_paragraphs} paragraphs")
+        
+        # Analyze chunks and fetch maps as they are found; results come back in chunk order
+        chunk_results, map_images = asyncio.run(
+            analyze_and_fetch_maps(ai_client, orchestrator, chunks)
+        )
         
         # Structure AI results to match paragraph indices
-        ai_results_by_paragraph = []
+        ai_results_by_paragraph = [[] for _ in range(num_paragraphs)]
         all_places = []
         
-        for para_idx, paragraph in enumerate(paragraphs):
-            if not paragraph.strip():
-                ai_results_by_paragraph.append([])
-                continue
-            
-            # Check if paragraph needs to be chunked
-            if len(paragraph) <= 1000:
-                # Process paragraph as-is
-                places = ai_client.analyze_chunk(paragraph)
-            else:
-                # Split large paragraph and combine results
-                chunks = chunker._split_paragraph_by_sentences(paragraph, 1000)
-                places = []
-                for chunk in chunks:
-                    chunk_places = ai_client.analyze_chunk(chunk)
-                    places.extend(chunk_places)
-            
-            ai_results_by_paragraph.append(places)
+        for chunk_idx, places in enumerate(chunk_results):
+            ai_results_by_paragraph[chunk_to_paragraph[chunk_idx]].extend(places)
             all_places.extend(places)
-            
+        
+        for para_idx, places in enumerate(ai_results_by_paragraph):
             if places:
                 log_info(f"Paragraph {para_idx}: Found {len(places)} places")
         
@@ -87,9 +169,7 @@ def process_epub_with_maps(input_path: str, output_path: str):
             log_info("No places found to map")
             return
         
-        # 4. Get maps for all places at once (for efficiency)
-        log_info("Fetching maps from Google Maps...")
-        map_images = orchestrator.batch_get_maps(all_places)
+        # 4. Maps were fetched alongside the analysis
         log_info(f"Retrieved {len(map_images)} map images")
         
         # 5. Configure embedder
@@ -101,7 +181,7 @@ def process_epub_with_maps(input_path: str, output_path: str):
         
         # 6. Create exact paragraph mapping for embedder
         # This ensures each map is placed after its source paragraph
-        chunk_info = [(i, i) for i in range(len(paragraphs))]
+        chunk_info = [(i, i) for i in range(num_paragraphs)]
         
         # 7. Embed maps into EPUB
         log_info("Embedding maps into EPUB...")
@@ -112,6 +192,8 @@ def process_epub_with_maps(input_path: str, output_path: str):
             map_images=map_images,
             chunk_info=chunk_info  # Direct paragraph mapping
         )
+        maps_retrieved = len(map_images)
+        del map_images  # Images now live in the book
         
         # 8. Save enhanced EPUB
         log_info(f"Saving enhanced EPUB to: {output_path}")
@@ -124,10 +206,10 @@ def process_epub_with_maps(input_path: str, output_path: str):
         paragraphs_with_places = sum(1 for places in ai_results_by_paragraph if places)
         
         print(f"\n📊 Statistics:")
-        print(f"  - Paragraphs processed: {len(paragraphs)}")
+        print(f"  - Paragraphs processed: {num_paragraphs}")
         print(f"  - Paragraphs with places: {paragraphs_with_places}")
         print(f"  - Places identified: {total_places}")
-        print(f"  - Maps embedded: {len(map_images)}")
+        print(f"  - Maps embedded: {maps_retrieved}")
         print(f"  - Cache usage: {cache_stats['cache']['usage_percent']:.1f}%")
         
     except Exception as e:
@@ -145,42 +227,40 @@ def process_epub_batch_optimized(input_path: str, output_path: str):
         log_info(f"Loading EPUB: {input_path}")
         parser = EpubParser()
         parser.load_file(input_path)
-        paragraphs = parser.extract_text()
         book = parser.book
         
         metadata = parser.get_metadata()
         log_info(f"Processing: {metadata['title']} by {', '.join(metadata['authors'])}")
-        log_info(f"Found {len(paragraphs)} paragraphs")
         
         # 2. Create chunks but track paragraph boundaries
         log_info("Creating chunks with paragraph tracking...")
         chunks = []
         chunk_to_paragraph = []  # Maps chunk index to paragraph index
         
-        for para_idx, paragraph in enumerate(paragraphs):
-            if not paragraph.strip():
-                continue
-                
-            if len(paragraph) <= 1000:
-                chunks.append(paragraph)
-                chunk_to_paragraph.append(para_idx)
-            else:
-                # Split large paragraph
-                chunker = TextChunker()
-                para_chunks = chunker._split_paragraph_by_sentences(paragraph, 1000)
-                for chunk in para_chunks:
-                    chunks.append(chunk)
-                    chunk_to_paragraph.append(para_idx)
-        
-        log_info(f"Created {len(chunks)} chunks from {len(paragraphs)} paragraphs")
+        chunker = TextChunker()
+        for para_idx, chunk in chunker.iter_chunks_with_mapping(parser.iter_text(), 1000):
+            chunks.append(chunk)
+            chunk_to_paragraph.append(para_idx)
+        
+        # The parser only yields non-empty paragraphs, so each one has a chunk
+        num_paragraphs = chunk_to_paragraph[-1] + 1 if chunk_to_paragraph else 0
+        log_info(f"Created {len(chunks)} chunks from {num_paragraphs} paragraphs")
         
         # 3. Batch process chunks through AI
-        log_info("Extracting place names using AI...")
-        ai_client = OpenAIClient()
-        ai_chunk_results = ai_client.batch_analyze_chunks(chunks)
+        log_info("Extracting place names using AI and fetching maps...")
+        ai_client = OpenAIClient(
+            cache_dir=get_config("OPENAI_CACHE_DIR", "./.cache_ai"),
+            rate_limit_state=get_config(
+                "OPENAI_RATE_LIMIT_STATE", "~/.cache/historicalmapper/ratelimit.json"
+            )
+        )
+        orchestrator = MappingOrchestrator()
+        ai_chunk_results, map_images = asyncio.run(
+            analyze_and_fetch_maps(ai_client, orchestrator, chunks)
+        )
         
         # 4. Reorganize results by paragraph
-        ai_results_by_paragraph = [[] for _ in range(len(paragraphs))]
+        ai_results_by_paragraph = [[] for _ in range(num_paragraphs)]
         all_places = []
         
         for chunk_idx, places in enumerate(ai_chunk_results):
@@ -195,10 +275,7 @@ def process_epub_batch_optimized(input_path: str, output_path: str):
             log_info("No places found to map")
             return
         
-        # 5. Get maps
-        log_info("Fetching maps from Google Maps...")
-        orchestrator = MappingOrchestrator()
-        map_images = orchestrator.batch_get_maps(all_places)
+        # 5. Maps were fetched alongside the analysis
         log_info(f"Retrieved {len(map_images)} map images")
         
         # 6. Configure and embed
@@ -209,7 +286,7 @@ def process_epub_batch_optimized(input_path: str, output_path: str):
         )
         
         # Create direct paragraph mapping
-        chunk_info = [(i, i) for i in range(len(paragraphs))]
+        chunk_info = [(i, i) for i in range(num_paragraphs)]
         
         log_info("Embedding maps into EPUB...")
         embedder = EpubMapEmbedder(config=config)
@@ -219,6 +296,8 @@ def process_epub_batch_optimized(input_path: str, output_path: str):
             map_images=map_images,
             chunk_info=chunk_info
         )
+        maps_retrieved = len(map_images)
+        del map_images  # Images now live in the book
         
         # 7. Save
         log_info(f"Saving enhanced EPUB to: {output_path}")
@@ -231,10 +310,10 @@ def process_epub_batch_optimized(input_path: str, output_path: str):
         paragraphs_with_places = sum(1 for places in ai_results_by_paragraph if places)
         
         print(f"\n📊 Statistics:")
-        print(f"  - Paragraphs processed: {len(paragraphs)}")
+        print(f"  - Paragraphs processed: {num_paragraphs}")
         print(f"  - Paragraphs with places: {paragraphs_with_places}")
         print(f"  - Places identified: {total_places}")
-        print(f"  - Maps embedded: {len(map_images)}")
+        print(f"  - Maps embedded: {maps_retrieved}")
         print(f"  - Cache usage: {cache_stats['cache']['usage_percent']:.1f}%")
         
     except Exception as e:
@@ -245,7 +324,7 @@ def process_epub_batch_optimized(input_path: str, output_path: str):
 def main():
     """Run the EPUB processor."""
     # Initialize logging
-    initialize_logger(log_level="INFO")
+    initialize_logger(log_level="INFO", queued=True, skip_record_details=True)
     
     # Load configuration
     load_config()
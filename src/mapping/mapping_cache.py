@@ -6,17 +6,84 @@ key generation, and robust error handling.
 """
 
 import hashlib
+import io
 import os
 import re
 import time
+import unicodedata
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from PIL import Image
+
 from ..config.config_module import get_config
-from ..config.logger_module import log_info, log_warning, log_error
+from ..config.logger_module import log_debug, log_info, log_warning, log_error
 from .mapping_errors import CacheError
 
 
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Zoom levels maps are fetched and cached at; requested zooms snap to the nearest
+ZOOM_TIERS = (3, 5, 7, 10, 13, 16)
+
+
+def quantize_zoom(zoom: int) -> int:
+    """
+    Snap a zoom level to the nearest cached tier (ties go to the wider view).
+    
+    Models return slightly different zooms for the same place across runs
+    (e.g. 11 vs 10 for a city); snapping lets those share one map.
+    """
+    return min(ZOOM_TIERS, key=lambda tier: (abs(tier - zoom), tier))
+
+
+def canonical_place(place: str) -> str:
+    """
+    Canonicalize a place name for cache hashing.
+    
+    Normalizes Unicode (NFKD), case and surrounding whitespace, and drops
+    a leading "the ", so "The Hague" and "the hague " hash alike.
+    """
+    name = unicodedata.normalize("NFKD", place).casefold().strip()
+    if name.startswith("the "):
+        name = name[4:].lstrip()
+    return name
+
+
+def optimize_png(data: bytes, colors: int = 64) -> bytes:
+    """
+    Re-encode a PNG map as an optimized palette PNG.
+    
+    Static map tiles use few distinct colors, so an adaptive palette
+    shrinks them considerably with no visible loss.
+    
+    Args:
+        data: Raw image bytes
+        colors: Palette size for the re-encoded image
+        
+    Returns:
+        The re-encoded bytes if smaller, otherwise the original bytes
+        (including for non-PNG or undecodable input)
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            palette_img = img.convert("RGB").convert(
+                "P", palette=Image.Palette.ADAPTIVE, colors=colors
+            )
+        
+        out = io.BytesIO()
+        palette_img.save(out, "PNG", optimize=True)
+        optimized = out.getvalue()
+    except Exception as e:
+        log_warning(f"PNG optimization failed, keeping original: {e}")
+        return data
+    
+    return optimized if len(optimized) < len(data) else data
+
+
 class ImageCacheManager:
     """
     Caches raw image bytes in a local directory with TTL, size management, 
@@ -73,6 +140,8 @@ class ImageCacheManager:
         2. Collision resistance via cryptographic hashing
         3. Fixed length filenames
         4. Cross-platform compatibility
+        5. Equivalent requests (case/Unicode variants of the place, zooms
+           in the same tier) share a key, readable prefix included
         
         Args:
             place: Place name
@@ -83,8 +152,10 @@ class ImageCacheManager:
         Returns:
             Safe cache key like "safe_place_name_<32-char-hash>.png"
         """
-        # Combine all parameters with pipe separator
-        content = f"{place}|{zoom}|{size}|{map_type}"
+        # Combine all parameters with pipe separator, canonicalizing the
+        # place and zoom so equivalent requests share an entry
+        place = canonical_place(place)
+        content = f"{place}|{quantize_zoom(zoom)}|{size}|{map_type}"
         
         # Generate MD5 hash for collision resistance
         hash_key = hashlib.md5(content.encode('utf-8')).hexdigest()
@@ -274,7 +345,7 @@ class ImageCacheManager:
         cache_path = self._cache_path(cache_key)
         
         if not cache_path.exists():
-            log_info(f"Cache miss: {cache_key} not found")
+            log_debug("Cache miss: %s not found", cache_key)
             return None
         
         try:
@@ -302,6 +373,42 @@ class ImageCacheManager:
             log_error(f"Failed to read cache file {cache_key}: {e}")
             raise CacheError(f"Failed to read cache file: {e}")
 
+    def get_cached_path(self, 
+                        place: str, 
+                        zoom: int, 
+                        size: str, 
+                        map_type: str = "roadmap") -> Optional[Path]:
+        """
+        Get the path of a cached image if available and not expired.
+        
+        Unlike get_cached_bytes, the file is not read, so callers can
+        defer loading the image until it is needed.
+        
+        Args:
+            place: Place name
+            zoom: Zoom level
+            size: Map size
+            map_type: Type of map
+            
+        Returns:
+            Path to the cached file if available and valid, None otherwise
+        """
+        cache_key = self._generate_cache_key(place, zoom, size, map_type)
+        cache_path = self._cache_path(cache_key)
+        
+        try:
+            age = time.time() - cache_path.stat().st_mtime
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            log_warning(f"Failed to stat cache file {cache_key}: {e}")
+            return None
+        
+        if age > self.ttl:
+            return None
+        
+        return cache_path
+
     def get_cache_stats(self) -> Dict[str, float]:
         """
         Get cache statistics.
@@ -8,10 +8,11 @@ with built-in rate limiting and error handling.
 from typing import Dict, Optional
 import googlemaps
 import requests
+from requests.adapters import HTTPAdapter
 from urllib.parse import urlencode
 
 from ..config.config_module import get_config
-from ..config.logger_module import log_info, log_error
+from ..config.logger_module import log_debug, log_info, log_error
 from .mapping_errors import GeocodingError, MapFetchError, RateLimitError
 from .mapping_rate_limiter import TokenBucketRateLimiter
 
@@ -32,7 +33,8 @@ class GoogleMapsClient:
                  api_key: str = None,
                  rate_limit_per_sec: float = 5.0,
                  burst_capacity: int = 10,
-                 request_timeout: int = 30):
+                 request_timeout: int = 30,
+                 pool_size: int = 32):
         """
         Initialize the Google Maps client.
         
@@ -41,6 +43,8 @@ class GoogleMapsClient:
             rate_limit_per_sec: Throttle outgoing requests
             burst_capacity: Max burst requests allowed
             request_timeout: HTTP request timeout in seconds
+            pool_size: Keep-alive connections kept per host, so concurrent
+                       workers reuse TLS connections
         """
         # Get API key from config if not provided
         self.api_key = api_key or get_config("GOOGLE_MAPS_API_KEY")
@@ -55,14 +59,16 @@ class GoogleMapsClient:
             burst_capacity=burst_capacity
         )
         
-        # Initialize Google Maps client
-        self._gmaps = googlemaps.Client(key=self.api_key)
-        
-        # Initialize requests session for static maps
+        # Initialize a pooled requests session shared by geocoding and static maps
         self._session = requests.Session()
         self._session.headers.update({
             'User-Agent': 'HistoricalEpubMapEnhancer/1.0'
         })
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('https://', adapter)
+        
+        # Initialize Google Maps client
+        self._gmaps = googlemaps.Client(key=self.api_key, requests_session=self._session)
         
         log_info(
             f"GoogleMapsClient initialized (rate_limit={rate_limit_per_sec}/sec)"
@@ -93,7 +99,7 @@ class GoogleMapsClient:
             raise
         
         try:
-            log_info(f"Geocoding place: {place}")
+            log_debug("Geocoding place: %s", place)
             
             # Call Google Maps geocoding API
             results = self._gmaps.geocode(place)
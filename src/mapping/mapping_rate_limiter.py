@@ -1,10 +1,11 @@
 """
 Token bucket rate limiter for API requests.
 
-Implements a single-threaded token bucket algorithm with exponential backoff
+Implements a thread-safe token bucket algorithm with exponential backoff
 to prevent API quota exhaustion and handle rate limiting gracefully.
 """
 
+import threading
 import time
 from typing import Optional
 
@@ -14,11 +15,14 @@ from .mapping_errors import RateLimitError
 
 class TokenBucketRateLimiter:
     """
-    Token bucket rate limiter for API requests (single-threaded).
+    Token bucket rate limiter for API requests (thread-safe).
     
     The token bucket algorithm allows for burst traffic while maintaining
     an average rate over time. Tokens are added at a constant rate, and
     requests consume tokens. If no tokens are available, requests wait.
+    
+    Bucket state is guarded by a lock so one limiter can be shared by
+    worker threads; waiting (sleep) happens outside the lock.
     """
 
     def __init__(self, 
@@ -43,6 +47,7 @@ class TokenBucketRateLimiter:
         # Initialize bucket with full capacity
         self.tokens = float(burst_capacity)
         self.last_update = time.time()
+        self._lock = threading.Lock()
         
         log_info(
             f"RateLimiter initialized: {rate_per_second}/sec, "
@@ -50,7 +55,7 @@ class TokenBucketRateLimiter:
         )
 
     def _refill_tokens(self) -> None:
-        """Refill tokens based on elapsed time."""
+        """Refill tokens based on elapsed time. Caller must hold the lock."""
         current_time = time.time()
         elapsed = current_time - self.last_update
         
@@ -69,12 +74,13 @@ class TokenBucketRateLimiter:
         Returns:
             True if successful, False if rate limited
         """
-        self._refill_tokens()
-        
-        if self.tokens >= tokens_needed:
-            self.tokens -= tokens_needed
-            return True
-        return False
+        with self._lock:
+            self._refill_tokens()
+            
+            if self.tokens >= tokens_needed:
+                self.tokens -= tokens_needed
+                return True
+            return False
 
     def wait_for_token(self, tokens_needed: int = 1) -> None:
         """
@@ -93,8 +99,9 @@ class TokenBucketRateLimiter:
                 return
             
             # Calculate time needed to accumulate required tokens
-            self._refill_tokens()
-            tokens_deficit = tokens_needed - self.tokens
+            with self._lock:
+                self._refill_tokens()
+                tokens_deficit = tokens_needed - self.tokens
             
             if tokens_deficit > 0:
                 # Time to wait for required tokens
@@ -120,8 +127,9 @@ class TokenBucketRateLimiter:
 
     def get_available_tokens(self) -> float:
         """Get current number of available tokens."""
-        self._refill_tokens()
-        return self.tokens
+        with self._lock:
+            self._refill_tokens()
+            return self.tokens
 
     def get_wait_time(self, tokens_needed: int = 1) -> float:
         """
@@ -133,10 +141,11 @@ class TokenBucketRateLimiter:
         Returns:
             Estimated wait time in seconds (0 if tokens available)
         """
-        self._refill_tokens()
+        with self._lock:
+            self._refill_tokens()
+            tokens_deficit = tokens_needed - self.tokens
         
-        if self.tokens >= tokens_needed:
+        if tokens_deficit <= 0:
             return 0.0
         
-        tokens_deficit = tokens_needed - self.tokens
         return tokens_deficit / self.rate_per_second
\ No newline at end of file
@@ -5,10 +5,12 @@ Coordinates geocoding, caching, and map fetching for single places
 or batches, providing a simple interface for the rest of the application.
 """
 
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
 
-from ..config.logger_module import log_info, log_warning, log_error
-from .mapping_cache import ImageCacheManager
+from ..config.logger_module import log_debug, log_info, log_warning, log_error
+from .mapping_cache import ImageCacheManager, canonical_place, optimize_png, quantize_zoom
 from .mapping_client import GoogleMapsClient
 from .mapping_errors import CacheError, GeocodingError, MapFetchError, RateLimitError
 
@@ -27,7 +29,9 @@ class MappingOrchestrator:
                  maps_client: GoogleMapsClient = None,
                  cache_manager: ImageCacheManager = None,
                  default_zoom: int = 12,
-                 default_size: str = "600x400"):
+                 default_size: str = "600x400",
+                 max_workers: int = 10,
+                 image_colors: int = 64):
         """
         Initialize the orchestrator.
         
@@ -36,15 +40,21 @@ class MappingOrchestrator:
             cache_manager: Cache manager instance
             default_zoom: Default zoom level for maps
             default_size: Default map size
+            max_workers: Worker threads used to fetch maps concurrently in batches
+            image_colors: Palette size fetched PNGs are re-encoded to before
+                          caching; 0 keeps images as fetched
         """
         self.client = maps_client or GoogleMapsClient()
         self.cache = cache_manager or ImageCacheManager()
         self.default_zoom = default_zoom
         self.default_size = default_size
+        self.max_workers = max_workers
+        self.image_colors = image_colors
         
         log_info(
             f"MappingOrchestrator initialized "
-            f"(default_zoom={default_zoom}, default_size={default_size})"
+            f"(default_zoom={default_zoom}, default_size={default_size}, "
+            f"max_workers={max_workers})"
         )
 
     def get_map_for_place(self,
@@ -56,11 +66,13 @@ class MappingOrchestrator:
         Get map image for a single place, using cache when possible.
         
         Workflow:
-        1. Check cache for existing image
+        1. Check cache for existing image (at the zoom's tier, then the
+           tiers of zoom ± 1)
         2. If not cached:
            a. Geocode the place name
            b. Fetch map image from Google Maps
-           c. Cache the image
+           c. Re-encode it as a palette PNG (if image_colors is set)
+           d. Cache the image
         3. Return image bytes
         
         Args:
@@ -78,8 +90,9 @@ class MappingOrchestrator:
             CacheError: If caching fails (non-fatal, logged)
             RateLimitError: If rate limit exceeded
         """
-        # Use defaults if not specified
-        zoom = zoom or self.default_zoom
+        # Use defaults if not specified, snapping zoom to a cached tier
+        requested_zoom = zoom or self.default_zoom
+        zoom = quantize_zoom(requested_zoom)
         size = size or self.default_size
         
         log_info(
@@ -87,14 +100,22 @@ class MappingOrchestrator:
             f"(zoom={zoom}, size={size}, type={map_type})"
         )
         
-        # Step 1: Check cache
-        try:
-            cached_data = self.cache.get_cached_bytes(place, zoom, size, map_type)
-            if cached_data is not None:
-                return cached_data
-        except CacheError as e:
-            # Cache errors are non-fatal, log and continue
-            log_warning(f"Cache read error (continuing): {e}")
+        # Step 1: Check cache, falling back to the tiers of the adjacent
+        # zooms before paying for an API call
+        fallback_zooms = [
+            tier for tier in dict.fromkeys(
+                quantize_zoom(z) for z in (requested_zoom - 1, requested_zoom + 1)
+            )
+            if tier != zoom
+        ]
+        for lookup_zoom in [zoom] + fallback_zooms:
+            try:
+                cached_data = self.cache.get_cached_bytes(place, lookup_zoom, size, map_type)
+                if cached_data is not None:
+                    return cached_data
+            except CacheError as e:
+                # Cache errors are non-fatal, log and continue
+                log_warning(f"Cache read error (continuing): {e}")
         
         # Step 2: Geocode place
         try:
@@ -119,7 +140,11 @@ class MappingOrchestrator:
             )
             raise
         
-        # Step 4: Cache the image (non-fatal if fails)
+        # Step 4: Shrink the image once, so cache and EPUB get the small copy
+        if self.image_colors:
+            image_data = optimize_png(image_data, self.image_colors)
+        
+        # Step 5: Cache the image (non-fatal if fails)
         try:
             cache_key = self.cache.cache_bytes(
                 place, zoom, size, image_data, map_type
@@ -135,8 +160,10 @@ class MappingOrchestrator:
         """
         Process multiple places and return mapping from cache keys to bytes.
         
-        Processes places sequentially to respect rate limiting naturally.
-        Continues on individual failures, logging errors.
+        Places are fetched concurrently on a thread pool of max_workers;
+        the client's shared token bucket still paces outgoing requests.
+        Entries resolving to the same (place, zoom, size, map_type) are
+        fetched once. Continues on individual failures, logging errors.
         
         Args:
             places: List of place dictionaries with keys:
@@ -167,7 +194,10 @@ class MappingOrchestrator:
         results = {}
         success_count = 0
         error_count = 0
+        total = len(places)
         
+        # Coalesce repeated mentions so each unique map is requested once
+        unique = {}
         for i, entry in enumerate(places, 1):
             # Validate entry
             if not isinstance(entry, dict) or "place" not in entry:
@@ -177,51 +207,50 @@ class MappingOrchestrator:
                 error_count += 1
                 continue
             
-            place = entry["place"]
+            unique.setdefault(self.request_key(entry), (i, entry))
+        
+        if len(unique) < total:
+            log_info(f"Fetching {len(unique)} unique maps for {total} entries")
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {}
+            for i, entry in unique.values():
+                futures[executor.submit(self.get_map_for_entry, entry)] = (i, entry["place"])
             
-            try:
-                # Get map image
-                image_data = self.get_map_for_place(
-                    place=place,
-                    zoom=entry.get("zoom", self.default_zoom),
-                    size=entry.get("size", self.default_size),
-                    map_type=entry.get("map_type", "roadmap")
-                )
-                
-                # Generate cache key for consistency
-                cache_key = self.cache._generate_cache_key(
-                    place=place,
-                    zoom=entry.get("zoom", self.default_zoom),
-                    size=entry.get("size", self.default_size),
-                    map_type=entry.get("map_type", "roadmap")
-                )
-                
-                results[cache_key] = image_data
-                success_count += 1
+            for future in as_completed(futures):
+                i, place = futures[future]
                 
-                log_info(
-                    f"Processed {i}/{len(places)}: '{place}' -> {cache_key}"
-                )
-                
-            except (GeocodingError, MapFetchError, RateLimitError) as e:
-                log_error(
-                    f"Failed to process place {i}/{len(places)} '{place}': {e}"
-                )
-                error_count += 1
+                try:
+                    cache_key, image_data = future.result()
+                    
+                    results[cache_key] = image_data
+                    success_count += 1
+                    
+                    log_info(
+                        f"Processed {i}/{total}: '{place}' -> {cache_key}"
+                    )
+                    
+                except (GeocodingError, MapFetchError, RateLimitError) as e:
+                    log_error(
+                        f"Failed to process place {i}/{total} '{place}': {e}"
+                    )
+                    error_count += 1
+                    
+                    # Decide whether to continue or propagate based on error type
+                    if isinstance(e, RateLimitError):
+                        # Rate limit errors might affect all subsequent requests
+                        log_error("Rate limit reached, stopping batch processing")
+                        for pending in futures:
+                            pending.cancel()
+                        break
+                    # Other errors are per-place, continue processing
                 
-                # Decide whether to continue or propagate based on error type
-                if isinstance(e, RateLimitError):
-                    # Rate limit errors might affect all subsequent requests
-                    log_error("Rate limit reached, stopping batch processing")
-                    break
-                # Other errors are per-place, continue processing
-            
-            except Exception as e:
-                # Unexpected errors
-                log_error(
-                    f"Unexpected error processing '{place}': {e}"
-                )
-                error_count += 1
+                except Exception as e:
+                    # Unexpected errors
+                    log_error(
+                        f"Unexpected error processing '{place}': {e}"
+                    )
+                    error_count += 1
         
         log_info(
             f"Batch processing complete: "
@@ -230,6 +259,109 @@ class MappingOrchestrator:
         
         return results
 
+    def request_key(self, entry: Dict[str, Any]) -> Tuple[str, int, str, str]:
+        """
+        Identify the map a place entry resolves to, with defaults applied.
+        
+        Entries with equal keys produce the same map and cache key. The
+        place is canonicalized and zoom snapped to its cached tier, as in
+        the cache key.
+        
+        Args:
+            entry: Place dictionary as accepted by batch_get_maps
+            
+        Returns:
+            Tuple of (canonical place, zoom tier, size, map_type)
+        """
+        place, zoom, size, map_type = self._entry_params(entry)
+        return canonical_place(place), quantize_zoom(zoom), size, map_type
+
+    def _entry_params(self, entry: Dict[str, Any]) -> Tuple[str, int, str, str]:
+        """Get (place, zoom, size, map_type) from an entry, with defaults applied."""
+        return (
+            entry["place"],
+            entry.get("zoom", self.default_zoom),
+            entry.get("size", self.default_size),
+            entry.get("map_type", "roadmap")
+        )
+
+    def get_map_for_entry(self, entry: Dict[str, Any]) -> Tuple[str, bytes]:
+        """
+        Fetch (or load from cache) the map for one place entry.
+        
+        Safe to call from worker threads; batch_get_maps runs it on its pool.
+        
+        Args:
+            entry: Place dictionary as accepted by batch_get_maps
+            
+        Returns:
+            Tuple of (cache_key, image bytes)
+            
+        Raises:
+            GeocodingError, MapFetchError, RateLimitError: As get_map_for_place
+        """
+        place, zoom, size, map_type = self._entry_params(entry)
+        
+        # Get map image
+        image_data = self.get_map_for_place(
+            place=place,
+            zoom=zoom,
+            size=size,
+            map_type=map_type
+        )
+        
+        # Generate cache key for consistency
+        cache_key = self.cache._generate_cache_key(
+            place=place,
+            zoom=zoom,
+            size=size,
+            map_type=map_type
+        )
+        
+        return cache_key, image_data
+
+    def get_map_path_for_entry(self, entry: Dict[str, Any]) -> Tuple[str, Union[Path, bytes]]:
+        """
+        Fetch the map for one place entry, returning its cache file path.
+        
+        The image bytes are left on disk so callers do not hold every map
+        in memory. If the fetched map could not be written to the cache,
+        its bytes are returned instead.
+        
+        Args:
+            entry: Place dictionary as accepted by batch_get_maps
+            
+        Returns:
+            Tuple of (cache_key, path to the cached image or image bytes)
+            
+        Raises:
+            GeocodingError, MapFetchError, RateLimitError: As get_map_for_place
+        """
+        place, zoom, size, map_type = self._entry_params(entry)
+        cache_key = self.cache._generate_cache_key(
+            place=place,
+            zoom=zoom,
+            size=size,
+            map_type=map_type
+        )
+        
+        cache_path = self.cache.get_cached_path(place, zoom, size, map_type)
+        if cache_path is not None:
+            log_debug("Cache hit: %s (path only)", cache_key)
+            return cache_key, cache_path
+        
+        image_data = self.get_map_for_place(
+            place=place,
+            zoom=zoom,
+            size=size,
+            map_type=map_type
+        )
+        
+        cache_path = self.cache.get_cached_path(place, zoom, size, map_type)
+        if cache_path is None:
+            return cache_key, image_data
+        return cache_key, cache_path
+
     def get_stats(self) -> Dict[str, Any]:
         """
         Get combined statistics from cache and rate limiter.
@@ -28,7 +28,7 @@ from .mapping_errors import (
 )
 from .mapping_rate_limiter import TokenBucketRateLimiter
 from .mapping_client import GoogleMapsClient
-from .mapping_cache import ImageCacheManager
+from .mapping_cache import ImageCacheManager, optimize_png, quantize_zoom
 from .mapping_workflow import MappingOrchestrator
 
 
@@ -151,6 +151,21 @@ class TestTokenBucketRateLimiter:
         # Should fail
         assert limiter.acquire(1) is False
     
+    @patch('src.mapping.mapping_rate_limiter.time.time')
+    def test_acquire_thread_safe(self, mock_time):
+        """Test concurrent acquisitions never overdraw the bucket."""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        # Freeze time so no tokens are refilled during the test
+        mock_time.return_value = 0.0
+        limiter = TokenBucketRateLimiter(rate_per_second=1.0, burst_capacity=10)
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            granted = list(executor.map(lambda _: limiter.acquire(1), range(50)))
+        
+        assert granted.count(True) == 10
+        assert limiter.tokens == 0.0
+    
     @patch('src.mapping.mapping_rate_limiter.time.time')
     def test_token_refill(self, mock_time):
         """Test token refilling over time."""
@@ -258,14 +273,27 @@ class TestGoogleMapsClient:
         
         assert client.api_key == "test_api_key"
         assert client.request_timeout == 60
-        mock_gmaps.assert_called_once_with(key="test_api_key")
+        mock_gmaps.assert_called_once_with(
+            key="test_api_key", requests_session=client._session
+        )
     
     @patch('src.mapping.mapping_client.googlemaps.Client')
     def test_initialization_with_api_key(self, mock_gmaps):
         """Test initialization with provided API key."""
         client = GoogleMapsClient(api_key="provided_key")
         assert client.api_key == "provided_key"
-        mock_gmaps.assert_called_once_with(key="provided_key")
+        mock_gmaps.assert_called_once_with(
+            key="provided_key", requests_session=client._session
+        )
+    
+    @patch('src.mapping.mapping_client.googlemaps.Client')
+    def test_initialization_connection_pool(self, mock_gmaps):
+        """Test the shared session keeps a pool sized for concurrent workers."""
+        client = GoogleMapsClient(api_key="provided_key", pool_size=16)
+        
+        adapter = client._session.get_adapter("https://maps.googleapis.com")
+        assert adapter._pool_connections == 16
+        assert adapter._pool_maxsize == 16
     
     @patch('src.mapping.mapping_client.googlemaps.Client')
     @patch('src.mapping.mapping_client.get_config')
@@ -430,7 +458,7 @@ class TestImageCacheManager:
         # Test basic key generation
         key1 = cache._generate_cache_key("Istanbul", 12, "600x400", "roadmap")
         assert key1.endswith(".png")
-        assert "Istanbul" in key1
+        assert key1.startswith("istanbul_")
         assert len(key1) > 20  # Has hash component
         
         # Test different parameters produce different keys
@@ -439,8 +467,8 @@ class TestImageCacheManager:
         
         # Test special characters handling
         key3 = cache._generate_cache_key("São Paulo, Brazil", 12, "600x400", "roadmap")
-        # Now uses ASCII-only pattern, so ã becomes _
-        assert "S_o_Paulo__Brazil" in key3
+        # Now uses ASCII-only pattern on the NFKD form, so ã's tilde becomes _
+        assert key3.startswith("sa_o_paulo__brazil_")
         assert key3.endswith(".png")
         
         # Test consistency
@@ -450,7 +478,7 @@ class TestImageCacheManager:
         # Test with more special characters
         key5 = cache._generate_cache_key("New York, NY (USA)", 10, "800x600", "satellite")
         # Parentheses, spaces, and commas should be replaced with underscores
-        assert key5.startswith("New_York__NY__USA_")
+        assert key5.startswith("new_york__ny__usa_")
         assert key5.endswith(".png")
         # Verify no unsafe characters remain
         assert not any(char in key5 for char in ['(', ')', ' ', ',', 'ã'])
@@ -461,7 +489,25 @@ class TestImageCacheManager:
         # Same place and params but different map type should produce different keys
         assert key6 != key7
         # But the prefix should be the same
-        assert key6.split('_')[0] == key7.split('_')[0] == "London"
+        assert key6.split('_')[0] == key7.split('_')[0] == "london"
+    
+    def test_cache_key_canonicalization(self, temp_cache_dir):
+        """Test equivalent places and zooms in the same tier share a key."""
+        cache = ImageCacheManager(cache_dir=str(temp_cache_dir))
+        
+        key = cache._generate_cache_key("The Hague", 10, "600x400", "roadmap")
+        assert cache._generate_cache_key("the hague ", 10, "600x400", "roadmap") == key
+        assert cache._generate_cache_key("The Hague", 11, "600x400", "roadmap") == key
+        assert cache._generate_cache_key("The Hague", 12, "600x400", "roadmap") != key
+        
+        # Readable prefix is built from the canonical name too
+        assert key.startswith("hague_")
+    
+    def test_quantize_zoom(self):
+        """Test zooms snap to the nearest tier, ties to the wider view."""
+        assert [quantize_zoom(z) for z in (1, 4, 10, 11, 12, 14, 15, 18)] == [
+            3, 3, 10, 10, 13, 13, 16, 16
+        ]
     
     def test_cache_and_retrieve_bytes(self, temp_cache_dir):
         """Test caching and retrieving bytes."""
@@ -477,6 +523,44 @@ class TestImageCacheManager:
         retrieved = cache.get_cached_bytes("Venice", 12, "600x400")
         assert retrieved == test_data
     
+    def test_get_cached_path(self, temp_cache_dir):
+        """Test cached files can be located without reading them."""
+        cache = ImageCacheManager(cache_dir=str(temp_cache_dir), ttl_seconds=3600)
+        
+        assert cache.get_cached_path("Venice", 12, "600x400") is None
+        
+        cache_key = cache.cache_bytes("Venice", 12, "600x400", b"TEST_IMAGE_DATA")
+        path = cache.get_cached_path("Venice", 12, "600x400")
+        
+        assert path == temp_cache_dir / cache_key
+        assert path.read_bytes() == b"TEST_IMAGE_DATA"
+        
+        # Expired entries are treated as missing
+        cache.ttl = -1
+        assert cache.get_cached_path("Venice", 12, "600x400") is None
+    
+    def test_optimize_png(self):
+        """Test PNGs are re-encoded smaller and other data passes through."""
+        import io
+        from PIL import Image
+        
+        # Noisy gradient so the default RGB encoding is larger than a palette
+        img = Image.new("RGB", (200, 150))
+        img.putdata([((x * 7) % 256, (y * 5) % 256, (x * y) % 256)
+                     for y in range(150) for x in range(200)])
+        buf = io.BytesIO()
+        img.save(buf, "PNG")
+        original = buf.getvalue()
+        
+        optimized = optimize_png(original, colors=16)
+        
+        assert len(optimized) < len(original)
+        with Image.open(io.BytesIO(optimized)) as result:
+            assert result.mode == "P"
+            assert result.size == (200, 150)
+        
+        assert optimize_png(b"NOT_A_PNG") == b"NOT_A_PNG"
+    
     def test_cache_miss(self, temp_cache_dir):
         """Test cache miss for non-existent data."""
         cache = ImageCacheManager(cache_dir=str(temp_cache_dir))
@@ -571,6 +655,22 @@ class TestImageCacheManager:
         assert "Failed to write cache file" in str(exc_info.value)
 
 
+def _geocode_istanbul_rome(place):
+    """Geocode Istanbul and Rome; Venice fails."""
+    coords = {
+        "Istanbul": {"lat": 41.0082, "lng": 28.9784},
+        "Rome": {"lat": 41.9028, "lng": 12.4964}
+    }
+    if place not in coords:
+        raise GeocodingError("Not found")
+    return coords[place]
+
+
+def _fetch_istanbul_rome(lat, **kwargs):
+    """Return map bytes for the coordinates of Istanbul or Rome."""
+    return {41.0082: b"ISTANBUL_MAP", 41.9028: b"ROME_MAP"}[lat]
+
+
 class TestMappingOrchestrator:
     """Test the mapping orchestrator."""
     
@@ -659,6 +759,25 @@ class TestMappingOrchestrator:
             "Rome", 10, "800x600", map_data, "roadmap"
         )
     
+    def test_get_map_adjacent_zoom_fallback(self):
+        """Test a cached map at an adjacent zoom tier avoids an API call."""
+        mock_client = MagicMock()
+        mock_cache = MagicMock()
+        
+        # Zoom 12 snaps to tier 13; only the tier of zoom 11 (10) is cached
+        mock_cache.get_cached_bytes.side_effect = (
+            lambda place, zoom, size, map_type: b"TIER_10_MAP" if zoom == 10 else None
+        )
+        
+        orchestrator = MappingOrchestrator(
+            maps_client=mock_client,
+            cache_manager=mock_cache
+        )
+        
+        assert orchestrator.get_map_for_place("Rome", zoom=12) == b"TIER_10_MAP"
+        assert mock_cache.get_cached_bytes.call_args_list[0] == call("Rome", 13, "600x400", "roadmap")
+        mock_client.geocode_place.assert_not_called()
+    
     def test_get_map_geocoding_error(self):
         """Test handling of geocoding errors."""
         mock_client = MagicMock()
@@ -682,22 +801,19 @@ class TestMappingOrchestrator:
         
         # Set up mock responses
         mock_cache.get_cached_bytes.return_value = None
-        mock_client.geocode_place.side_effect = [
-            {"lat": 41.0082, "lng": 28.9784},  # Istanbul
-            {"lat": 45.4408, "lng": 12.3155}   # Venice
-        ]
-        mock_client.fetch_map_bytes.side_effect = [
-            b"ISTANBUL_MAP",
-            b"VENICE_MAP"
-        ]
-        mock_cache.cache_bytes.side_effect = [
-            "Istanbul_hash1.png",
-            "Venice_hash2.png"
-        ]
-        mock_cache._generate_cache_key.side_effect = [
-            "Istanbul_hash1.png",
-            "Venice_hash2.png"
-        ]
+        # Places are fetched concurrently, so responses are keyed by place
+        # rather than relying on call order
+        coords = {
+            "Istanbul": {"lat": 41.0082, "lng": 28.9784},
+            "Venice": {"lat": 45.4408, "lng": 12.3155}
+        }
+        maps = {41.0082: b"ISTANBUL_MAP", 45.4408: b"VENICE_MAP"}
+        keys = {"Istanbul": "Istanbul_hash1.png", "Venice": "Venice_hash2.png"}
+        
+        mock_client.geocode_place.side_effect = lambda place: coords[place]
+        mock_client.fetch_map_bytes.side_effect = lambda lat, **kwargs: maps[lat]
+        mock_cache.cache_bytes.side_effect = lambda place, *args: keys[place]
+        mock_cache._generate_cache_key.side_effect = lambda place, **kwargs: keys[place]
         
         orchestrator = MappingOrchestrator(
             maps_client=mock_client,
@@ -723,21 +839,12 @@ class TestMappingOrchestrator:
         mock_cache.get_cached_bytes.return_value = None
         
         # Only return cache keys for successful places (Istanbul and Rome)
-        mock_cache._generate_cache_key.side_effect = [
-            "Istanbul_hash1.png",  # First successful place
-            "Rome_hash2.png"       # Second successful place
-        ]
+        keys = {"Istanbul": "Istanbul_hash1.png", "Rome": "Rome_hash2.png"}
+        mock_cache._generate_cache_key.side_effect = lambda place, **kwargs: keys[place]
         
-        # Set up mixed success/failure
-        mock_client.geocode_place.side_effect = [
-            {"lat": 41.0082, "lng": 28.9784},  # Istanbul - success
-            GeocodingError("Not found"),        # Venice - fail
-            {"lat": 41.9028, "lng": 12.4964}   # Rome - success
-        ]
-        mock_client.fetch_map_bytes.side_effect = [
-            b"ISTANBUL_MAP",
-            b"ROME_MAP"
-        ]
+        # Set up mixed success/failure, keyed by place since fetches run concurrently
+        mock_client.geocode_place.side_effect = _geocode_istanbul_rome
+        mock_client.fetch_map_bytes.side_effect = _fetch_istanbul_rome
         
         orchestrator = MappingOrchestrator(
             maps_client=mock_client,
@@ -776,15 +883,8 @@ class TestMappingOrchestrator:
         mock_cache._generate_cache_key.side_effect = generate_key
         
         # Set up mixed success/failure
-        mock_client.geocode_place.side_effect = [
-            {"lat": 41.0082, "lng": 28.9784},  # Istanbul - success
-            GeocodingError("Not found"),        # Venice - fail
-            {"lat": 41.9028, "lng": 12.4964}   # Rome - success
-        ]
-        mock_client.fetch_map_bytes.side_effect = [
-            b"ISTANBUL_MAP",
-            b"ROME_MAP"
-        ]
+        mock_client.geocode_place.side_effect = _geocode_istanbul_rome
+        mock_client.fetch_map_bytes.side_effect = _fetch_istanbul_rome
         
         orchestrator = MappingOrchestrator(
             maps_client=mock_client,
@@ -817,6 +917,77 @@ class TestMappingOrchestrator:
         mock_cache._generate_cache_key.assert_any_call(place="Rome", zoom=11, size="600x400", map_type="roadmap")
         assert "Venice_hash2.png" not in results
     
+    def test_batch_get_maps_deduplicates_places(self):
+        """Test repeated place entries are fetched only once."""
+        mock_client = MagicMock()
+        mock_cache = MagicMock()
+        
+        mock_cache.get_cached_bytes.return_value = None
+        mock_cache._generate_cache_key.side_effect = lambda place, **kwargs: f"{place}_hash.png"
+        mock_client.geocode_place.side_effect = _geocode_istanbul_rome
+        mock_client.fetch_map_bytes.side_effect = _fetch_istanbul_rome
+        
+        orchestrator = MappingOrchestrator(
+            maps_client=mock_client,
+            cache_manager=mock_cache
+        )
+        
+        places = [
+            {"place": "Rome"},
+            {"place": "Rome", "zoom": 12},  # Same as the default zoom
+            {"place": "Rome"},
+            {"place": "rome "},  # Same canonical place
+            {"place": "Istanbul"}
+        ]
+        
+        results = orchestrator.batch_get_maps(places)
+        
+        assert results == {
+            "Rome_hash.png": b"ROME_MAP",
+            "Istanbul_hash.png": b"ISTANBUL_MAP"
+        }
+        assert mock_client.geocode_place.call_count == 2
+        assert mock_client.fetch_map_bytes.call_count == 2
+    
+    def test_get_map_path_for_entry(self, temp_cache_dir):
+        """Test maps are returned as cache paths, fetching only on a miss."""
+        mock_client = MagicMock()
+        mock_client.geocode_place.side_effect = _geocode_istanbul_rome
+        mock_client.fetch_map_bytes.side_effect = _fetch_istanbul_rome
+        cache = ImageCacheManager(cache_dir=str(temp_cache_dir))
+        
+        orchestrator = MappingOrchestrator(
+            maps_client=mock_client,
+            cache_manager=cache
+        )
+        
+        cache_key, path = orchestrator.get_map_path_for_entry({"place": "Rome"})
+        assert path == temp_cache_dir / cache_key
+        assert path.read_bytes() == b"ROME_MAP"
+        
+        # Second lookup is served from the cache without fetching
+        assert orchestrator.get_map_path_for_entry({"place": "Rome"}) == (cache_key, path)
+        assert mock_client.fetch_map_bytes.call_count == 1
+    
+    def test_get_map_for_entry_uses_adjacent_zoom_fallback(self, temp_cache_dir):
+        """Test entries keep their requested zoom so adjacent cached tiers are used."""
+        mock_client = MagicMock()
+        cache = ImageCacheManager(cache_dir=str(temp_cache_dir))
+        cache.cache_bytes("Rome", 13, "600x400", b"ROME_MAP")
+        
+        orchestrator = MappingOrchestrator(
+            maps_client=mock_client,
+            cache_manager=cache
+        )
+        
+        # Zoom 11 snaps to tier 10; zoom 12 (11 + 1) snaps to the cached tier 13
+        cache_key, image = orchestrator.get_map_for_entry(
+            {"place": "Rome", "zoom": 11, "size": "600x400"}
+        )
+        
+        assert image == b"ROME_MAP"
+        mock_client.geocode_place.assert_not_called()
+    
     def test_batch_get_maps_empty_list(self):
         """Test batch processing with empty list."""
         orchestrator = MappingOrchestrator()
@@ -944,7 +1115,7 @@ class TestIntegration:
         # Verify cache file exists
         cache_files = list(temp_cache_dir.glob("*.png"))
         assert len(cache_files) == 1
-        assert "London" in cache_files[0].name
+        assert cache_files[0].name.startswith("london_")
 
 
 # ==================== MAIN EXECUTION ====================
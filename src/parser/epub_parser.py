@@ -5,9 +5,11 @@ Extracts text content and metadata from ePub files using ebooklib
 and lxml for XHTML parsing.
 """
 
+import io
 import os
 import logging
-from typing import List, Dict, Any
+import zipfile
+from typing import List, Dict, Any, Iterator
 from pathlib import Path
 
 import ebooklib
@@ -17,6 +19,10 @@ from lxml import html, etree
 from .document_parser import DocumentParser, ParserError
 
 
+# Every ePub must point to its package document from this entry
+CONTAINER_PATH = "META-INF/container.xml"
+
+
 class EpubParser(DocumentParser):
     """Parser for ePub document format."""
     
@@ -44,6 +50,17 @@ class EpubParser(DocumentParser):
             if not file_path.lower().endswith('.epub'):
                 raise ParserError(f"File is not an ePub: {file_path}")
             
+            # Check the ZIP central directory first, so invalid files are
+            # rejected before the full ePub load
+            try:
+                with zipfile.ZipFile(file_path) as zf:
+                    has_container = CONTAINER_PATH in zf.namelist()
+            except zipfile.BadZipFile:
+                raise ParserError("Invalid ePub file: not a ZIP archive")
+            
+            if not has_container:
+                raise ParserError(f"Invalid ePub file: missing {CONTAINER_PATH}")
+            
             # Load the ePub file
             self.book = epub.read_epub(file_path)
             self.logger.info(f"Successfully loaded ePub: {Path(file_path).name}")
@@ -63,23 +80,39 @@ class EpubParser(DocumentParser):
         Raises:
             ParserError: If no document is loaded or extraction fails
         """
+        paragraphs = list(self.iter_text())
+        self.logger.info(f"Extracted {len(paragraphs)} paragraphs from ePub")
+        return paragraphs
+    
+    def iter_text(self) -> Iterator[str]:
+        """
+        Yield text paragraphs from the loaded ePub one document at a time.
+        
+        Only the current document's parsed tree is held in memory, so
+        callers that consume paragraphs incrementally avoid building the
+        full paragraph list.
+        
+        Returns:
+            Iterator over paragraph strings in document order
+            
+        Raises:
+            ParserError: If no document is loaded, or (while iterating)
+                         if extraction fails
+        """
         if self.book is None:
             raise ParserError("No ePub file loaded. Call load_file() first.")
-        
+        return self._iter_paragraphs()
+    
+    def _iter_paragraphs(self) -> Iterator[str]:
+        """Generator behind iter_text."""
         try:
-            paragraphs = []
-            
             # Get all XHTML documents in reading order
             for item in self.book.get_items():
                 if item.get_type() == ebooklib.ITEM_DOCUMENT:
                     # Parse XHTML content
                     content = item.get_content()
                     if content:
-                        chapter_paragraphs = self._extract_paragraphs_from_xhtml(content)
-                        paragraphs.extend(chapter_paragraphs)
-            
-            self.logger.info(f"Extracted {len(paragraphs)} paragraphs from ePub")
-            return paragraphs
+                        yield from self._extract_paragraphs_from_xhtml(content)
             
         except Exception as e:
             raise ParserError(f"Failed to extract text: {e}")
@@ -123,6 +156,13 @@ class EpubParser(DocumentParser):
         Returns:
             List of paragraph text strings
         """
+        try:
+            return self._iterparse_paragraphs(content)
+        except etree.XMLSyntaxError:
+            # Not well-formed XML (e.g. HTML named entities); use the lenient
+            # HTML parser below
+            pass
+        
         try:
             # Parse XHTML content
             doc = html.fromstring(content)
@@ -144,6 +184,35 @@ class EpubParser(DocumentParser):
             # Silent fallback for any parsing issues
             return []
     
+    def _iterparse_paragraphs(self, content: bytes) -> List[str]:
+        """
+        Stream paragraph text out of well-formed XHTML.
+        
+        Each <p> (in any namespace) is read as soon as it closes and then
+        cleared along with its already-processed siblings, so memory stays
+        flat regardless of chapter size.
+        
+        Args:
+            content: Raw XHTML content bytes
+            
+        Returns:
+            List of paragraph text strings
+            
+        Raises:
+            etree.XMLSyntaxError: If the content is not well-formed XML
+        """
+        paragraphs = []
+        for _, p_element in etree.iterparse(io.BytesIO(content), events=('end',), tag='{*}p'):
+            text = self._get_element_text(p_element).strip()
+            if text:  # Only include non-empty paragraphs
+                paragraphs.append(text)
+            
+            p_element.clear(keep_tail=True)
+            while p_element.getprevious() is not None:
+                del p_element.getparent()[0]
+        
+        return paragraphs
+    
     def _get_element_text(self, element) -> str:
         """
         Extract all text content from an element and its children.
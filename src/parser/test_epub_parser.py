@@ -7,6 +7,7 @@ metadata extraction, and edge cases to achieve ≥90% branch coverage.
 
 import os
 import tempfile
+import zipfile
 import pytest
 import logging
 from unittest.mock import Mock, patch, MagicMock
@@ -20,6 +21,13 @@ from src.parser.epub_parser import EpubParser
 from src.parser.document_parser import ParserError
 
 
+def _write_minimal_epub(path):
+    """Write a ZIP with the entries load_file checks for."""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("mimetype", "application/epub+zip")
+        zf.writestr("META-INF/container.xml", "<container/>")
+
+
 class TestEpubParserInitialization:
     """Test cases for EpubParser initialization."""
     
@@ -55,15 +63,38 @@ class TestLoadFile:
         mock_read_epub.side_effect = Exception("Invalid ePub format")
         
         with tempfile.NamedTemporaryFile(suffix=".epub") as tmp_file:
+            _write_minimal_epub(tmp_file.name)
             with pytest.raises(ParserError, match="Failed to load ePub file"):
                 self.parser.load_file(tmp_file.name)
     
+    @patch('ebooklib.epub.read_epub')
+    def test_load_file_not_a_zip(self, mock_read_epub):
+        """Test non-ZIP files are rejected without a full ePub load."""
+        with tempfile.NamedTemporaryFile(suffix=".epub") as tmp_file:
+            with pytest.raises(ParserError, match="not a ZIP archive"):
+                self.parser.load_file(tmp_file.name)
+        
+        mock_read_epub.assert_not_called()
+    
+    @patch('ebooklib.epub.read_epub')
+    def test_load_file_missing_container(self, mock_read_epub):
+        """Test ZIPs without META-INF/container.xml are rejected."""
+        with tempfile.NamedTemporaryFile(suffix=".epub") as tmp_file:
+            with zipfile.ZipFile(tmp_file.name, "w") as zf:
+                zf.writestr("mimetype", "application/epub+zip")
+            
+            with pytest.raises(ParserError, match="missing META-INF/container.xml"):
+                self.parser.load_file(tmp_file.name)
+        
+        mock_read_epub.assert_not_called()
+    
     @patch('ebooklib.epub.read_epub')
     def test_load_file_unexpected_error(self, mock_read_epub):
         """Test unexpected error during loading raises ParserError."""
         mock_read_epub.side_effect = Exception("Unexpected error")
         
         with tempfile.NamedTemporaryFile(suffix=".epub") as tmp_file:
+            _write_minimal_epub(tmp_file.name)
             with pytest.raises(ParserError, match="Failed to load ePub file"):
                 self.parser.load_file(tmp_file.name)
     
@@ -74,6 +105,7 @@ class TestLoadFile:
         mock_read_epub.return_value = mock_book
         
         with tempfile.NamedTemporaryFile(suffix=".epub") as tmp_file:
+            _write_minimal_epub(tmp_file.name)
             with caplog.at_level(logging.INFO):
                 self.parser.load_file(tmp_file.name)
             
@@ -150,6 +182,30 @@ class TestExtractText:
         assert "Third paragraph" in result
         assert "Extracted 3 paragraphs" in caplog.text
     
+    def test_iter_text_is_lazy(self):
+        """Test iter_text only reads documents as paragraphs are consumed."""
+        mock_item1 = Mock()
+        mock_item1.get_type.return_value = ebooklib.ITEM_DOCUMENT
+        mock_item1.get_content.return_value = b'<html><body><p>First</p></body></html>'
+        
+        mock_item2 = Mock()
+        mock_item2.get_type.return_value = ebooklib.ITEM_DOCUMENT
+        mock_item2.get_content.return_value = b'<html><body><p>Second</p></body></html>'
+        
+        mock_book = Mock()
+        mock_book.get_items.return_value = [mock_item1, mock_item2]
+        self.parser.book = mock_book
+        
+        paragraphs = self.parser.iter_text()
+        assert next(paragraphs) == "First"
+        mock_item2.get_content.assert_not_called()
+        assert list(paragraphs) == ["Second"]
+    
+    def test_iter_text_no_book_loaded(self):
+        """Test iter_text raises immediately when nothing is loaded."""
+        with pytest.raises(ParserError, match="No ePub file loaded"):
+            self.parser.iter_text()
+    
     def test_extract_text_skip_non_document_items(self):
         """Test extract_text skips non-document items."""
         # First item is not a document
@@ -260,6 +316,25 @@ class TestExtractParagraphsFromXhtml:
         result = self.parser._extract_paragraphs_from_xhtml(content)
         assert len(result) == 1
         assert "Paragraph with bold and link text" in result[0]
+    
+    def test_extract_paragraphs_namespaced_xhtml(self):
+        """Test streaming extraction from namespaced XHTML keeps order and tail text."""
+        content = b'''<?xml version="1.0" encoding="utf-8"?>
+        <html xmlns="http://www.w3.org/1999/xhtml"><body>
+            <div><p>First in <em>Rome</em>.</p>Loose text</div>
+            <p>Second</p>
+        </body></html>
+        '''
+        
+        result = self.parser._extract_paragraphs_from_xhtml(content)
+        assert result == ["First in Rome.", "Second"]
+    
+    def test_extract_paragraphs_html_entities(self):
+        """Test content that is not well-formed XML falls back to the HTML parser."""
+        content = b'<html><body><p>Caf&eacute; in Paris</p><p>Second</p></body></html>'
+        
+        result = self.parser._extract_paragraphs_from_xhtml(content)
+        assert result == ["Caf\u00e9 in Paris", "Second"]
 
 
 class TestExtractParagraphsFallback:
@@ -7,7 +7,7 @@ maintaining sentence boundaries for better context preservation.
 
 import re
 import logging
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
 
 
 class TextChunker:
@@ -102,6 +102,38 @@ class TextChunker:
         self.logger.info(f"Split {len(paragraphs)} paragraphs into {len(chunks)} chunks with mapping")
         return chunks, chunk_info
     
+    def iter_chunks_with_mapping(self, paragraphs: Iterable[str],
+                                 chunk_size: int = 1000) -> Iterator[Tuple[int, str]]:
+        """
+        Lazily split paragraphs into chunks, tagging each with its paragraph index.
+        
+        Accepts any iterable, such as EpubParser.iter_text(), so paragraphs
+        are chunked as they are produced instead of being collected first.
+        
+        Args:
+            paragraphs: Iterable of paragraph strings
+            chunk_size: Maximum characters per chunk (default: 1000)
+            
+        Yields:
+            (para_idx, chunk) tuples in document order
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be positive")
+        
+        for para_idx, paragraph in enumerate(paragraphs):
+            # Clean and validate paragraph
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            
+            # If paragraph fits within chunk size, keep it as is
+            if len(paragraph) <= chunk_size:
+                yield para_idx, paragraph
+            else:
+                # Split large paragraph into sentence-based chunks
+                for chunk in self._split_paragraph_by_sentences(paragraph, chunk_size):
+                    yield para_idx, chunk
+    
     def _split_paragraph_by_sentences(self, paragraph: str, chunk_size: int) -> List[str]:
         """
         Split a large paragraph into chunks at sentence boundaries.